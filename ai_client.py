@@ -0,0 +1,409 @@
+# =========================================================================
+# ARCADE MANAGER - AI CLIENT
+# Shared, process-wide client behind /api/ai/ask.
+#
+# What this file does:
+# - GeminiBackend: keeps one GenerativeModel per (model_name, system_instruction)
+# - FakeBackend:   local stand-in (no network) for tests / benchmarks
+# - AIClient.ask(...) -> {"reply", "cached"}
+# - AIClient.ask_stream(...) -> ("delta", text)... then ("done", info) events
+#   for the SSE route (same cache, limiter, retry and reflection rules)
+#     * LRU+TTL response cache keyed by normalized prompt + context
+#     * concurrency limiter: at most AI_MAX_CONCURRENCY upstream calls, at
+#       most AI_MAX_QUEUE callers waiting (AI_QUEUE_TIMEOUT s); beyond that
+#       AIBusy is raised so the route can answer 503 right away
+#     * same retry rules as before: empty + MAX_TOKENS -> retry with a bigger
+#       cap; still empty -> fallback model
+# - strip_reflection(reply, prompt): drops an echoed prompt from the reply
+#
+# Settings (env):
+# - AI_BACKEND          gemini (default) | fake
+# - AI_MAX_CONCURRENCY  (default 4)
+# - AI_MAX_QUEUE        (default 8)
+# - AI_QUEUE_TIMEOUT    (default 10)   seconds a queued call may wait
+# - AI_CACHE_TTL        (default 300)  0 disables the response cache
+# - AI_CACHE_SIZE       (default 256)
+#
+# Connected files:
+# - app.py (POST /api/ai/ask, POST /api/ai/ask_stream)
+# =========================================================================
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from cache_utils import TTLCache
+
+FALLBACK_MODEL = "gemini-1.5-flash"
+MAX_TOKENS_FINISH = 2  # finish_reason MAX_TOKENS
+
+
+class AIBusy(Exception):
+    """Too many AI calls in flight and the wait queue is full (or timed out)."""
+
+
+class AIEmptyReply(Exception):
+    """Upstream returned no text even after retry + fallback."""
+
+    def __init__(self, finish_reason):
+        super().__init__(f"AI returned no text (finish_reason={finish_reason})")
+        self.finish_reason = finish_reason
+
+
+def strip_reflection(reply, user):
+    if not reply or not user:
+        return reply
+    r, u = reply.strip(), user.strip()
+    # If the reply starts with the exact prompt, remove it.
+    if r.lower().startswith(u.lower()):
+        r = r[len(u):].lstrip(" \n:,-")
+    return r
+
+
+class ReflectionStripper:
+    """
+    strip_reflection for a stream: holds back output until it is clear whether
+    the reply starts with the prompt, then passes chunks straight through.
+    """
+
+    def __init__(self, user):
+        self.user = (user or "").strip()
+        self._buf = ""
+        self._decided = not self.user
+
+    def feed(self, chunk):
+        if self._decided:
+            return chunk
+        self._buf += chunk
+        head = self._buf.lstrip()
+        if len(head) < len(self.user) and self.user.lower().startswith(head.lower()):
+            return ""  # still could be an echo of the prompt
+        return self._flush()
+
+    def finish(self):
+        return "" if self._decided else self._flush()
+
+    def _flush(self):
+        # like strip_reflection, but keeps trailing spacing (more chunks follow)
+        self._decided = True
+        head, self._buf = self._buf.lstrip(), ""
+        if head.lower().startswith(self.user.lower()):
+            head = head[len(self.user):].lstrip(" \n:,-")
+        return head
+
+
+# --- backends ---------------------------------------------------------------
+def _extract_text(resp, strip=True):
+    """Return concatenated text parts or '' if none (stream chunks keep their spacing)."""
+    try:
+        for c in (getattr(resp, "candidates", []) or []):
+            parts = getattr(getattr(c, "content", None), "parts", []) or []
+            texts = [getattr(p, "text", "") for p in parts if getattr(p, "text", "")]
+            if texts:
+                text = "".join(texts)
+                return text.strip() if strip else text
+    except Exception:
+        pass
+    return ""
+
+
+def _finish_reason(resp):
+    try:
+        return getattr(resp.candidates[0], "finish_reason", None)
+    except Exception:
+        return None
+
+
+class GeminiBackend:
+    name = "gemini"
+
+    def __init__(self):
+        self._models = {}  # (model_name, system_instruction) -> (model, inline_system)
+        self._lock = threading.Lock()
+
+    def _model(self, model_name, system_instruction):
+        key = (model_name, system_instruction)
+        with self._lock:
+            hit = self._models.get(key)
+            if hit is None:
+                import google.generativeai as genai
+                # Create model (handle older SDKs without system_instruction)
+                try:
+                    hit = (genai.GenerativeModel(model_name, system_instruction=system_instruction), False)
+                except TypeError:
+                    hit = (genai.GenerativeModel(model_name), True)
+                self._models[key] = hit
+            return hit
+
+    def generate(self, model_name, system_instruction, message, gen_cfg):
+        """-> (text, finish_reason)"""
+        model, inline_system = self._model(model_name, system_instruction)
+        if inline_system and system_instruction:
+            message = f"{system_instruction}\n\n{message}"
+        resp = model.generate_content(message, generation_config=gen_cfg)
+        return _extract_text(resp), _finish_reason(resp)
+
+    def stream(self, model_name, system_instruction, message, gen_cfg):
+        """Yields text chunks as they arrive; returns the finish_reason (StopIteration.value)."""
+        model, inline_system = self._model(model_name, system_instruction)
+        if inline_system and system_instruction:
+            message = f"{system_instruction}\n\n{message}"
+        finish = None
+        for chunk in model.generate_content(message, generation_config=gen_cfg, stream=True):
+            finish = _finish_reason(chunk) or finish
+            text = _extract_text(chunk, strip=False)
+            if text:
+                yield text
+        return finish
+
+
+class FakeBackend:
+    """
+    Deterministic local model. `reply` may be a string or fn(model_name, message)
+    returning (text, finish_reason); `delay` simulates upstream latency.
+    """
+    name = "fake"
+
+    def __init__(self, reply=None, delay=0.0):
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+
+    def generate(self, model_name, system_instruction, message, gen_cfg):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if callable(self.reply):
+            return self.reply(model_name, message)
+        return (self.reply if self.reply is not None else f"(fake {model_name}) {message[-80:]}"), 1
+
+    def stream(self, model_name, system_instruction, message, gen_cfg):
+        """Same reply as generate(), one word per chunk, `delay` spread across the chunks."""
+        self.calls += 1
+        if callable(self.reply):
+            text, finish = self.reply(model_name, message)
+        else:
+            text, finish = (self.reply if self.reply is not None
+                            else f"(fake {model_name}) {message[-80:]}"), 1
+        words = re.findall(r"\S+\s*", text or "")
+        for w in words:
+            if self.delay:
+                time.sleep(self.delay / len(words))
+            yield w
+        return finish
+
+
+def make_backend(name=None):
+    name = (name or os.environ.get("AI_BACKEND", "gemini")).lower()
+    if name == "fake":
+        return FakeBackend(delay=float(os.environ.get("AI_FAKE_DELAY", "0")))
+    return GeminiBackend()
+
+
+# --- client -----------------------------------------------------------------
+class _SlotStream:
+    """
+    Event iterator that owns one limiter slot. The slot goes back as soon as
+    the upstream call is over, or on close() at the latest - close() works
+    even if iteration never started (a generator's finally would not run).
+    """
+
+    def __init__(self, client, make_events):
+        self._client = client
+        self._held = True
+        self._lock = threading.Lock()
+        self._events = make_events(self.release)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._events)
+
+    def release(self):
+        with self._lock:
+            if not self._held:
+                return
+            self._held = False
+        self._client.release()
+
+    def close(self):
+        try:
+            self._events.close()
+        finally:
+            self.release()
+
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _norm(text):
+    return _WS_RE.sub(" ", (text or "").strip().lower())
+
+
+class AIClient:
+    def __init__(self, backend=None, max_concurrency=None, max_queue=None,
+                 queue_timeout=None, cache_ttl=None, cache_size=None):
+        self.backend = backend or make_backend()
+        self.max_concurrency = max_concurrency or int(os.environ.get("AI_MAX_CONCURRENCY", "4"))
+        self.max_queue = int(os.environ.get("AI_MAX_QUEUE", "8")) if max_queue is None else max_queue
+        self.queue_timeout = float(os.environ.get("AI_QUEUE_TIMEOUT", "10")) if queue_timeout is None else queue_timeout
+        ttl = float(os.environ.get("AI_CACHE_TTL", "300")) if cache_ttl is None else cache_ttl
+        size = cache_size or int(os.environ.get("AI_CACHE_SIZE", "256"))
+        self.cache = TTLCache(ttl, maxsize=size)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._waiting = 0
+        self._wait_lock = threading.Lock()
+
+    # ---------- limiter ----------
+    def acquire(self):
+        """Take an upstream slot or raise AIBusy (queue full / waited too long)."""
+        if self._slots.acquire(blocking=False):
+            return
+        with self._wait_lock:
+            if self._waiting >= self.max_queue:
+                raise AIBusy("AI is busy, try again shortly")
+            self._waiting += 1
+        try:
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                raise AIBusy("AI is busy, try again shortly")
+        finally:
+            with self._wait_lock:
+                self._waiting -= 1
+
+    def release(self):
+        self._slots.release()
+
+    # ---------- cache ----------
+    @staticmethod
+    def cache_key(prompt, context, model_name, system_instruction):
+        ctx = {k: _norm(str(v)) for k, v in sorted((context or {}).items()) if v}
+        raw = json.dumps([_norm(prompt), ctx, model_name, system_instruction], sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # ---------- calls ----------
+    def _generate_with_retry(self, model_name, system_instruction, message, gen_cfg):
+        """Same rules as the original route: bigger cap on MAX_TOKENS, then fallback model."""
+        text, finish = self.backend.generate(model_name, system_instruction, message, gen_cfg)
+        if text:
+            return text
+        # If MAX_TOKENS (2), try again with a larger cap
+        if finish == MAX_TOKENS_FINISH:
+            text, finish = self.backend.generate(
+                model_name, system_instruction, message,
+                {**gen_cfg, "max_output_tokens": 2048},
+            )
+        # As a last resort, try a stable backup model
+        if not text and model_name != FALLBACK_MODEL:
+            try:
+                text, finish = self.backend.generate(FALLBACK_MODEL, system_instruction, message, gen_cfg)
+            except Exception:
+                pass
+        if not text:
+            raise AIEmptyReply(finish)
+        return text
+
+    def ask(self, prompt, message, context, model_name, system_instruction, gen_cfg):
+        """
+        -> {"reply": str, "cached": bool}
+        Raises AIBusy, AIEmptyReply, or whatever the backend raised.
+        """
+        key = self.cache_key(prompt, context, model_name, system_instruction)
+        reply = self.cache.get(key)
+        if reply is not None:
+            return {"reply": reply, "cached": True}
+
+        self.acquire()
+        try:
+            text = self._generate_with_retry(model_name, system_instruction, message, gen_cfg)
+        finally:
+            self.release()
+
+        reply = strip_reflection(text, prompt)
+        if self.cache.ttl > 0:
+            self.cache.set(key, reply)
+        return {"reply": reply, "cached": False}
+
+    def ask_stream(self, prompt, message, context, model_name, system_instruction, gen_cfg):
+        """
+        Returns a generator of ("delta", text) events followed by one
+        ("done", {"reply", "cached", "ttft_ms", "total_ms"}).
+        The cache lookup and the limiter run *now*, so AIBusy is raised
+        before any response is started; the slot is released when the
+        upstream call is over or the stream is closed, whichever comes first.
+        """
+        started = time.monotonic()
+        key = self.cache_key(prompt, context, model_name, system_instruction)
+        reply = self.cache.get(key)
+        if reply is not None:
+            return self._cached_events(reply, started)
+        self.acquire()
+        return _SlotStream(self, lambda release: self._stream_events(
+            key, prompt, message, model_name, system_instruction, gen_cfg, started, release))
+
+    @staticmethod
+    def _cached_events(reply, started):
+        ms = round((time.monotonic() - started) * 1000, 1)
+        yield "delta", reply
+        yield "done", {"reply": reply, "cached": True, "ttft_ms": ms, "total_ms": ms}
+
+    def _stream_events(self, key, prompt, message, model_name, system_instruction, gen_cfg, started,
+                       release):
+        """
+        Retries follow ask(): they only happen while nothing has been sent
+        yet (empty output), so the client never sees two different answers.
+        """
+        stripper = ReflectionStripper(prompt)
+        out = []
+        ttft = None
+        try:
+            attempts = [(model_name, gen_cfg)]
+            raw, finish = "", None
+            while attempts:
+                name, cfg = attempts.pop(0)
+                gen = self.backend.stream(name, system_instruction, message, cfg)
+                while True:
+                    try:
+                        chunk = next(gen)
+                    except StopIteration as stop:
+                        finish = stop.value
+                        break
+                    raw += chunk
+                    piece = stripper.feed(chunk)
+                    if piece:
+                        if ttft is None:
+                            ttft = round((time.monotonic() - started) * 1000, 1)
+                        out.append(piece)
+                        yield "delta", piece
+                if raw.strip():
+                    break
+                # If MAX_TOKENS (2), try again with a larger cap
+                if cfg is gen_cfg and name == model_name and finish == MAX_TOKENS_FINISH:
+                    attempts.append((model_name, {**gen_cfg, "max_output_tokens": 2048}))
+                # As a last resort, try a stable backup model
+                elif name != FALLBACK_MODEL:
+                    attempts.append((FALLBACK_MODEL, gen_cfg))
+            if not raw.strip():
+                raise AIEmptyReply(finish)
+
+            tail = stripper.finish()
+            if tail:
+                if ttft is None:
+                    ttft = round((time.monotonic() - started) * 1000, 1)
+                out.append(tail)
+                yield "delta", tail
+        finally:
+            release()
+
+        reply = "".join(out).strip()
+        if self.cache.ttl > 0:
+            self.cache.set(key, reply)
+        yield "done", {"reply": reply, "cached": False, "ttft_ms": ttft,
+                       "total_ms": round((time.monotonic() - started) * 1000, 1)}
+
+
+# one client per process (routes share its models, cache and limiter)
+AI = AIClient()
@@ -12,12 +12,30 @@ import json
 
 import psycopg2
 from psycopg2 import sql
-from flask import Flask, render_template, request, jsonify, g, redirect, url_for
+from flask import Flask, render_template, request, jsonify, g, redirect, url_for, Response
 from werkzeug.utils import secure_filename
 
 # local modules
 import tpt_processor
-from games_db import ensure_games_table
+import pm_schedule
+from games_db import (
+    ensure_games_table, ensure_pm_logs_table, ensure_game_status_tables, iter_pm_logs, PM_LOG_FIELDS,
+)
+import game_status
+from pagination import wants_page, parse_limit, parse_fields, encode_cursor, decode_cursor
+from db_indexes import ensure_indexes, explain_hot_queries
+from scheduler import start_periodic
+from cache_utils import TTLCache, invalidate
+from table_versions import ensure_table_versions, bump_table_version, table_versions
+import change_log
+from change_log import ensure_change_log, log_change
+from http_cache import not_modified, with_etag
+from http_compress import init_compression
+from json_provider import FastJSONProvider, dumps_bytes
+from legacy_import import import_legacy_issues
+from search_index import ensure_search_index
+from weather import OPENWEATHER_URL, get_weather as fetch_weather_cached
+from ai_client import AI, AIBusy, AIEmptyReply
 from games_api import register_game_routes
 from issues_api import register_issue_routes
 from issue_hub_bp import register_issue_hub_blueprint
@@ -32,6 +50,8 @@ MODEL_NAME = "gemini-2.5-pro"  # Use gemini-2.5-pro for more powerful reasoning
 
 # --- 2) App setup ----------------------------------------------------------
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # orjson-backed jsonify (dates -> ISO 8601)
+init_compression(app)            # gzip / br above COMPRESS_MIN_BYTES
 
 
 # DB url: set on Render. If missing, we default to local SQLite.
@@ -99,40 +119,6 @@ def ensure_id_sequences(db_conn):
     finally:
         cur.close()
 
-# --- NEW: DB helper for PM logs table --------------------------------------
-def ensure_pm_logs_table(db_conn):
-    is_postgres = hasattr(db_conn, "dsn")
-    cur = db_conn.cursor()
-    try:
-        # Create pm_logs table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS pm_logs (
-                id SERIAL PRIMARY KEY,
-                game_id TEXT NOT NULL,
-                pm_date DATE NOT NULL,
-                notes TEXT,
-                completed_by TEXT,
-                date_logged TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-
-        # Add foreign key constraint (Postgres only, with IF NOT EXISTS)
-        if is_postgres:
-            try:
-                cur.execute(sql.SQL("""
-                    ALTER TABLE pm_logs
-                    ADD COLUMN IF NOT EXISTS game_id TEXT REFERENCES games(id) ON DELETE CASCADE;
-                """))
-            except Exception as e:
-                print(f"Warning: PM logs migration skipped: {e}")
-        
-        db_conn.commit()
-    except Exception as e:
-        print(f"Error creating pm_logs table: {e}")
-        db_conn.rollback()
-    finally:
-        cur.close()
-
 def init_db():
     """
     Creates core tables (issues, settings, tasks) and the games table.
@@ -145,6 +131,12 @@ def init_db():
     ensure_games_table(db_conn)
     # ensure pm_logs table
     ensure_pm_logs_table(db_conn)
+    # status history + outages; games without stats start being tracked now
+    ensure_game_status_tables(db_conn)
+    try:
+        game_status.start_tracking(db_conn)
+    except Exception as e:
+        print(f"Warning: game status tracking skipped: {e}")
 
     cur = db_conn.cursor()
     try:
@@ -167,9 +159,14 @@ def init_db():
             """
         )
         db_conn.commit()
+        ensure_indexes(db_conn, "issues")
 
         # id_sequences base rows
         ensure_id_sequences(db_conn)
+        # per-table change markers for caches
+        ensure_table_versions(db_conn)
+        # append-only change log behind the live feed (/api/changes/stream)
+        ensure_change_log(db_conn)
 
         # light Postgres migrations (no-ops on SQLite)
         if is_postgres:
@@ -215,6 +212,24 @@ def init_db():
     finally:
         cur.close()
 
+    # one-time (then incremental) import of data/issues.json
+    try:
+        result = import_legacy_issues(db_conn)
+        if result["inserted"]:
+            print(f"Legacy issues import: {result['inserted']} new of {result['read']} read")
+    except Exception as e:
+        db_conn.rollback()
+        print(f"Warning: legacy issues import skipped: {e}")
+
+    # full-text search over issues (FTS5 / tsvector), kept in sync by the DB
+    ensure_search_index(db_conn, "issues")
+
+    # PM schedule: fill/refresh pm_next_due (new columns, interval config changes)
+    try:
+        pm_schedule.sync_all(db_conn)
+    except Exception as e:
+        print(f"Warning: PM schedule sync skipped: {e}")
+
     print("DB ready ✅")
 
 # run initialization (unless explicitly skipped)
@@ -298,6 +313,21 @@ def _debug_routes():
         routes = []
     return jsonify({"routes": routes})
 
+# Debug: EXPLAIN the hot queries and report whether each one uses an index
+# (debug mode only; tests/test_db_indexes.py is the real check)
+@app.get("/api/_debug/indexes")
+def _debug_indexes():
+    if not app.debug:
+        return jsonify({"error": "Not found"}), 404
+    try:
+        results = explain_hot_queries(get_db())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    return jsonify({
+        "all_indexed": all(r["uses_index"] and not r["full_scan"] for r in results),
+        "queries": results,
+    })
+
 # --- 5) Utility/maintenance routes ----------------------------------------
 @app.route("/clear_issues_temp")
 def clear_issues_temp():
@@ -306,7 +336,10 @@ def clear_issues_temp():
     cur = db_conn.cursor()
     try:
         cur.execute("DELETE FROM issues;")
+        log_change(db_conn, "issues", "*", "reset")
+        bump_table_version(db_conn, "issues")
         db_conn.commit()
+        invalidate("issues")
         return "All issues have been cleared from the database.", 200
     except Exception as e:
         db_conn.rollback()
@@ -331,27 +364,13 @@ LONGITUDE = -80.2073
 
 @app.route("/weather", methods=["GET"])
 def get_weather():
+    # cached per coordinates; see weather.py for TTL / stale / timeout settings
     try:
-        url = (
-            "https://api.openweathermap.org/data/2.5/weather"
-            f"?lat={LATITUDE}&lon={LONGITUDE}&appid={OPENWEATHER_API_KEY}&units=imperial"
-        )
-        response = requests.get(url)
-        response.raise_for_status()
-        weather_data = response.json()
-
-        icon_code = weather_data["weather"][0]["icon"]
-        description = weather_data["weather"][0]["description"]
-        temperature = weather_data["main"]["temp"]
-
-        return jsonify(
-            {
-                "icon_code": icon_code,
-                "description": description.capitalize(),
-                "temperature": round(temperature),
-            }
-        )
-    except requests.exceptions.RequestException as e:
+        payload, state = fetch_weather_cached(LATITUDE, LONGITUDE, OPENWEATHER_API_KEY)
+        resp = jsonify(payload)
+        resp.headers["X-Cache"] = state
+        return resp
+    except (requests.exceptions.RequestException, TimeoutError) as e:
         print(f"Weather error: {e}")
         return jsonify({"error": "Failed to fetch weather data", "details": str(e)}), 500
     except KeyError as e:
@@ -426,7 +445,7 @@ from issues_db import _debug_active_breakdown  # type: ignore
 @app.route("/api/issues/_debug_counts", methods=["GET"])
 def api_debug_counts():
     try:
-        return jsonify(_debug_active_breakdown())
+        return jsonify(_debug_active_breakdown(get_db()))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -437,41 +456,46 @@ from issues_db import count_all_open_issues
 @app.route("/api/issues/count", methods=["GET"])
 def api_count_open_issues():
     try:
-        total = count_all_open_issues()
+        total = count_all_open_issues(get_db())
         return jsonify({"count": int(total)})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 # --- 7) Health Check API ---------------------------------------------------
-# --- Health Check API (rich + cached) --------------------------------------
+# --- Health Check API (concurrent + per-check cache) -----------------------
+# Each check runs on a small thread pool with its own deadline and TTL.
+# /api/health never waits on a check that already has a result: stale
+# results are served while a refresh runs in the background. Only a check
+# with no result yet (cold start) is waited for, up to its deadline.
 import time
-
-_HEALTH_CACHE = {"ts": 0.0, "payload": None}
-_HEALTH_TTL = 60.0  # seconds
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 def _ok(msg):    return {"status": "ok",    "message": msg}
 def _err(msg):   return {"status": "error", "message": msg}
 def _skip(msg):  return {"status": "skip",  "message": msg}  # used if not configured
 
+def _fresh_db():
+    """Own connection for checks (they run outside the request / app context)."""
+    if DATABASE_URL:
+        return psycopg2.connect(DATABASE_URL, connect_timeout=3)
+    return sqlite3.connect("app.db", timeout=3)
+
+def _probe(sql_text, params=()):
+    conn = _fresh_db()
+    try:
+        cur = conn.cursor()
+        cur.execute(sql_text if not DATABASE_URL else sql_text.replace("?", "%s"), params)
+        cur.fetchall()
+        cur.close()
+    finally:
+        conn.close()
+
 def _check_db():
     try:
-        if DATABASE_URL:                  # Postgres on Render
-            conn = psycopg2.connect(DATABASE_URL)
-            cur = conn.cursor()
-            cur.execute("SELECT 1")
-            cur.fetchone()
-            cur.close()
-            conn.close()
-            return _ok("PostgreSQL reachable.")
-        else:                             # Local SQLite
-            conn = sqlite3.connect("app.db")
-            cur = conn.cursor()
-            cur.execute("SELECT 1")
-            cur.fetchone()
-            cur.close()
-            conn.close()
-            return _ok("SQLite reachable.")
+        _probe("SELECT 1")
+        return _ok("PostgreSQL reachable." if DATABASE_URL else "SQLite reachable.")
     except Exception as e:
         return _err(f"DB error: {e}")
 
@@ -484,24 +508,25 @@ def _check_storage():
     except Exception as e:
         return _err(f"Storage error: {e}")
 
-def _check_route(url):
-    try:
-        r = requests.get(url, timeout=5)
-        if r.status_code == 200:
-            return _ok(f"{url} OK")
-        return _err(f"{url} status {r.status_code}")
-    except requests.RequestException as e:
-        return _err(f"{url} error: {e}")
-
 def _check_issue_api():
-    base = request.url_root.rstrip("/")
-    url = f"{base}/api/issuehub/list?category=gameroom&status=all"
-    return _check_route(url)
+    # same query as /api/issuehub/list?category=gameroom&status=all (one row)
+    try:
+        _probe(
+            "SELECT id FROM issuehub_issues WHERE deleted_at IS NULL AND category = ? "
+            "AND status IN ('open','in_progress') ORDER BY created_at DESC, id DESC LIMIT 1",
+            ("gameroom",),
+        )
+        return _ok("Issue Hub list query OK")
+    except Exception as e:
+        return _err(f"Issue Hub list query error: {e}")
 
 def _check_games_api():
-    base = request.url_root.rstrip("/")
-    url = f"{base}/api/games"
-    return _check_route(url)
+    # same table/columns as /api/games (one row)
+    try:
+        _probe("SELECT id, name, status, down_reason FROM games ORDER BY id LIMIT 1")
+        return _ok("Games query OK")
+    except Exception as e:
+        return _err(f"Games query error: {e}")
 
 def _check_weather():
     key = os.environ.get("OPENWEATHER_API_KEY")
@@ -509,11 +534,11 @@ def _check_weather():
         return _skip("No OPENWEATHER_API_KEY set.")
     try:
         # Very small call; adjust your coordinates if needed
-        url = (
-            "https://api.openweathermap.org/data/2.5/weather"
-            f"?lat={LATITUDE}&lon={LONGITUDE}&appid={key}&units=imperial"
+        r = requests.get(
+            OPENWEATHER_URL,
+            params={"lat": LATITUDE, "lon": LONGITUDE, "appid": key, "units": "imperial"},
+            timeout=5,
         )
-        r = requests.get(url, timeout=5)
         if r.status_code == 200:
             return _ok("OpenWeather reachable.")
         return _err(f"OpenWeather status {r.status_code}")
@@ -525,222 +550,337 @@ def _check_ai():
     if not key:
         return _skip("No GEMINI_API_KEY set.")
     try:
-        # Light “ping” – don’t rely on response.text (sometimes empty on finish_reason=2)
-        model = genai.GenerativeModel(MODEL_NAME)
-        resp = model.generate_content("ping", generation_config={"max_output_tokens": 1})
-        # If no exception was thrown, we consider it reachable.
+        # Metadata lookup only: proves key + API reachability without a generation call
+        genai.get_model(f"models/{MODEL_NAME}")
         return _ok("Gemini reachable.")
     except Exception as e:
         return _err(f"Gemini error: {e}")
 
-def _compute_health_payload():
-    services = {
-        "database":   _check_db(),
-        "storage":    _check_storage(),
-        "issue_api":  _check_issue_api(),
-        "games_api":  _check_games_api(),
-        "weather":    _check_weather(),
-        "ai":         _check_ai(),
-    }
+# name -> (check, ttl seconds, deadline seconds)
+_HEALTH_CHECKS = {
+    "database":  (_check_db,         30.0,  3.0),
+    "storage":   (_check_storage,    60.0,  1.0),
+    "issue_api": (_check_issue_api,  30.0,  3.0),
+    "games_api": (_check_games_api,  30.0,  3.0),
+    "weather":   (_check_weather,   300.0,  6.0),
+    "ai":        (_check_ai,        300.0,  8.0),
+}
+_HEALTH_POOL = ThreadPoolExecutor(max_workers=len(_HEALTH_CHECKS), thread_name_prefix="health")
+_HEALTH_LOCK = threading.Lock()
+_HEALTH_STATE = {}  # name -> {"result": dict|None, "ts": float, "future": Future|None}
+
+def _run_check(name):
+    fn, ttl, _ = _HEALTH_CHECKS[name]
+    started = time.monotonic()
+    try:
+        result = fn()
+    except Exception as e:
+        result = _err(f"{name} check failed: {e}")
+    finished = time.monotonic()
+    result = {**result, "latency_ms": round((finished - started) * 1000, 1), "ttl": ttl}
+    with _HEALTH_LOCK:
+        state = _HEALTH_STATE.setdefault(name, {"result": None, "ts": 0.0, "future": None})
+        state["result"], state["ts"], state["future"] = result, finished, None
+    return result
+
+def _health_future(name, force=False):
+    """
+    Returns (cached result or None, future or None).
+    A refresh is started when the result is missing/expired (or forced) and
+    none is already running for this check.
+    """
+    _, ttl, _ = _HEALTH_CHECKS[name]
+    with _HEALTH_LOCK:
+        state = _HEALTH_STATE.setdefault(name, {"result": None, "ts": 0.0, "future": None})
+        fresh = state["result"] is not None and time.monotonic() - state["ts"] < ttl
+        if (force or not fresh) and state["future"] is None:
+            state["future"] = _HEALTH_POOL.submit(_run_check, name)
+        return (state["result"] if not force else None), state["future"]
+
+def _compute_health_payload(force=False):
+    started = time.monotonic()
+    pending = {}
+    services = {}
+    for name in _HEALTH_CHECKS:
+        cached, future = _health_future(name, force=force)
+        if cached is not None:
+            services[name] = {**cached, "stale": future is not None}
+        else:
+            pending[name] = future
+
+    # cold (or forced) checks: wait, each up to its own deadline
+    for name, future in pending.items():
+        deadline = _HEALTH_CHECKS[name][2]
+        try:
+            result = future.result(timeout=max(0.0, started + deadline - time.monotonic()))
+            services[name] = {**result, "stale": False}
+        except Exception:
+            # keeps running in the background; the next call picks it up
+            services[name] = {**_err(f"{name} check timed out after {deadline:g}s"),
+                              "latency_ms": round(deadline * 1000, 1),
+                              "ttl": _HEALTH_CHECKS[name][1], "stale": False}
+
+    services = {name: services[name] for name in _HEALTH_CHECKS}
     overall = "ok" if all(s["status"] in ("ok", "skip") for s in services.values()) else "error"
-    return {"overall": overall, "services": services, "ttl": _HEALTH_TTL}
+    return {"overall": overall, "services": services,
+            "ttl": min(ttl for _, ttl, _ in _HEALTH_CHECKS.values())}
 
 @app.get("/api/health")
 def health_check():
-    now = time.monotonic()
-    if _HEALTH_CACHE["payload"] and (now - _HEALTH_CACHE["ts"] < _HEALTH_TTL):
-        return jsonify(_HEALTH_CACHE["payload"])
-    payload = _compute_health_payload()
-    _HEALTH_CACHE["payload"] = payload
-    _HEALTH_CACHE["ts"] = now
-    return jsonify(payload)
+    return jsonify(_compute_health_payload())
 
 @app.get("/api/health/refresh")
 def health_refresh():
     # Force a fresh run (handy when debugging or after fixing a service)
-    payload = _compute_health_payload()
-    _HEALTH_CACHE["payload"] = payload
-    _HEALTH_CACHE["ts"] = time.monotonic()
-    return jsonify(payload)
+    return jsonify(_compute_health_payload(force=True))
 
 
 # --- 8) AI endpoint --------------------------------------------------------
-@app.post("/api/ai/ask")
-def ai_ask():
+AI_SYSTEM_HINT = (
+    "You are an assistant for the Ultimate Task Manager application. "
+    "Your purpose is to help an arcade operations manager with their daily tasks. "
+    "Respond concisely in 1-2 sentences. "
+    "Do not echo the user's prompt back. "
+    "Your responses should be concise and actionable. "
+)
+AI_GEN_CFG = {"temperature": 0.3, "top_p": 0.9, "max_output_tokens": 1024}
+
+def _ai_request():
+    """Parse the /api/ai/ask body -> (prompt, context, user_msg)."""
     data = request.get_json(silent=True) or {}
     prompt = (data.get("prompt") or "").strip()
     context = data.get("context") or {}
+    if not isinstance(context, dict):
+        context = {}
 
-    if not prompt:
-        return jsonify({"error": "Missing prompt"}), 400
-
-    # Demo path if key is missing (keeps UI usable)
-    if not os.environ.get("GEMINI_API_KEY"):
-        return jsonify({"reply": f"(demo) I got: {prompt}"}), 200
-
-    # ——— build message ———
-    system_hint = (
-        "You are an assistant for the Ultimate Task Manager application. "
-        "Your purpose is to help an arcade operations manager with their daily tasks. "
-        "Respond concisely in 1-2 sentences. "
-        "Do not echo the user's prompt back. "
-        "Your responses should be concise and actionable. "
-    )
     ctx_lines = []
     if context.get("url"):  ctx_lines.append(f"URL: {context['url']}")
     if context.get("page"): ctx_lines.append(f"Page: {context['page']}")
     ctx_text = "\n".join(ctx_lines)
     user_msg = f"{ctx_text}\n\nUser: {prompt}" if ctx_text else prompt
+    return prompt, {k: context.get(k) for k in ("url", "page")}, user_msg
 
-    model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+def _ai_demo_mode():
+    # Demo path if key is missing (keeps UI usable); a fake backend never needs a key
+    return AI.backend.name == "gemini" and not os.environ.get("GEMINI_API_KEY")
 
-    def _extract_text(resp) -> str:
-        """Return concatenated text parts or '' if none."""
-        try:
-            for c in (getattr(resp, "candidates", []) or []):
-                parts = getattr(getattr(c, "content", None), "parts", []) or []
-                texts = [getattr(p, "text", "") for p in parts if getattr(p, "text", "")]
-                if texts:
-                    return "".join(texts).strip()
-        except Exception:
-            pass
-        return ""
+@app.post("/api/ai/ask")
+def ai_ask():
+    prompt, context, user_msg = _ai_request()
+    if not prompt:
+        return jsonify({"error": "Missing prompt"}), 400
+
+    if _ai_demo_mode():
+        return jsonify({"reply": f"(demo) I got: {prompt}"}), 200
 
-    # Create model (handle older SDKs without system_instruction)
+    model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
     try:
-        model = genai.GenerativeModel(model_name, system_instruction=system_hint)
-    except TypeError:
-        model = genai.GenerativeModel(model_name)
-        user_msg = f"{system_hint}\n\n{user_msg}"
+        result = AI.ask(prompt, user_msg, context, model_name, AI_SYSTEM_HINT, AI_GEN_CFG)
+        return jsonify(result), 200
+    except AIBusy as e:
+        resp = jsonify({"error": str(e)})
+        resp.headers["Retry-After"] = "5"
+        return resp, 503
+    except AIEmptyReply as e:
+        # Surface a friendly error with the finish_reason for debugging
+        return jsonify({"error": f"{e}. Try again or shorten your prompt."}), 502
+    except Exception as e:
+        app.logger.exception("AI error")
+        return jsonify({"error": str(e)}), 500
+
 
-    gen_cfg = {"temperature": 0.3, "top_p": 0.9, "max_output_tokens": 1024}
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
 
+@app.post("/api/ai/ask_stream")
+def ai_ask_stream():
+    """
+    Same input as /api/ai/ask, answered as server-sent events:
+      event: delta  data: {"text": "..."}        (as chunks arrive)
+      event: done   data: {"reply", "cached", "ttft_ms", "total_ms"}
+      event: error  data: {"error": "..."}       (failure after the stream started)
+    """
+    prompt, context, user_msg = _ai_request()
+    if not prompt:
+        return jsonify({"error": "Missing prompt"}), 400
+
+    if _ai_demo_mode():
+        reply = f"(demo) I got: {prompt}"
+        body = _sse("delta", {"text": reply}) + _sse(
+            "done", {"reply": reply, "cached": False, "ttft_ms": 0, "total_ms": 0})
+        return Response(body, mimetype="text/event-stream")
+
+    model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
     try:
-        # 1st attempt
-        resp = model.generate_content(user_msg, generation_config=gen_cfg)
-        text = _extract_text(resp)
+        events = AI.ask_stream(prompt, user_msg, context, model_name, AI_SYSTEM_HINT, AI_GEN_CFG)
+    except AIBusy as e:
+        resp = jsonify({"error": str(e)})
+        resp.headers["Retry-After"] = "5"
+        return resp, 503
 
-        # If empty, inspect finish_reason and retry once
-        if not text:
-            finish_reason = None
-            try:
-                finish_reason = getattr(resp.candidates[0], "finish_reason", None)
-            except Exception:
-                pass
-
-            # If MAX_TOKENS (2), try again with a larger cap
-            if finish_reason == 2:
-                resp = model.generate_content(
-                    user_msg,
-                    generation_config={**gen_cfg, "max_output_tokens": 2048},
-                )
-                text = _extract_text(resp)
-
-            # As a last resort, try a stable backup model
-            if not text and model_name != "gemini-1.5-flash":
-                try:
-                    backup = genai.GenerativeModel("gemini-1.5-flash")
-                    resp = backup.generate_content(user_msg, generation_config=gen_cfg)
-                    text = _extract_text(resp)
-                except Exception:
-                    pass
-
-        if not text:
-            # Surface a friendly error with the finish_reason for debugging
-            fr = None
-            try:
-                fr = getattr(resp.candidates[0], "finish_reason", None)
-            except Exception:
-                pass
-            return jsonify({"error": f"AI returned no text (finish_reason={fr}). Try again or shorten your prompt."}), 502
-        def _strip_reflection(reply: str, user: str) -> str:
-            if not reply or not user:
-                return reply
-            r, u = reply.strip(), user.strip()
-            # If the reply starts with the exact prompt, remove it.
-            if r.lower().startswith(u.lower()):
-                r = r[len(u):].lstrip(" \n:,-")
-            return r
-
-        text = _strip_reflection(text, prompt)
-        return jsonify({"reply": text}), 200
+    def generate():
+        try:
+            for kind, value in events:
+                if kind == "delta":
+                    yield _sse("delta", {"text": value})
+                else:
+                    yield _sse("done", value)
+        except AIEmptyReply as e:
+            yield _sse("error", {"error": f"{e}. Try again or shorten your prompt."})
+        except Exception as e:
+            app.logger.exception("AI stream error")
+            yield _sse("error", {"error": str(e)})
+        finally:
+            events.close()
 
-    except Exception as e:
-        app.logger.exception("AI error")
-        return jsonify({"error": str(e)}), 500
+    resp = Response(generate(), mimetype="text/event-stream")
+    # gives the limiter slot back even if the body is never iterated
+    resp.call_on_close(events.close)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"  # don't let a proxy buffer the stream
+    return resp
+
+
+# counters snapshot: one aggregate query, cached briefly per process and keyed
+# on the issues/games versions, so a write in any worker is seen by every worker
+DASHBOARD_METRICS_TTL = float(os.environ.get("DASHBOARD_METRICS_TTL", "15"))
+_dashboard_cache = TTLCache(DASHBOARD_METRICS_TTL, maxsize=8, tags=("issues", "games"))
+
+def _compute_dashboard_metrics(db):
+    """
+    All dashboard counters in one round trip. "Today" is passed in as a
+    'YYYY-MM-DD' parameter so the same SQL works on SQLite and Postgres.
+    Every counter only looks at not-closed issues, so the WHERE matches the
+    partial index ix_issues_live_status_updated_target and the whole
+    aggregate is one covering-index scan over the live rows.
+    """
+    ph = "%s" if hasattr(db, "dsn") else "?"
+    today = _date.today().isoformat()
+    cur = db.cursor()
+    try:
+        cur.execute(f"""
+            SELECT
+                COALESCE(SUM(CASE WHEN status = 'open' THEN 1 ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN status = 'in_progress' THEN 1 ELSE 0 END), 0),
+                -- stale in_progress: last_updated before today
+                COALESCE(SUM(CASE WHEN status = 'in_progress'
+                                   AND last_updated < {ph} THEN 1 ELSE 0 END), 0),
+                -- overdue targets (closed rows are already filtered out)
+                COALESCE(SUM(CASE WHEN target_date < {ph} THEN 1 ELSE 0 END), 0),
+                (SELECT COUNT(*) FROM games WHERE LOWER(status) = 'down')
+            FROM issues
+            WHERE status NOT IN ('resolved','archived','trash')
+        """, (today, today))
+        row = cur.fetchone()
+    finally:
+        cur.close()
 
+    return {
+        "open_issues": int(row[0]),
+        "in_progress": int(row[1]),
+        "stale_in_progress": int(row[2]),
+        "overdue_targets": int(row[3]),
+        "down_games": int(row[4]),
+    }
 
 @app.get("/api/dashboard/metrics")
 def dashboard_metrics():
     db = get_db()
-    cur = db.cursor()
-    # counts from issues table
-    cur.execute("SELECT COUNT(*) FROM issues WHERE status='open';")
-    open_issues = cur.fetchone()[0]
-
-    cur.execute("SELECT COUNT(*) FROM issues WHERE status='in_progress';")
-    in_progress = cur.fetchone()[0]
-
-    # stale in_progress: last_updated before today
-    cur.execute("""
-        SELECT COUNT(*) FROM issues
-        WHERE status='in_progress'
-          AND date(last_updated) < date('now', 'localtime')
-    """)
-    stale_in_progress = cur.fetchone()[0]
-
-    # overdue targets (not resolved/archived)
-    cur.execute("""
-        SELECT COUNT(*) FROM issues
-        WHERE target_date IS NOT NULL
-          AND DATE(target_date) < DATE('now','localtime')
-          AND status NOT IN ('resolved','archived','trash')
-    """)
-    overdue_targets = cur.fetchone()[0]
-
-    # down games (assumes games table has status column)
-    try:
-        cur.execute("SELECT COUNT(*) FROM games WHERE lower(status)='down';")
-        down_games = cur.fetchone()[0]
-    except Exception:
-        down_games = 0  # if column doesn't exist yet
-
-    return jsonify({
-        "open_issues": open_issues,
-        "in_progress": in_progress,
-        "stale_in_progress": stale_in_progress,
-        "overdue_targets": overdue_targets,
-        "down_games": down_games,
-    })
+    try:
+        # keyed by date so "stale"/"overdue" roll over at midnight
+        key = (_date.today().isoformat(), tuple(table_versions(db, "issues", "games").values()))
+        metrics = _dashboard_cache.get_or_set(key, lambda: _compute_dashboard_metrics(db))
+    except Exception as e:
+        db.rollback()
+        app.logger.error("dashboard_metrics error: %s", e)
+        return jsonify({"error": "Failed to compute metrics"}), 500
+    return jsonify(metrics)
 
 
 
 # --- NEW: PM Tracking APIs ------------------------------------------------
+def _pm_filters(args):
+    """?from=&to=&game=&technician= -> kwargs for games_db.iter_pm_logs (ValueError if bad)."""
+    filters = {}
+    for arg, key in (("from", "date_from"), ("to", "date_to")):
+        raw = (args.get(arg) or "").strip()
+        if raw:
+            try:
+                filters[key] = _date.fromisoformat(raw[:10]).isoformat()
+            except ValueError:
+                raise ValueError(f"'{arg}' must be YYYY-MM-DD")
+    raw = (args.get("game") or "").strip()
+    if raw:
+        try:
+            filters["game_id"] = int(raw)
+        except ValueError:
+            raise ValueError("'game' must be a game id")
+    technician = (args.get("technician") or "").strip()
+    if technician:
+        filters["technician"] = technician
+    return filters
+
 @app.route('/api/pms', methods=['GET'])
 def get_pms():
+    """
+    PM history, newest first. Filters: from, to, game, technician.
+    - paged (limit / cursor / fields given): {"items": [...], "next_cursor": ...}
+      keyset on (pm_date, id)
+    - otherwise the full (filtered) history as {"items": [...]}, streamed
+      from the DB in batches instead of being built in memory
+    """
     db = get_db()
-    cur = db.cursor()
     try:
-        # CAST makes join safe even if pm_logs.game_id is TEXT
-        cur.execute("""
-            SELECT
-                p.pm_date               AS pm_date,
-                COALESCE(p.notes, '')   AS notes,
-                COALESCE(p.completed_by,'') AS completed_by,
-                COALESCE(g.name, '')    AS game_name
-            FROM pm_logs p
-            LEFT JOIN games g ON CAST(p.game_id AS INTEGER) = g.id
-            ORDER BY p.pm_date DESC, p.id DESC;
-        """)
-        rows = cur.fetchall()
-        cols = [d[0] for d in cur.description]
-        data = [dict(zip(cols, r)) for r in rows]
-        return jsonify({"items": data})
-    except Exception as e:
-        app.logger.error("Error fetching PM history: %s", e)
-        return jsonify({"error": "Failed to fetch PM history"}), 500
-    finally:
-        cur.close()
+        filters = _pm_filters(request.args)
+        fields = parse_fields(request.args.get("fields"), PM_LOG_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag, unchanged = not_modified(db, "pm_logs", "games")  # game_name comes from the games join
+    if unchanged:
+        return unchanged
+
+    if wants_page(request.args):
+        limit = parse_limit(request.args.get("limit"))
+        after = None
+        if request.args.get("cursor"):
+            try:
+                pm_date, last_id = decode_cursor(request.args["cursor"], size=2)
+                after = (pm_date, int(last_id))
+            except (TypeError, ValueError):
+                return jsonify({"error": "invalid cursor"}), 400
+        try:
+            items = list(iter_pm_logs(db, after=after, limit=limit + 1, **filters))
+        except Exception as e:
+            db.rollback()
+            app.logger.error("Error fetching PM history: %s", e)
+            return jsonify({"error": "Failed to fetch PM history"}), 500
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1]["pm_date"], items[-1]["id"])
+        if fields:
+            items = [{f: it[f] for f in fields} for it in items]
+        return with_etag(jsonify({"items": items, "next_cursor": next_cursor}), etag)
+
+    # the body is produced after the request context is torn down, so the
+    # response takes over the connection (close_db won't see it) and closes it
+    # when it is closed - also when the body is never iterated (HEAD, early disconnect)
+    stream_db = g.pop("db")
+
+    def generate():
+        yield b'{"items": ['
+        try:
+            for i, item in enumerate(iter_pm_logs(stream_db, **filters)):
+                yield (b"," if i else b"") + dumps_bytes(item)
+        except Exception as e:
+            # headers are already sent; log and close the array so the body stays valid JSON
+            app.logger.error("Error streaming PM history: %s", e)
+        yield b"]}"
+
+    resp = Response(generate(), mimetype="application/json")
+    resp.call_on_close(stream_db.close)
+    return with_etag(resp, etag)
 
 @app.route('/api/pms/add', methods=['POST'])
 def add_pm():
@@ -754,19 +894,30 @@ def add_pm():
     if not game_id or not pm_date_str:
         return jsonify({"error": "Missing required fields"}), 400
 
-    is_postgres = hasattr(db, "dsn")
-    placeholders = "%s, %s, %s, %s" if is_postgres else "?, ?, ?, ?"
-    sql_stmt = f"INSERT INTO pm_logs (game_id, pm_date, notes, completed_by) VALUES ({placeholders})"
-
     try:
-        try:
-            game_id_int = int(game_id)
-        except (TypeError, ValueError):
-            game_id_int = game_id  # fallback; CAST in SELECT handles it
+        game_id = int(game_id)
+    except (TypeError, ValueError):
+        return jsonify({"error": "pmGame must be a game id"}), 400
+
+    ph = "%s" if hasattr(db, "dsn") else "?"
+    # game_name is copied from games so the log still reads well if the game is removed
+    sql_stmt = (
+        "INSERT INTO pm_logs (game_id, game_name, pm_date, notes, completed_by) "
+        f"SELECT {ph}, COALESCE((SELECT name FROM games WHERE id = {ph}), ''), {ph}, {ph}, {ph}"
+    )
+    if ph == "%s":
+        sql_stmt += " RETURNING id"
 
+    cur = None
+    try:
         cur = db.cursor()
-        cur.execute(sql_stmt, (game_id_int, pm_date_str, notes, completed_by))
+        cur.execute(sql_stmt, (game_id, game_id, pm_date_str, notes, completed_by))
+        pm_id = cur.fetchone()[0] if ph == "%s" else cur.lastrowid
+        pm_schedule.refresh_game(db, game_id)  # same transaction as the log
+        log_change(db, "pm_logs", pm_id, "insert")
+        bump_table_version(db, "pm_logs")
         db.commit()
+        invalidate("pm_logs", "games")
         return jsonify({"success": True, "message": "PM logged successfully!"})
     except Exception as e:
         db.rollback()
@@ -778,90 +929,192 @@ def add_pm():
         except Exception:
             pass
 
+# PM status per game, read from the stored schedule on games
+# (last_pm_date / pm_next_due, kept current by pm_schedule). Keyed on the
+# pm_logs/games versions, so a write in any worker is seen by every worker;
+# the TTL is only a backstop.
+PM_STATUS_TTL = float(os.environ.get("PM_STATUS_TTL", "300"))
+PM_DAILY_INTERVAL = float(os.environ.get("PM_DAILY_INTERVAL", "86400"))
+_pm_status_cache = TTLCache(PM_STATUS_TTL, maxsize=8, tags=("pm_logs", "games"))
+
 @app.get("/api/pms/last_by_game")
 def api_pm_last_by_game():
     db = get_db()
-    cur = db.cursor()
     try:
-        # 1) All games
-        cur.execute("SELECT id, name FROM games ORDER BY name;")
-        games = cur.fetchall()
-        # Normalize rows → list of dicts
-        gcols = [d[0] for d in cur.description]
-        games = [dict(zip(gcols, r)) for r in games]
-
-        # 2) Last PM per game (handles TEXT or INT game_id)
-        cur.execute("""
-            SELECT CAST(game_id AS INTEGER) AS gid, MAX(pm_date) AS last_pm
-            FROM pm_logs
-            GROUP BY CAST(game_id AS INTEGER)
-        """)
-        rows = cur.fetchall()
-        rcols = [d[0] for d in cur.description]
-        last_map = {}
-        for r in rows:
-            drow = dict(zip(rcols, r))
-            last_map[drow["gid"]] = drow["last_pm"]  # date or str YYYY-MM-DD
-
-        today = _date.today()
-        items = []
-        for g in games:
-            gid = g["id"]
-            gname = g["name"]
-            raw = last_map.get(gid)
-            last_dt = None
-            if raw:
-                # Postgres returns date; SQLite usually returns str 'YYYY-MM-DD'
-                if isinstance(raw, _date):
-                    last_dt = raw
-                elif isinstance(raw, str):
-                    try:
-                        last_dt = datetime.strptime(raw[:10], "%Y-%m-%d").date()
-                    except Exception:
-                        last_dt = None
-
-            if last_dt is None:
-                status = "due"           # never PM'd → due
-                days_since = None
-            else:
-                days_since = (today - last_dt).days
-                if days_since >= 90:
-                    status = "due"
-                elif days_since >= 75:
-                    status = "soon"
-                else:
-                    status = "ok"
-
-            items.append({
-                "game_id": gid,
-                "game_name": gname,
-                "last_pm_date": (last_dt.isoformat() if last_dt else None),
-                "days_since": (int(days_since) if days_since is not None else None),
-                "status": status
-            })
-
-        # Sort: due → soon → ok, then name
-        order = {"due": 0, "soon": 1, "ok": 2}
-        items.sort(key=lambda x: (order.get(x["status"], 9), (x["game_name"] or "").lower()))
+        # keyed by date so days_since / status roll over at midnight
+        key = (_date.today().isoformat(), tuple(table_versions(db, "pm_logs", "games").values()))
+        items = _pm_status_cache.get_or_set(key, lambda: pm_schedule.status_rows(db))
         return jsonify({"items": items})
     except Exception as e:
         db.rollback()
         app.logger.error("api_pm_last_by_game error: %s", e)
         return jsonify({"error": f"{e}"}), 500
-    finally:
+
+@app.get("/api/pms/due")
+def api_pm_due():
+    """
+    Games whose next PM falls within ?within=N days (never-PM'd games included).
+    Without ?within the list stored by today's daily job is served as-is.
+    """
+    db = get_db()
+    within = request.args.get("within")
+    try:
+        if within is None:
+            stored = pm_schedule.stored_due_list(db)
+            if stored is not None:
+                return jsonify({"within": stored["window"], "items": stored["items"], "stored": True})
+            within = pm_schedule.PM_SOON_WINDOW
         try:
-            cur.close()
-        except Exception:
-            pass
+            within = int(within)
+        except (TypeError, ValueError):
+            return jsonify({"error": "within must be a number of days"}), 400
+        return jsonify({"within": within, "items": pm_schedule.due_within(db, within), "stored": False})
+    except Exception as e:
+        db.rollback()
+        app.logger.error("api_pm_due error: %s", e)
+        return jsonify({"error": f"{e}"}), 500
+
+def _pm_daily_job():
+    pm_schedule.daily_due_job(get_db())
+    invalidate("games")
 
 @app.get("/daily-tasks")
 def daily_tasks_page():
     return render_template("daily_tasks.html")            
 
 
+# --- Change feed APIs ------------------------------------------------------
+# Instead of every tab re-fetching lists on a timer, pages subscribe to
+# /api/changes/stream and reload a list only when its table changed.
+# Each open stream holds one worker thread (no DB connection), so run
+# gunicorn with threads, e.g. --worker-class gthread --threads 16.
+CHANGE_FEED_HEARTBEAT = float(os.environ.get("CHANGE_FEED_HEARTBEAT", "15"))
+CHANGE_FEED_MAX_SECONDS = float(os.environ.get("CHANGE_FEED_MAX_SECONDS", "300"))
+CHANGE_LOG_PRUNE_INTERVAL = float(os.environ.get("CHANGE_LOG_PRUNE_INTERVAL", "86400"))
+
+def _change_args():
+    """(since, entities) from ?since= (or Last-Event-ID) and ?entities=a,b."""
+    raw = request.headers.get("Last-Event-ID") or request.args.get("since") or ""
+    since = int(raw) if raw.strip() else None
+    if since is not None and since < 0:
+        raise ValueError
+    entities = [e for e in (request.args.get("entities") or "").split(",") if e.strip()]
+    return since, [e.strip() for e in entities]
+
+def _changes_backlog(db, since, entities):
+    """Entries after `since`, or None when the client is too far behind to catch up."""
+    if since < change_log.oldest_seq(db) - 1:
+        return None  # pruned away
+    backlog = change_log.changes_since(db, since, entities, limit=change_log.CHANGES_PAGE + 1)
+    return None if len(backlog) > change_log.CHANGES_PAGE else backlog
+
+@app.get("/api/changes")
+def api_changes():
+    """One-shot read: {seq, changes, reset}. reset=true -> reload everything, continue from seq."""
+    db = get_db()
+    try:
+        since, entities = _change_args()
+    except ValueError:
+        return jsonify({"error": "since must be a sequence number"}), 400
+    try:
+        latest = change_log.latest_seq(db)
+        if since is None:
+            return jsonify({"seq": latest, "changes": [], "reset": False})
+        backlog = _changes_backlog(db, since, entities)
+        if backlog is None:
+            return jsonify({"seq": latest, "changes": [], "reset": True})
+        seq = max([since] + [c["seq"] for c in backlog]) if backlog else max(since, latest)
+        return jsonify({"seq": seq, "changes": backlog, "reset": False})
+    except Exception as e:
+        db.rollback()
+        app.logger.error("api_changes error: %s", e)
+        return jsonify({"error": "Failed to read changes"}), 500
+
+def _feed_event(event, data, seq=None):
+    head = f"id: {seq}\n" if seq is not None else ""
+    return head.encode() + f"event: {event}\n".encode() + b"data: " + dumps_bytes(data) + b"\n\n"
+
+@app.get("/api/changes/stream")
+def api_changes_stream():
+    """
+    Server-sent events. ?since=<seq> (or Last-Event-ID on reconnect) replays
+    what was missed, then pushes each new change as it commits:
+      event: change  data: {seq, entity, id, op, at}   (id: = seq)
+      event: reset   data: {seq}  -> client is too far behind, reload everything
+      event: ready   data: {seq}  -> caught up; seq is the position to resume from
+    The stream ends after CHANGE_FEED_MAX_SECONDS; EventSource reconnects by itself.
+    """
+    if request.method == "HEAD":  # a body that is never read would hold a subscription
+        resp = jsonify({"error": "Method not allowed"})
+        resp.headers["Allow"] = "GET"
+        return resp, 405
+    db = get_db()
+    try:
+        since, entities = _change_args()
+    except ValueError:
+        return jsonify({"error": "since must be a sequence number"}), 400
+    wanted = set(entities)
+    try:
+        pos = change_log.FEED.subscribe(db)
+        try:
+            latest = change_log.latest_seq(db)
+            backlog = [] if since is None else _changes_backlog(db, since, entities)
+        except Exception:
+            change_log.FEED.unsubscribe()
+            raise
+    except Exception as e:
+        db.rollback()
+        app.logger.error("api_changes_stream error: %s", e)
+        return jsonify({"error": "Failed to open change feed"}), 500
+
+    def generate():
+        yield b"retry: 3000\n\n"
+        sent = set()
+        if backlog is None:
+            yield _feed_event("reset", {"seq": latest}, latest)
+        else:
+            for c in backlog:
+                sent.add(c["seq"])
+                yield _feed_event("change", c, c["seq"])
+        ready = max([since or 0, latest] + list(sent))
+        yield _feed_event("ready", {"seq": ready}, ready)
+        cursor = pos
+        deadline = time.monotonic() + CHANGE_FEED_MAX_SECONDS
+        while time.monotonic() < deadline:
+            entries, cursor, gap = change_log.FEED.wait(
+                cursor, min(CHANGE_FEED_HEARTBEAT, max(0.0, deadline - time.monotonic())))
+            if gap:
+                seq = change_log.FEED.last_seq or 0
+                yield _feed_event("reset", {"seq": seq}, seq)
+                continue
+            if not entries:
+                yield b": ping\n\n"  # keeps proxies from closing an idle stream
+                continue
+            for c in entries:
+                if c["seq"] in sent or (wanted and c["entity"] not in wanted):
+                    continue
+                yield _feed_event("change", c, c["seq"])
+
+    resp = Response(generate(), mimetype="text/event-stream")
+    # runs when the response is closed, even if the body was never iterated
+    resp.call_on_close(change_log.FEED.unsubscribe)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"  # nginx: don't buffer the stream
+    return resp
+
+def _change_feed_poll():
+    if not change_log.FEED.idle():  # no open stream -> no query, no connection
+        change_log.FEED.poll(get_db())
+
+def _change_log_prune():
+    change_log.prune_change_log(get_db())
+
 # --- 9) Module Registration ------------------------------------------------
 register_issue_hub_blueprint(app, get_db, ensure_id_sequences)  # page blueprint
 register_game_routes(app, get_db)                               # APIs
+start_periodic(app, "pm_daily", PM_DAILY_INTERVAL, _pm_daily_job)  # PM due list
+start_periodic(app, "change_feed", change_log.CHANGE_FEED_POLL, _change_feed_poll)  # SSE fan-out
+start_periodic(app, "change_log_prune", CHANGE_LOG_PRUNE_INTERVAL, _change_log_prune)
 register_issue_routes(app, get_db)
 
 # --- 10) Entrypoint --------------------------------------------------------
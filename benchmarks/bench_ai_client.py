@@ -0,0 +1,69 @@
+# bench_ai_client.py
+# Burst behaviour of ai_client.AIClient with a FakeBackend (no network):
+#   - how many calls are served / rejected (AIBusy -> 503) under a burst
+#   - wall time with the limiter vs. the upstream latency
+#   - repeated prompts answered from the response cache
+#   - time to first token: ask() (whole reply) vs ask_stream() (SSE route)
+#
+# Usage (from the project root):  python benchmarks/bench_ai_client.py
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ai_client import AIBusy, AIClient, FakeBackend  # noqa: E402
+
+# --- SETTINGS ---
+UPSTREAM_DELAY = 0.5     # seconds per fake generation
+BURST = 40               # simultaneous requests
+DISTINCT_PROMPTS = 10    # burst cycles through this many prompts
+MAX_CONCURRENCY = 4
+MAX_QUEUE = 8
+QUEUE_TIMEOUT = 3.0
+# --- END OF SETTINGS ---
+
+
+def main():
+    backend = FakeBackend(delay=UPSTREAM_DELAY)
+    client = AIClient(backend=backend, max_concurrency=MAX_CONCURRENCY, max_queue=MAX_QUEUE,
+                      queue_timeout=QUEUE_TIMEOUT, cache_ttl=300)
+
+    def one(i):
+        prompt = f"how do I reset machine {i % DISTINCT_PROMPTS}?"
+        start = time.perf_counter()
+        try:
+            r = client.ask(prompt, prompt, {"page": "dashboard"}, "fake-model", "sys", {})
+            outcome = "cached" if r["cached"] else "upstream"
+        except AIBusy:
+            outcome = "busy"
+        return outcome, (time.perf_counter() - start) * 1000
+
+    for round_name in ("cold burst", "warm burst"):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(BURST) as pool:
+            results = list(pool.map(one, range(BURST)))
+        wall = time.perf_counter() - start
+        counts = {k: sum(1 for o, _ in results if o == k) for k in ("upstream", "cached", "busy")}
+        worst = max(ms for _, ms in results)
+        print(f"{round_name:<11} {BURST} requests in {wall:5.2f}s  {counts}  "
+              f"slowest {worst:7.1f} ms  upstream calls total: {backend.calls}")
+
+    # first token: blocking call vs stream (fresh client, nothing cached)
+    backend = FakeBackend(reply="Power-cycle the card reader, then re-seat the ticket dispenser cable.",
+                          delay=UPSTREAM_DELAY)
+    client = AIClient(backend=backend, cache_ttl=0)
+    start = time.perf_counter()
+    client.ask("reset?", "reset?", {}, "fake-model", "sys", {})
+    blocking = (time.perf_counter() - start) * 1000
+    info = {}
+    for kind, value in client.ask_stream("reset?", "reset?", {}, "fake-model", "sys", {}):
+        if kind == "done":
+            info = value
+    print(f"first token  ask: {blocking:7.1f} ms   ask_stream: {info['ttft_ms']:7.1f} ms "
+          f"(stream total {info['total_ms']:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# bench_change_feed.py
+# Read cost per minute of keeping TABS notification bells current
+# (each refresh = 4 Issue Hub list queries):
+#   polling -> every tab refreshes every POLL_SECONDS, writes or not
+#   feed    -> one change_log poll per second per worker (change_log.FEED),
+#              and a tab refreshes only in minutes with >= 1 write (the bell
+#              listens with minInterval = 60 s, so never more than polling)
+# Printed for several write rates (writes arrive at random, Poisson).
+# Also times log_change() inside a write transaction (the cost writers pay).
+#
+# Usage (from the project root):  python benchmarks/bench_change_feed.py
+
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import change_log  # noqa: E402
+
+# --- SETTINGS ---
+ISSUES = 20_000
+TABS = 25
+POLL_SECONDS = 60
+WRITES_PER_MINUTE = (0, 0.1, 0.5, 2, 10)
+WORKERS = 2
+LOG_ROWS = 200_000      # change_log size (a month of busy writes)
+# --- END OF SETTINGS ---
+
+# what one /api/issuehub/list?category=&status= call runs
+_LIST_SQL = ("SELECT * FROM issuehub_issues WHERE deleted_at IS NULL AND category = ? "
+             "AND status = ? ORDER BY created_at DESC, id DESC")
+
+
+def _setup(path):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE issuehub_issues (
+            id TEXT PRIMARY KEY, category TEXT, title TEXT, details TEXT, status TEXT,
+            created_at TIMESTAMP, updated_at TIMESTAMP, deleted_at TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX ix_live ON issuehub_issues (category, status, created_at) "
+                 "WHERE deleted_at IS NULL")
+    conn.executemany(
+        "INSERT INTO issuehub_issues VALUES (?, ?, ?, ?, ?, ?, ?, NULL)",
+        ((f"IH{i:06d}", random.choice(("gameroom", "facility")), "lane jammed " * 3,
+          "details " * 20, random.choice(("open", "in_progress", "resolved")),
+          f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}", None) for i in range(ISSUES)),
+    )
+    change_log.ensure_change_log(conn)
+    conn.executemany(
+        "INSERT INTO change_log (entity, entity_id, op) VALUES ('issuehub_issues', ?, 'update')",
+        ((f"IH{random.randrange(ISSUES):06d}",) for _ in range(LOG_ROWS)),
+    )
+    conn.commit()
+    return conn
+
+
+def _timed(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _setup(os.path.join(tmp, "bench.db"))
+
+        def tab_refresh():
+            for cat in ("gameroom", "facility"):
+                for status in ("open", "in_progress"):
+                    conn.execute(_LIST_SQL, (cat, status)).fetchall()
+
+        head = change_log.latest_seq(conn)
+        list_ms = _timed(tab_refresh, 20)
+        poll_ms = _timed(lambda: change_log.changes_since(conn, head - change_log.CHANGE_FEED_OVERLAP), 200)
+
+        def write():
+            conn.execute("UPDATE issuehub_issues SET updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                         (f"IH{random.randrange(ISSUES):06d}",))
+            conn.commit()
+
+        def write_logged():
+            iid = f"IH{random.randrange(ISSUES):06d}"
+            conn.execute("UPDATE issuehub_issues SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (iid,))
+            change_log.log_change(conn, "issuehub_issues", iid, "update")
+            conn.commit()
+
+        plain_ms, logged_ms = _timed(write, 300), _timed(write_logged, 300)
+
+        polling = TABS * (60 / POLL_SECONDS) * list_ms
+        print(f"one tab refresh (4 list queries): {list_ms:.2f} ms   feed poll: {poll_ms:.3f} ms")
+        print(f"DB ms per minute, {TABS} tabs (polling every {POLL_SECONDS}s: {polling:.1f} ms)")
+        for rate in WRITES_PER_MINUTE:
+            busy = 1 - math.exp(-rate)  # chance a minute has at least one write
+            feed = WORKERS * 60 * poll_ms + busy * TABS * list_ms
+            print(f"  {rate:>4} writes/min   feed {feed:9.1f} ms   ({feed / polling:5.1%} of polling)")
+        print(f"single-row write + commit: {plain_ms:.3f} ms plain, {logged_ms:.3f} ms with log_change")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
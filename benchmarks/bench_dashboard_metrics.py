@@ -0,0 +1,113 @@
+# bench_dashboard_metrics.py
+# Latency of GET /api/dashboard/metrics' SQL on a large issues table:
+#   five_queries -> old route: one COUNT(*) per counter (5 round trips)
+#   single_query -> app._compute_dashboard_metrics (one aggregate, partial covering index)
+#   cached       -> single_query behind cache_utils.TTLCache (hit path)
+# Builds its own SQLite file with the same tables + indexes as the app.
+#
+# Usage (from the project root):  python benchmarks/bench_dashboard_metrics.py
+
+import os
+import sys
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_utils import TTLCache  # noqa: E402
+from db_indexes import ensure_indexes  # noqa: E402
+
+# --- SETTINGS ---
+ISSUES = 100_000
+GAMES = 500
+ROUNDS = 50
+# --- END OF SETTINGS ---
+
+STATUSES = ["open"] * 2 + ["in_progress"] * 2 + ["resolved"] * 10 + ["archived"] * 6
+
+
+def _setup(path):
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE issues (
+        issue_id TEXT PRIMARY KEY, description TEXT, status TEXT,
+        date_logged TEXT, last_updated TEXT, target_date TEXT)""")
+    conn.execute("CREATE TABLE games (id INTEGER PRIMARY KEY, name TEXT, status TEXT)")
+    today = date.today()
+    rows = []
+    for i in range(ISSUES):
+        logged = today - timedelta(days=random.randint(0, 720))
+        target = logged + timedelta(days=random.randint(1, 60)) if random.random() < 0.3 else None
+        rows.append((f"IS-{i:06d}", f"issue {i}", random.choice(STATUSES),
+                     logged.isoformat(), (logged + timedelta(days=1)).isoformat(),
+                     target.isoformat() if target else None))
+    conn.executemany("INSERT INTO issues VALUES (?,?,?,?,?,?)", rows)
+    conn.executemany("INSERT INTO games (name, status) VALUES (?, ?)",
+                     [(f"game {i}", "Down" if i % 25 == 0 else "Up") for i in range(GAMES)])
+    conn.commit()
+    ensure_indexes(conn, "issues")
+    ensure_indexes(conn, "games")
+    conn.execute("ANALYZE;")
+    return conn
+
+
+def five_queries(conn):
+    cur = conn.cursor()
+    out = []
+    for q in (
+        "SELECT COUNT(*) FROM issues WHERE status = 'open'",
+        "SELECT COUNT(*) FROM issues WHERE status = 'in_progress'",
+        "SELECT COUNT(*) FROM issues WHERE status = 'in_progress' "
+        "AND last_updated < date('now','localtime')",
+        "SELECT COUNT(*) FROM issues WHERE target_date IS NOT NULL "
+        "AND target_date < DATE('now','localtime') "
+        "AND status NOT IN ('resolved','archived','trash')",
+        "SELECT COUNT(*) FROM games WHERE LOWER(status) = 'down'",
+    ):
+        cur.execute(q)
+        out.append(cur.fetchone()[0])
+    return out
+
+
+def single_query(conn):
+    # same statement as app._compute_dashboard_metrics
+    today = date.today().isoformat()
+    cur = conn.execute("""
+        SELECT
+            COALESCE(SUM(CASE WHEN status = 'open' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN status = 'in_progress' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN status = 'in_progress'
+                               AND last_updated < ? THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN target_date < ? THEN 1 ELSE 0 END), 0),
+            (SELECT COUNT(*) FROM games WHERE LOWER(status) = 'down')
+        FROM issues
+        WHERE status NOT IN ('resolved','archived','trash')
+    """, (today, today))
+    return list(cur.fetchone())
+
+
+def _time(label, fn):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn()
+    ms = (time.perf_counter() - start) * 1000 / ROUNDS
+    print(f"{label:<14} {ms:9.3f} ms/request  -> {result}")
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _setup(os.path.join(tmp, "bench.db"))
+        print(f"{ISSUES} issues, {GAMES} games, {ROUNDS} rounds")
+        old = _time("five_queries", lambda: five_queries(conn))
+        new = _time("single_query", lambda: single_query(conn))
+        cache = TTLCache(60)
+        _time("cached", lambda: cache.get_or_set("today", lambda: single_query(conn)))
+        assert old == new, f"counters differ: {old} != {new}"
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
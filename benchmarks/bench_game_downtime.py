@@ -0,0 +1,101 @@
+# bench_game_downtime.py
+# Downtime report for every game over a date range:
+#   replay -> read the whole game_status_history and walk each game's
+#             transitions in Python (what you'd do without outage rows)
+#   report -> game_status.downtime_report: one query, games LEFT JOIN
+#             game_outages on ix_game_outages_game_down
+# Also times one Up/Down transition (history row + outage + running totals).
+#
+# Usage (from the project root):  python benchmarks/bench_game_downtime.py
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import game_status  # noqa: E402
+from games_db import ensure_games_table, ensure_game_status_tables  # noqa: E402
+
+# --- SETTINGS ---
+GAMES = 300
+OUTAGES_PER_GAME = 400        # a few years of breakdowns
+WINDOW_DAYS = 30
+ROUNDS = 5
+# --- END OF SETTINGS ---
+
+DAY = 86_400
+
+
+def _setup(path, now):
+    conn = sqlite3.connect(path)
+    ensure_games_table(conn)
+    ensure_game_status_tables(conn)
+    start = now - 3 * 365 * DAY
+    conn.executemany(
+        "INSERT INTO games (id, name, status, status_tracked_since) VALUES (?, ?, 'Up', ?)",
+        ((g, f"Game {g:03d}", start) for g in range(1, GAMES + 1)),
+    )
+    outages, history = [], []
+    for g in range(1, GAMES + 1):
+        t = start
+        for _ in range(OUTAGES_PER_GAME):
+            t += random.randint(DAY // 4, 5 * DAY)
+            up = t + random.randint(600, DAY)
+            outages.append((g, t, up))
+            history.append((g, "Up", "Down", datetime.fromtimestamp(t, timezone.utc).replace(tzinfo=None)))
+            history.append((g, "Down", "Up", datetime.fromtimestamp(up, timezone.utc).replace(tzinfo=None)))
+            t = up
+    conn.executemany("INSERT INTO game_outages (game_id, down_ts, up_ts) VALUES (?, ?, ?)", outages)
+    conn.executemany("INSERT INTO game_status_history (game_id, from_status, to_status, changed_at) "
+                     "VALUES (?, ?, ?, ?)", history)
+    conn.commit()
+    return conn
+
+
+def replay(conn, start, end):
+    down_since, total = {}, {}
+    for gid, to_status, changed_at in conn.execute(
+            "SELECT game_id, to_status, changed_at FROM game_status_history ORDER BY game_id, changed_at"):
+        ts = int(datetime.fromisoformat(changed_at).replace(tzinfo=timezone.utc).timestamp())
+        if to_status == "Down":
+            down_since[gid] = ts
+        elif gid in down_since:
+            lo, hi = max(down_since.pop(gid), start), min(ts, end)
+            if hi > lo:
+                total[gid] = total.get(gid, 0) + hi - lo
+    return total
+
+
+def _time(fn):
+    fn()
+    t = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - t) * 1000 / ROUNDS
+
+
+def main():
+    now = int(time.time())
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"building {GAMES} games x {OUTAGES_PER_GAME} outages …")
+        conn = _setup(os.path.join(tmp, "bench.db"), now)
+        start, end = now - WINDOW_DAYS * DAY, now
+        replay_ms = _time(lambda: replay(conn, start, end))
+        report_ms = _time(lambda: game_status.downtime_report(conn, start, end, now=now))
+        print(f"{WINDOW_DAYS}-day report: replay {replay_ms:8.2f} ms   single query {report_ms:8.2f} ms")
+
+        def flip():
+            gid = random.randint(1, GAMES)
+            game_status.record_status(conn, gid, "Down", "bench")
+            game_status.record_status(conn, gid, "Up")
+            conn.commit()
+        print(f"Down + Up transition pair, committed: {_time(flip):.3f} ms")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
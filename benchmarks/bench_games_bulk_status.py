@@ -0,0 +1,78 @@
+# bench_games_bulk_status.py
+# Marking a bank of games Down (and back Up) on a SQLite file:
+#   per_game -> what N x PUT /api/games/<id> does: record_status + UPDATE +
+#               commit, once per game
+#   bulk     -> what POST /api/games/bulk_status does: one SELECT, one
+#               UPDATE ... WHERE id IN (...), batched history/outage rows,
+#               one commit
+#
+# Usage (from the project root):  python benchmarks/bench_games_bulk_status.py
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import game_status  # noqa: E402
+from games_db import ensure_games_table, ensure_game_status_tables  # noqa: E402
+
+# --- SETTINGS ---
+GAMES = 400
+BANK_SIZES = (10, 50, 200)
+ROUNDS = 5
+# --- END OF SETTINGS ---
+
+
+def _setup(path):
+    conn = sqlite3.connect(path)
+    ensure_games_table(conn)
+    ensure_game_status_tables(conn)
+    conn.executemany("INSERT INTO games (id, name, status) VALUES (?, ?, 'Up')",
+                     ((g, f"Game {g:03d}") for g in range(1, GAMES + 1)))
+    conn.commit()
+    game_status.start_tracking(conn)
+    return conn
+
+
+def per_game(conn, ids, status, reason):
+    for gid in ids:
+        game_status.record_status(conn, gid, status, reason)
+        conn.execute("UPDATE games SET status = ?, down_reason = ?, updated_at = CURRENT_TIMESTAMP "
+                     "WHERE id = ?", (status, reason, gid))
+        conn.commit()
+
+
+def bulk(conn, ids, status, reason):
+    marks = ", ".join("?" * len(ids))
+    rows = conn.execute(f"SELECT id, status, down_since FROM games WHERE id IN ({marks})", ids).fetchall()
+    conn.execute(f"UPDATE games SET status = ?, down_reason = ?, updated_at = CURRENT_TIMESTAMP "
+                 f"WHERE id IN ({marks})", (status, reason, *ids))
+    game_status.apply_transitions(conn, [(gid, old, since, status, reason)
+                                         for gid, old, since in rows if old != status])
+    conn.commit()
+
+
+def _time(fn, ids):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn(ids, "Down", "power out")
+        fn(ids, "Up", None)
+    return (time.perf_counter() - start) * 1000 / (ROUNDS * 2)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _setup(os.path.join(tmp, "bench.db"))
+        for n in BANK_SIZES:
+            ids = list(range(1, n + 1))
+            one_ms = _time(lambda i, s, r: per_game(conn, i, s, r), ids)
+            bulk_ms = _time(lambda i, s, r: bulk(conn, i, s, r), ids)
+            print(f"{n:4d} games: per-game {one_ms:8.2f} ms   bulk {bulk_ms:7.2f} ms   "
+                  f"({one_ms / bulk_ms:.1f}x)")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
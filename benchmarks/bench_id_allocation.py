@@ -0,0 +1,80 @@
+# bench_id_allocation.py
+# Creates/sec for Issue Hub-style inserts under concurrency:
+#   per_row -> old next_id(): UPDATE + SELECT + commit for every id
+#   block   -> id_allocator.BlockIdAllocator (one UPDATE ... RETURNING per block)
+# Runs several worker *processes* against one SQLite file and checks that
+# every id is unique at the end.
+#
+# Usage (from the project root):  python benchmarks/bench_id_allocation.py
+
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from id_allocator import BlockIdAllocator  # noqa: E402
+
+# --- SETTINGS ---
+WORKERS = 4              # processes (like gunicorn workers)
+CREATES_PER_WORKER = 500
+BLOCK_SIZE = 20
+# --- END OF SETTINGS ---
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30)
+    return conn
+
+
+def _setup(path):
+    conn = _connect(path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("CREATE TABLE id_sequences (entity TEXT PRIMARY KEY, counter INTEGER NOT NULL);")
+    conn.execute("INSERT INTO id_sequences VALUES ('ih', 0);")
+    conn.execute("CREATE TABLE items (id TEXT PRIMARY KEY, title TEXT);")
+    conn.commit()
+    conn.close()
+
+
+def _old_next_id(conn):
+    cur = conn.cursor()
+    cur.execute("UPDATE id_sequences SET counter = counter + 1 WHERE entity = 'ih';")
+    cur.execute("SELECT counter FROM id_sequences WHERE entity = 'ih';")
+    counter = cur.fetchone()[0]
+    conn.commit()
+    return counter
+
+
+def _worker(args):
+    path, mode = args
+    alloc = BlockIdAllocator(block_size=BLOCK_SIZE)
+    conn = _connect(path)
+    for i in range(CREATES_PER_WORKER):
+        counter = _old_next_id(conn) if mode == "per_row" else alloc.next(conn, "ih")
+        conn.execute("INSERT INTO items (id, title) VALUES (?, ?);", (f"IH{counter:03d}", f"t{i}"))
+        conn.commit()
+    conn.close()
+
+
+def run(mode):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    _setup(path)
+    t0 = time.perf_counter()
+    with Pool(WORKERS) as pool:
+        pool.map(_worker, [(path, mode)] * WORKERS)
+    elapsed = time.perf_counter() - t0
+
+    conn = _connect(path)
+    total, distinct = conn.execute("SELECT COUNT(*), COUNT(DISTINCT id) FROM items;").fetchone()
+    conn.close()
+    assert total == distinct == WORKERS * CREATES_PER_WORKER, (total, distinct)
+    print(f"{mode:8s} {total} creates in {elapsed:6.2f}s -> {total / elapsed:8.0f} creates/s (ids unique)")
+
+
+if __name__ == "__main__":
+    print(f"{WORKERS} workers x {CREATES_PER_WORKER} creates, block size {BLOCK_SIZE}")
+    run("per_row")
+    run("block")
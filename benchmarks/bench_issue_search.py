@@ -0,0 +1,108 @@
+# bench_issue_search.py
+# GET /api/issues?q=... on a large SQLite file:
+#   like -> old filter: LOWER(col) LIKE LOWER('%q%') on three columns (full scan)
+#   fts  -> search_index.search_join: FTS5 match ranked by bm25, first page
+# Also times single-row writes with and without the sync triggers.
+# The vocabulary is tiny, so every word hits ~15% of rows - a worst case for
+# FTS: every hit is ranked before the first page comes back.
+#
+# Usage (from the project root):  python benchmarks/bench_issue_search.py
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import search_index  # noqa: E402
+
+# --- SETTINGS ---
+ISSUES = 200_000
+QUERIES = ("joystick", "coin mech", "flick", "ticket dispenser jam")
+PAGE = 50
+ROUNDS = 5
+# --- END OF SETTINGS ---
+
+_WORDS = ("skeeball lane jammed ticket dispenser empty coin mech sticking monitor flicker "
+          "joystick loose button stuck marquee light out card reader error speaker crackle "
+          "door lock broken glass cracked sensor dirty belt worn motor noisy").split()
+
+_ISSUES_DDL = """
+    CREATE TABLE issues (
+        id TEXT PRIMARY KEY, priority TEXT NOT NULL, date_logged TIMESTAMP, last_updated TIMESTAMP,
+        area TEXT, equipment_location TEXT, description TEXT NOT NULL, notes TEXT,
+        status TEXT NOT NULL, target_date DATE, assigned_to TEXT
+    )
+"""
+
+
+def _setup(path):
+    conn = sqlite3.connect(path)
+    conn.execute(_ISSUES_DDL)
+    conn.executemany(
+        "INSERT INTO issues (id, priority, date_logged, description, notes, equipment_location, status) "
+        "VALUES (?, 'Medium', ?, ?, ?, ?, 'Open')",
+        ((f"IS-{i:06d}", f"2025-{1 + i % 12:02d}-{1 + i % 28:02d} 10:00:00",
+          " ".join(random.sample(_WORDS, 5)), " ".join(random.sample(_WORDS, 8)),
+          f"Game {random.randint(1, 400)}") for i in range(ISSUES)),
+    )
+    conn.commit()
+    return conn
+
+
+def like(conn, q):
+    like = f"%{q}%"
+    return conn.execute(
+        "SELECT id FROM issues WHERE (LOWER(description) LIKE LOWER(?) OR LOWER(notes) LIKE LOWER(?) "
+        "OR LOWER(equipment_location) LIKE LOWER(?)) ORDER BY date_logged DESC, id DESC LIMIT ?",
+        (like, like, like, PAGE),
+    ).fetchall()
+
+
+def fts(conn, q):
+    join, params = search_index.search_join(conn, "issues", q)
+    return conn.execute(
+        f"SELECT id FROM issues {join} ORDER BY hits.score DESC, date_logged DESC, id DESC LIMIT ?",
+        (*params, PAGE),
+    ).fetchall()
+
+
+def _time(fn):
+    fn()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        out = fn()
+    return (time.perf_counter() - start) * 1000 / ROUNDS, out
+
+
+def _write_ms(conn, n=500):
+    start = time.perf_counter()
+    for i in range(n):
+        conn.execute("UPDATE issues SET notes = ? WHERE id = ?",
+                     (" ".join(random.sample(_WORDS, 8)), f"IS-{random.randrange(ISSUES):06d}"))
+        conn.commit()
+    return (time.perf_counter() - start) * 1000 / n
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"building {ISSUES} issues …")
+        conn = _setup(os.path.join(tmp, "bench.db"))
+        before = _write_ms(conn)
+        start = time.perf_counter()
+        search_index.ensure_search_index(conn, "issues")
+        print(f"FTS5 index built in {time.perf_counter() - start:.1f} s")
+        after = _write_ms(conn)
+        for q in QUERIES:
+            like_ms, like_rows = _time(lambda: like(conn, q))
+            fts_ms, fts_rows = _time(lambda: fts(conn, q))
+            print(f"q={q!r:<24} like {like_ms:8.2f} ms ({len(like_rows)})   "
+                  f"fts {fts_ms:8.2f} ms ({len(fts_rows)})")
+        print(f"notes UPDATE + commit: {before:.3f} ms without triggers, {after:.3f} ms with")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
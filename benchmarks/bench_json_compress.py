@@ -0,0 +1,119 @@
+# bench_json_compress.py
+# Serialization time + bytes on the wire for the two biggest JSON bodies:
+#   issuehub_list -> GET /api/issuehub/list as Postgres hands rows back
+#                    (datetime columns), old path str()-converting each date
+#   tpt_results   -> TPT individual rows (tpt_processor._individual_rows shape)
+# Encoders:
+#   flask_default -> Flask's DefaultJSONProvider (stdlib json, sort_keys)
+#   fast          -> json_provider.dumps_bytes, the encoder behind
+#                    FastJSONProvider / jsonify() (orjson if installed)
+# Wire sizes: identity / gzip / br (br only if the Brotli package is installed),
+# using http_compress's levels.
+#
+# Usage (from the project root):  python benchmarks/bench_json_compress.py
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+import http_compress  # noqa: E402
+import json_provider  # noqa: E402
+
+# --- SETTINGS ---
+ISSUES = 5_000
+TPT_ROWS = 20_000
+ROUNDS = 10
+# --- END OF SETTINGS ---
+
+_WORDS = ("skeeball lane jammed ticket dispenser empty coin mech sticking monitor flicker "
+          "joystick loose button stuck marquee light out card reader error").split()
+
+
+def _issues():
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(ISSUES):
+        created = now - timedelta(minutes=random.randint(0, 500_000))
+        items.append({
+            "id": f"IH{i:05d}", "category": random.choice(("gameroom", "facility")),
+            "title": " ".join(random.sample(_WORDS, 4)), "details": " ".join(random.sample(_WORDS, 10)),
+            "location": f"Game {random.randint(1, 300)}", "priority": random.choice(("low", "medium", "high")),
+            "status": random.choice(("open", "in_progress")), "resolution": None,
+            "reporter": "Front Desk", "assignee": random.choice((None, "Sam", "Alex")),
+            "target_date": (created + timedelta(days=7)).date(), "created_at": created,
+            "updated_at": created + timedelta(hours=2), "resolved_at": None, "deleted_at": None,
+        })
+    return items
+
+
+def _old_issue_shape(items):
+    # what issue_hub_bp._item_from_row did before: str() every date column
+    out = []
+    for it in items:
+        row = dict(it)
+        for k in ("created_at", "updated_at"):
+            row[k] = str(row[k])
+        for k in ("target_date", "resolved_at", "deleted_at"):
+            row[k] = str(row[k]) if row[k] else None
+        out.append(row)
+    return out
+
+
+def _tpt_rows():
+    rows = []
+    for i in range(TPT_ROWS):
+        plays = float(random.randint(10, 5000))
+        tickets = float(random.randint(0, 40_000))
+        rows.append({"Profile": random.choice(("Redemption", "Video", "N/A")),
+                     "GameName": f"Game {i:05d}", "TPTIndividual": round(tickets / plays, 2),
+                     "TotalTickets": tickets, "TotalPlays": plays})
+    return rows
+
+
+def _time(fn):
+    fn()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        out = fn()
+    return (time.perf_counter() - start) * 1000 / ROUNDS, out
+
+
+def _report(name, old_fn, new_fn):
+    old_ms, old_body = _time(old_fn)
+    new_ms, new_body = _time(new_fn)
+    print(f"{name}")
+    print(f"  flask_default {old_ms:9.2f} ms   fast {new_ms:9.2f} ms   ({old_ms / new_ms:.1f}x)")
+    sizes = [("identity", len(new_body), 0.0)]
+    encodings = ["gzip"] + (["br"] if http_compress.brotli is not None else [])
+    for enc in encodings:
+        ms, packed = _time(lambda: http_compress.compress_bytes(new_body, enc))
+        sizes.append((enc, len(packed), ms))
+    for enc, size, ms in sizes:
+        extra = f"  (+{ms:.2f} ms to compress)" if ms else ""
+        print(f"  {enc:<9} {size / 1024:10.1f} KiB{extra}")
+
+
+def main():
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    compact = {"separators": (",", ":")}  # what jsonify() uses outside debug
+    print(f"orjson: {'yes' if json_provider.orjson else 'no (stdlib fallback)'}, "
+          f"brotli: {'yes' if http_compress.brotli else 'no'}")
+
+    issues = _issues()
+    _report(f"issuehub_list ({ISSUES} items)",
+            lambda: default.dumps({"items": _old_issue_shape(issues)}, **compact).encode("utf-8"),
+            lambda: json_provider.dumps_bytes({"items": issues}))
+    tpt = _tpt_rows()
+    _report(f"tpt_results ({TPT_ROWS} rows)",
+            lambda: default.dumps({"individual_games": tpt}, **compact).encode("utf-8"),
+            lambda: json_provider.dumps_bytes({"individual_games": tpt}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# bench_pm_due.py
+# PM status reads once next_due is stored on games (pm_schedule.py):
+#   recompute   -> MAX(pm_date) per game on every request (the old route's
+#                  SQL alone, before any row shaping)
+#   status_rows -> /api/pms/last_by_game reading games.pm_next_due (full
+#                  item dicts; the route also caches this per day)
+#   due_within  -> /api/pms/due?within=N, a range scan on ix_games_pm_next_due
+#   sync_all    -> the startup / daily re-sync (nothing changed -> no writes)
+# Prints the due_within query plan so the index use is visible.
+#
+# Usage (from the project root):  python benchmarks/bench_pm_due.py
+
+import os
+import sys
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pm_schedule  # noqa: E402
+from games_db import ensure_games_table, ensure_pm_logs_table  # noqa: E402
+from table_versions import ensure_table_versions  # noqa: E402
+
+# --- SETTINGS ---
+GAMES = 5_000
+PM_LOGS = 500_000
+WITHIN_DAYS = 15
+ROUNDS = 5
+# --- END OF SETTINGS ---
+
+
+def _setup(path):
+    conn = sqlite3.connect(path)
+    ensure_games_table(conn)
+    ensure_pm_logs_table(conn)
+    ensure_table_versions(conn)
+    conn.executemany("INSERT INTO games (id, name, status) VALUES (?, ?, 'Up')",
+                     [(i, f"Game {i:05d}") for i in range(1, GAMES + 1)])
+    today = date.today()
+    conn.executemany(
+        "INSERT INTO pm_logs (game_id, pm_date) VALUES (?, ?)",
+        ((random.randint(1, int(GAMES * 0.95)),
+          (today - timedelta(days=random.randint(0, 400))).isoformat()) for _ in range(PM_LOGS)),
+    )
+    conn.commit()
+    pm_schedule.sync_all(conn)
+    conn.execute("ANALYZE;")
+    return conn
+
+
+def recompute(conn):
+    return conn.execute("""
+        SELECT g.id, g.name, (SELECT MAX(p.pm_date) FROM pm_logs p WHERE p.game_id = g.id)
+        FROM games g
+    """).fetchall()
+
+
+def _time(label, fn):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn()
+    ms = (time.perf_counter() - start) * 1000 / ROUNDS
+    size = f"({len(result)} games)" if isinstance(result, list) else f"({result} updated)"
+    print(f"{label:<12} {ms:10.2f} ms/request  {size}")
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"building {GAMES} games / {PM_LOGS} pm_logs …")
+        conn = _setup(os.path.join(tmp, "bench.db"))
+        _time("recompute", lambda: recompute(conn))
+        _time("status_rows", lambda: pm_schedule.status_rows(conn))
+        _time("due_within", lambda: pm_schedule.due_within(conn, WITHIN_DAYS))
+        _time("sync_all", lambda: pm_schedule.sync_all(conn))
+        cutoff = (date.today() + timedelta(days=WITHIN_DAYS)).isoformat()
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT id FROM games "
+                            "WHERE pm_next_due <= ? OR pm_next_due IS NULL", (cutoff,)).fetchall()
+        print("due_within plan:", "; ".join(r[-1] for r in plan))
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
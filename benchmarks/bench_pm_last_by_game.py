@@ -0,0 +1,131 @@
+# bench_pm_last_by_game.py
+# GET /api/pms/last_by_game on a large SQLite file:
+#   python_join  -> old route: all games + GROUP BY over pm_logs, joined and
+#                   classified in Python (strptime per row)
+#   single_query -> one statement (MAX per game via a seek on
+#                   ix_pm_logs_game_date, days-since + status in SQL); the
+#                   route now reads pm_schedule's stored next_due instead,
+#                   see bench_pm_due.py
+#   cached       -> single_query behind cache_utils.TTLCache (hit path)
+# Checks that both paths return the same items.
+#
+# Usage (from the project root):  python benchmarks/bench_pm_last_by_game.py
+
+import os
+import sys
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_utils import TTLCache  # noqa: E402
+from db_indexes import ensure_indexes  # noqa: E402
+
+# --- SETTINGS ---
+GAMES = 5_000
+PM_LOGS = 500_000
+ROUNDS = 5
+# --- END OF SETTINGS ---
+
+PM_DUE_DAYS = 90
+PM_SOON_DAYS = 75
+
+
+def _setup(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE games (id INTEGER PRIMARY KEY, name TEXT, status TEXT)")
+    conn.execute("""CREATE TABLE pm_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, game_id INTEGER,
+                    game_name TEXT NOT NULL DEFAULT '', pm_date TEXT NOT NULL, notes TEXT DEFAULT '',
+                    completed_by TEXT DEFAULT '', created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)""")
+    conn.executemany("INSERT INTO games (id, name, status) VALUES (?, ?, 'Up')",
+                     [(i, f"Game {i:05d}") for i in range(1, GAMES + 1)])
+    today = date.today()
+    conn.executemany(
+        "INSERT INTO pm_logs (game_id, pm_date, notes) VALUES (?, ?, '')",
+        ((random.randint(1, int(GAMES * 0.95)),
+          (today - timedelta(days=random.randint(0, 1000))).isoformat()) for _ in range(PM_LOGS)),
+    )
+    conn.commit()
+    ensure_indexes(conn, "games")
+    ensure_indexes(conn, "pm_logs")
+    conn.execute("ANALYZE;")
+    return conn
+
+
+def python_join(conn):
+    cur = conn.cursor()
+    cur.execute("SELECT id, name FROM games ORDER BY name;")
+    games = [dict(zip([d[0] for d in cur.description], r)) for r in cur.fetchall()]
+    cur.execute("""
+        SELECT CAST(game_id AS INTEGER) AS gid, MAX(pm_date) AS last_pm
+        FROM pm_logs GROUP BY CAST(game_id AS INTEGER)
+    """)
+    last_map = {gid: last for gid, last in cur.fetchall()}
+    today = date.today()
+    items = []
+    for g in games:
+        raw = last_map.get(g["id"])
+        last_dt = datetime.strptime(raw[:10], "%Y-%m-%d").date() if raw else None
+        if last_dt is None:
+            status, days = "due", None
+        else:
+            days = (today - last_dt).days
+            status = "due" if days >= PM_DUE_DAYS else "soon" if days >= PM_SOON_DAYS else "ok"
+        items.append((g["id"], g["name"], last_dt.isoformat() if last_dt else None, days, status))
+    order = {"due": 0, "soon": 1, "ok": 2}
+    items.sort(key=lambda x: (order[x[4]], x[1].lower()))
+    return items
+
+
+def single_query(conn):
+    # what the route ran before pm_schedule stored next_due on games
+    cur = conn.execute(f"""
+        WITH last AS (
+            SELECT g.id AS game_id, g.name AS game_name,
+                   (SELECT MAX(p.pm_date) FROM pm_logs p
+                     WHERE p.game_id = g.id) AS last_pm
+            FROM games g
+        ), aged AS (
+            SELECT game_id, game_name, last_pm,
+                   CAST(julianday(?) - julianday(substr(last_pm, 1, 10)) AS INTEGER) AS days_since
+            FROM last
+        )
+        SELECT game_id, game_name, last_pm, days_since,
+               CASE WHEN days_since IS NULL THEN 'due'
+                    WHEN days_since >= {PM_DUE_DAYS} THEN 'due'
+                    WHEN days_since >= {PM_SOON_DAYS} THEN 'soon'
+                    ELSE 'ok' END AS status
+        FROM aged
+        ORDER BY CASE WHEN days_since IS NULL OR days_since >= {PM_DUE_DAYS} THEN 0
+                      WHEN days_since >= {PM_SOON_DAYS} THEN 1 ELSE 2 END,
+                 LOWER(COALESCE(game_name, ''))
+    """, (date.today().isoformat(),))
+    return [tuple(r) for r in cur.fetchall()]
+
+
+def _time(label, fn):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn()
+    ms = (time.perf_counter() - start) * 1000 / ROUNDS
+    print(f"{label:<13} {ms:10.2f} ms/request  ({len(result)} games)")
+    return result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"building {GAMES} games / {PM_LOGS} pm_logs …")
+        conn = _setup(os.path.join(tmp, "bench.db"))
+        old = _time("python_join", lambda: python_join(conn))
+        new = _time("single_query", lambda: single_query(conn))
+        cache = TTLCache(300)
+        _time("cached", lambda: cache.get_or_set(date.today().isoformat(), lambda: single_query(conn)))
+        assert old == new, "results differ"
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# bench_weather_cache.py
+# Exercises weather.get_weather against a local OpenWeather stub:
+#   miss      -> first call goes upstream
+#   hit       -> served from memory
+#   coalesce  -> N concurrent misses share ONE upstream call
+#   stale     -> after WEATHER_TTL the old reading is served instantly
+#                while one background refresh runs
+#   failure   -> upstream 500: stale reading is kept; a cold miss errors out
+# Prints latency per path and the number of upstream calls the stub saw.
+#
+# Usage (from the project root):  python benchmarks/bench_weather_cache.py
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- SETTINGS ---
+STUB_PORT = 8765
+UPSTREAM_DELAY = 0.3     # seconds the stub takes per call
+TTL = 0.5                # WEATHER_TTL for the run
+CONCURRENT_MISSES = 20
+# --- END OF SETTINGS ---
+
+os.environ["OPENWEATHER_URL"] = f"http://127.0.0.1:{STUB_PORT}/data/2.5/weather"
+os.environ["WEATHER_TTL"] = str(TTL)
+os.environ["WEATHER_MAX_STALE"] = "60"
+os.environ["WEATHER_TIMEOUT"] = "2"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import requests  # noqa: E402
+import weather  # noqa: E402
+
+STUB = {"calls": 0, "fail": False, "temp": 80.4}
+
+
+class _Stub(BaseHTTPRequestHandler):
+    def do_GET(self):
+        STUB["calls"] += 1
+        time.sleep(UPSTREAM_DELAY)
+        if STUB["fail"]:
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = json.dumps({"weather": [{"icon": "01d", "description": "clear sky"}],
+                           "main": {"temp": STUB["temp"]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _call(lat=26.0636, lon=-80.2073):
+    start = time.perf_counter()
+    payload, state = weather.get_weather(lat, lon, "stub-key")
+    return payload, state, (time.perf_counter() - start) * 1000
+
+
+def _report(label, payload, state, ms):
+    print(f"{label:<10} {state:<6} {ms:8.1f} ms  {payload}  (upstream calls so far: {STUB['calls']})")
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", STUB_PORT), _Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        _report("miss", *_call())
+        _report("hit", *_call())
+
+        # concurrent cold misses for another location -> one upstream call
+        before = STUB["calls"]
+        with ThreadPoolExecutor(CONCURRENT_MISSES) as pool:
+            results = list(pool.map(lambda _: _call(1.0, 2.0), range(CONCURRENT_MISSES)))
+        print(f"coalesce   {CONCURRENT_MISSES} callers -> {STUB['calls'] - before} upstream call(s), "
+              f"slowest {max(r[2] for r in results):.1f} ms")
+
+        time.sleep(TTL + 0.1)
+        STUB["temp"] = 90.0
+        _report("stale", *_call())
+        time.sleep(UPSTREAM_DELAY + 0.2)
+        _report("refreshed", *_call())
+
+        time.sleep(TTL + 0.1)
+        STUB["fail"] = True
+        _report("fail/stale", *_call())
+        time.sleep(UPSTREAM_DELAY + 0.2)
+        _report("kept", *_call())
+        try:
+            _call(5.0, 5.0)
+            print("fail/miss  unexpected success")
+        except requests.RequestException as e:
+            print(f"fail/miss  error as expected: {e.__class__.__name__}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# =========================================================================
+# ARCADE MANAGER - IN-PROCESS CACHES
+# Small thread-safe TTL cache + tag-based invalidation for read endpoints.
+#
+# What this file does:
+# - TTLCache(ttl, maxsize=None, tags=())  -> get / set / get_or_set / invalidate
+#   (maxsize turns it into an LRU: least recently used keys are dropped first)
+# - invalidate(*tags) -> clears every cache registered under those tags;
+#   call it after a write commits (tags are table names: "issues", "games", …)
+# - SWRCache(ttl, max_stale) -> stale-while-revalidate + single-flight loads
+#   for slow upstream APIs (weather)
+#
+# Caches are per process; other gunicorn workers see a write once their
+# own entry expires, so keep TTLs short for anything shown on dashboards.
+# =========================================================================
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+_TAGGED = {}  # tag -> [TTLCache, ...]
+_TAG_LOCK = threading.Lock()
+
+
+class TTLCache:
+    def __init__(self, ttl, maxsize=None, tags=()):
+        self.ttl = float(ttl)
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        for tag in tags:
+            register(self, tag)
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key, _MISSING)
+            if hit is _MISSING:
+                return default
+            expires_at, value = hit
+            if expires_at <= now:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            if self.maxsize:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def get_or_set(self, key, fn):
+        """Cached value for key, or fn() stored under it. TTL <= 0 disables caching."""
+        if self.ttl <= 0:
+            return fn()
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.set(key, fn())
+        return value
+
+    def invalidate(self, key=_MISSING):
+        with self._lock:
+            if key is _MISSING:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+def register(cache, tag):
+    with _TAG_LOCK:
+        _TAGGED.setdefault(tag, []).append(cache)
+
+
+def invalidate(*tags):
+    """Clear every cache registered under any of `tags`."""
+    with _TAG_LOCK:
+        caches = [c for t in tags for c in _TAGGED.get(t, [])]
+    for c in caches:
+        c.invalidate()
+
+
+class SWRCache:
+    """
+    Stale-while-revalidate cache for slow upstream calls.
+
+    get(key, loader) returns (value, state) where state is:
+      "hit"   -> fresh value (age < ttl)
+      "stale" -> older than ttl but younger than ttl + max_stale; served
+                 right away while one background thread reloads it
+      "miss"  -> nothing usable; loader() ran (or we waited for the caller
+                 that was already running it - concurrent misses share one call)
+    A failed background reload keeps the stale value; a failed miss raises.
+    """
+
+    def __init__(self, ttl, max_stale=0.0, wait_timeout=None):
+        self.ttl = float(ttl)
+        self.max_stale = float(max_stale)
+        self.wait_timeout = wait_timeout  # how long a waiting caller blocks on another's load
+        self._data = {}       # key -> (loaded_at, value)
+        self._inflight = {}   # key -> {"done": Event, "value", "error"}
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            age = now - hit[0] if hit else None
+            if hit and age < self.ttl:
+                return hit[1], "hit"
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = {"done": threading.Event(), "value": None, "error": None}
+            if hit and age < self.ttl + self.max_stale:
+                if leader:
+                    threading.Thread(target=self._load, args=(key, loader, flight),
+                                     name=f"swr:{key}", daemon=True).start()
+                return hit[1], "stale"
+
+        if leader:
+            self._load(key, loader, flight)
+        elif not flight["done"].wait(self.wait_timeout):
+            raise TimeoutError(f"timed out waiting for {key!r}")
+        if flight["error"] is not None:
+            raise flight["error"]
+        return flight["value"], "miss"
+
+    def _load(self, key, loader, flight):
+        try:
+            value = loader()
+            with self._lock:
+                self._data[key] = (time.monotonic(), value)
+            flight["value"] = value
+        except Exception as e:
+            flight["error"] = e
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight["done"].set()
+
+    def invalidate(self, key=_MISSING):
+        with self._lock:
+            if key is _MISSING:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
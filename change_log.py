@@ -0,0 +1,286 @@
+# =========================================================================
+# ARCADE MANAGER - CHANGE LOG + LIVE FEED
+# Append-only log of writes, and the in-process fan-out behind the SSE feed.
+#
+# What this file does:
+# - ensure_change_log(db)                     -> creates change_log (+ index)
+# - log_change(db, entity, ids, op)           -> appends rows; runs in the
+#                                                caller's transaction so the
+#                                                entry commits with the write
+#                                                (Postgres: serialized, so seqs
+#                                                commit in seq order)
+# - changes_since(db, seq, entities, limit)   -> entries after `seq`, oldest first
+# - latest_seq(db, entity=None) / oldest_seq(db)
+# - delta_since(db, entity, seq)              -> ids changed after seq (delta
+#                                                sync: GET ...?since=<cursor>)
+# - prune_change_log(db, keep_days)           -> drop entries older than that
+# - FEED: one poller per process reads new entries (one indexed query per
+#   CHANGE_FEED_POLL seconds, only while a stream is open) and wakes every
+#   subscribed stream, so N idle tabs cost one small query per second per
+#   worker instead of N full list fetches per refresh.
+#
+# Entities are table names ("issues", "issuehub_issues", "games", "pm_logs");
+# ops are "insert" | "update" | "delete" | "reset" (reset = id "*", the
+# whole table changed: reload it).
+#
+# Connected files:
+# - app.py (GET /api/changes, /api/changes/stream, poller + prune jobs)
+# - games_api.py, issue_hub_bp.py (?since= delta mode on the list endpoints)
+# - issues_api.py, issue_hub_bp.py, games_api.py (writers)
+# =========================================================================
+
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+CHANGE_FEED_POLL = float(os.environ.get("CHANGE_FEED_POLL", "1"))
+CHANGE_FEED_BUFFER = int(os.environ.get("CHANGE_FEED_BUFFER", "2000"))
+CHANGE_FEED_OVERLAP = 50
+CHANGE_LOG_KEEP_DAYS = int(os.environ.get("CHANGE_LOG_KEEP_DAYS", "30"))
+CHANGES_PAGE = 500
+CHANGE_LOG_LOCK = 0x63686C67  # pg_advisory_xact_lock key ("chlg") for change_log writers
+
+OPS = ("insert", "update", "delete", "reset")
+
+
+def _is_postgres(db):
+    return hasattr(db, "dsn")
+
+
+def ensure_change_log(db):
+    cur = db.cursor()
+    try:
+        if _is_postgres(db):
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS change_log (
+                    seq        BIGSERIAL PRIMARY KEY,
+                    entity     TEXT NOT NULL,
+                    entity_id  TEXT NOT NULL,
+                    op         TEXT NOT NULL,
+                    changed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+        else:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS change_log (
+                    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+                    entity     TEXT NOT NULL,
+                    entity_id  TEXT NOT NULL,
+                    op         TEXT NOT NULL,
+                    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+        # per-entity delta reads (GET ...?since=)
+        cur.execute("CREATE INDEX IF NOT EXISTS ix_change_log_entity_seq ON change_log (entity, seq);")
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Error creating change_log: {e}")
+    finally:
+        cur.close()
+
+
+def log_change(db, entity, ids, op):
+    """
+    Append one entry per id (ids: a single id or an iterable of ids).
+    Does not commit: call it right before the write's own commit.
+
+    On Postgres a BIGSERIAL seq taken by one transaction can commit after a
+    higher seq from another, and a ?since= cursor handed out in between would
+    skip it for good. A transaction-level advisory lock taken before the
+    insert makes writers take seqs one transaction at a time, so seqs become
+    visible in order; it is held until the caller commits or rolls back.
+    Keep it the last write before bump_table_version() + commit: taking row
+    locks after it could deadlock with a writer still waiting for it.
+    """
+    if op not in OPS:
+        raise ValueError(f"unknown change op {op!r}")
+    if isinstance(ids, (str, int)):
+        ids = [ids]
+    rows = [(entity, str(i), op) for i in ids]
+    if not rows:
+        return
+    ph = "%s" if _is_postgres(db) else "?"
+    cur = db.cursor()
+    try:
+        if _is_postgres(db):
+            cur.execute("SELECT pg_advisory_xact_lock(%s);", (CHANGE_LOG_LOCK,))
+        cur.executemany(
+            f"INSERT INTO change_log (entity, entity_id, op) VALUES ({ph}, {ph}, {ph});", rows
+        )
+    finally:
+        cur.close()
+
+
+def _row(r):
+    seq, entity, entity_id, op, changed_at = r
+    return {"seq": int(seq), "entity": entity, "id": entity_id, "op": op, "at": changed_at}
+
+
+def changes_since(db, seq, entities=None, limit=CHANGES_PAGE):
+    """Entries with seq > `seq` (optionally only these entities), oldest first."""
+    ph = "%s" if _is_postgres(db) else "?"
+    sql = f"SELECT seq, entity, entity_id, op, changed_at FROM change_log WHERE seq > {ph}"
+    params = [int(seq)]
+    if entities:
+        sql += f" AND entity IN ({', '.join([ph] * len(entities))})"
+        params.extend(entities)
+    sql += f" ORDER BY seq LIMIT {int(limit)}"
+    cur = db.cursor()
+    try:
+        cur.execute(sql + ";", tuple(params))
+        return [_row(r) for r in cur.fetchall()]
+    finally:
+        cur.close()
+
+
+def latest_seq(db, entity=None):
+    """Newest seq overall, or for one entity (index: ix_change_log_entity_seq)."""
+    cur = db.cursor()
+    try:
+        if entity is None:
+            cur.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log;")
+        else:
+            ph = "%s" if _is_postgres(db) else "?"
+            cur.execute(f"SELECT COALESCE(MAX(seq), 0) FROM change_log WHERE entity = {ph};", (entity,))
+        return int(cur.fetchone()[0])
+    finally:
+        cur.close()
+
+
+def oldest_seq(db):
+    """Smallest seq still in the log (0 when empty); older cursors must resync."""
+    cur = db.cursor()
+    try:
+        cur.execute("SELECT COALESCE(MIN(seq), 0) FROM change_log;")
+        return int(cur.fetchone()[0])
+    finally:
+        cur.close()
+
+
+def delta_since(db, entity, seq, limit=CHANGES_PAGE):
+    """
+    Ids of `entity` rows touched after `seq`, for clients keeping a replica
+    (GET ...?since=). Delete entries are the tombstones of hard deletes.
+    Returns {"ids", "seq", "more", "reset"}:
+      seq   -> where the next call continues from
+      more  -> more than `limit` entries were waiting; call again right away
+      reset -> the log no longer reaches back to `seq` (pruned) or the table
+               was cleared wholesale: reload in full
+    """
+    if seq < oldest_seq(db) - 1:
+        return {"ids": [], "seq": latest_seq(db, entity), "more": False, "reset": True}
+    entries = changes_since(db, seq, [entity], limit=limit + 1)
+    more = len(entries) > limit
+    entries = entries[:limit]
+    if any(c["op"] == "reset" for c in entries):
+        return {"ids": [], "seq": latest_seq(db, entity), "more": False, "reset": True}
+    ids = list(dict.fromkeys(c["id"] for c in entries))  # first-touch order, no repeats
+    return {"ids": ids, "seq": entries[-1]["seq"] if entries else seq, "more": more, "reset": False}
+
+
+def prune_change_log(db, keep_days=CHANGE_LOG_KEEP_DAYS):
+    ph = "%s" if _is_postgres(db) else "?"
+    cutoff = datetime.utcnow() - timedelta(days=keep_days)
+    cur = db.cursor()
+    try:
+        # the newest entry always stays, so oldest_seq() still tells how far back the log reaches
+        cur.execute(
+            f"DELETE FROM change_log WHERE changed_at < {ph} "
+            f"AND seq < (SELECT MAX(seq) FROM change_log);",
+            (cutoff,),
+        )
+        removed = cur.rowcount or 0
+        db.commit()
+        return removed
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+class ChangeFeed:
+    """
+    Recent change_log entries kept in memory + a condition streams wait on.
+    poll(db) is the only thing that reads the table, and only while at least
+    one stream is subscribed.
+
+    Streams track a buffer position, not a seq. log_change makes seqs commit
+    in order, but each poll still re-reads the last CHANGE_FEED_OVERLAP seqs
+    and appends late arrivals it hasn't seen (cheap, and safe against any
+    writer that bypasses log_change).
+    """
+
+    def __init__(self, size=CHANGE_FEED_BUFFER):
+        self._size = size
+        self._cond = threading.Condition()
+        self._reset()
+        self.subscribers = 0
+
+    def _reset(self):
+        self._buf = deque()     # (pos, change)
+        self._seen = set()      # seqs in _buf
+        self._next_pos = 0
+        self._floor = 0         # seqs <= floor predate the feed (streams replay those from the DB)
+        self.last_seq = None    # None = not primed (nobody listening)
+
+    def subscribe(self, db):
+        """Register a stream; returns the buffer position it reads from."""
+        with self._cond:
+            if self.last_seq is None:
+                self.last_seq = self._floor = latest_seq(db)  # the feed carries what happens from now on
+            self.subscribers += 1
+            return self._next_pos
+
+    def unsubscribe(self):
+        with self._cond:
+            self.subscribers = max(0, self.subscribers - 1)
+
+    def idle(self):
+        """True (and the buffer dropped) when no stream is open: skip poll() entirely."""
+        with self._cond:
+            if self.subscribers:
+                return False
+            if self.last_seq is not None:
+                self._reset()
+            return True
+
+    def poll(self, db):
+        with self._cond:
+            if self.last_seq is None:
+                return 0
+            start = max(0, self.last_seq - CHANGE_FEED_OVERLAP)
+        new = changes_since(db, start, limit=CHANGES_PAGE + CHANGE_FEED_OVERLAP)
+        with self._cond:
+            if self.last_seq is None:  # everybody left meanwhile
+                return 0
+            fresh = [c for c in new if c["seq"] > self._floor and c["seq"] not in self._seen]
+            for c in fresh:
+                self._buf.append((self._next_pos, c))
+                self._seen.add(c["seq"])
+                self._next_pos += 1
+                self.last_seq = max(self.last_seq, c["seq"])
+            while len(self._buf) > self._size:
+                self._seen.discard(self._buf.popleft()[1]["seq"])
+            if fresh:
+                self._cond.notify_all()
+            return len(fresh)
+
+    def wait(self, pos, timeout):
+        """
+        Entries from buffer position `pos` on, blocking up to `timeout` for some.
+        Returns (entries, next_pos, gap); gap=True when entries at `pos` were
+        already evicted (the stream fell behind and should tell its client to reload).
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._next_pos > pos, timeout=timeout)
+            if self._next_pos <= pos:
+                return [], pos, False
+            first = self._buf[0][0]
+            gap = pos < first
+            return [c for p, c in self._buf if p >= pos], self._next_pos, gap
+
+
+FEED = ChangeFeed()
@@ -0,0 +1,218 @@
+# =========================================================================
+# ARCADE MANAGER - SECONDARY INDEXES
+# Index definitions for the hot read paths + an EXPLAIN helper to check them.
+#
+# What this file does:
+# - INDEXES: per-table list of (name, columns/expressions, partial WHERE)
+# - ensure_indexes(db, table) -> CREATE INDEX IF NOT EXISTS for that table
+# - hot_queries()             -> HOT_QUERIES + the Issue Hub list/sweep queries
+#                                built with issue_hub_bp's WHERE helpers
+# - explain_hot_queries(db)   -> runs EXPLAIN on each hot query and reports
+#                                whether the planner picked an index or fell
+#                                back to a full scan of the target table
+#
+# Connected files:
+# - app.py          (issues indexes during init_db, debug route in debug mode)
+# - tests/test_db_indexes.py (fails when a hot query loses its index)
+# - games_db.py     (games, pm_logs, game_status_history, game_outages indexes)
+# - issue_hub_bp.py (issuehub_issues indexes)
+# =========================================================================
+
+def _is_postgres(db):
+    return hasattr(db, "dsn")
+
+
+# (index name, column list / expressions, partial WHERE or None)
+# Expressions must be written exactly like the queries write them,
+# otherwise SQLite will not match the expression index.
+INDEXES = {
+    "issuehub_issues": [
+        # /api/issuehub/list (status=all|<status>) + duplicate scan on create
+        ("ix_issuehub_live_cat_status_created",
+         "category, status, created_at, id", "deleted_at IS NULL"),
+        # /api/issuehub/list without a category filter
+        ("ix_issuehub_live_status_created",
+         "status, created_at, id", "deleted_at IS NULL"),
+        # /api/issuehub/list?status=trash
+        ("ix_issuehub_trash_cat_created",
+         "category, created_at, id", "deleted_at IS NOT NULL"),
+        # background archive sweep + read-time archive rule
+        ("ix_issuehub_live_status_resolved",
+         "status, resolved_at", "deleted_at IS NULL"),
+        # duplicate check on create: exact location key, then title grams
+        ("ix_issuehub_live_cat_location_key",
+         "category, location_key, status", "deleted_at IS NULL"),
+        # /api/issuehub/by_game (also serves the trash view, so not partial)
+        ("ix_issuehub_location_key",
+         "LOWER(TRIM(COALESCE(location,''))), category, status", None),
+    ],
+    "issuehub_title_grams": [
+        # re-indexing / deleting one item's grams (PK already covers gram lookups)
+        ("ix_issuehub_title_grams_issue", "issue_id", None),
+    ],
+    "issues": [
+        # dashboard counters: one covering scan over the not-closed issues
+        ("ix_issues_live_status_updated_target", "status, last_updated, target_date",
+         "status NOT IN ('resolved','archived','trash')"),
+        # /api/issues?status=... ORDER BY date_logged DESC
+        ("ix_issues_lower_status_logged", "LOWER(status), date_logged", None),
+        ("ix_issues_date_logged", "date_logged", None),
+    ],
+    "games": [
+        # dashboard down games
+        ("ix_games_lower_status", "LOWER(status)", None),
+        # /api/pms/last_by_game ORDER BY name
+        ("ix_games_name", "name", None),
+        # /api/pms/due?within=N: range scan on the stored next due date
+        ("ix_games_pm_next_due", "pm_next_due", None),
+    ],
+    "pm_logs": [
+        # /api/pms/last_by_game: MAX(pm_date) per game as an index seek;
+        # /api/pms join on game_id
+        ("ix_pm_logs_game_date", "game_id, pm_date DESC", None),
+        # /api/pms ORDER BY pm_date DESC, id DESC
+        ("ix_pm_logs_date_id", "pm_date, id", None),
+    ],
+    "game_status_history": [
+        # GET /api/games/<id>/history ORDER BY changed_at DESC
+        ("ix_game_status_history_game_changed", "game_id, changed_at, id", None),
+    ],
+    "game_outages": [
+        # GET /api/games/downtime: per-game range over outages (covering)
+        ("ix_game_outages_game_down", "game_id, down_ts, up_ts", None),
+    ],
+}
+
+
+def ensure_indexes(db, table):
+    """
+    Create every index listed for `table` (no-op if it already exists).
+    Partial + expression indexes work on SQLite (3.9+) and Postgres.
+    A failing index is reported and skipped so startup never breaks.
+    """
+    for name, columns, where in INDEXES.get(table, []):
+        ddl = f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+        if where:
+            ddl += f" WHERE {where}"
+        cur = db.cursor()
+        try:
+            cur.execute(ddl + ";")
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Warning: index {name} skipped: {e}")
+        finally:
+            cur.close()
+
+
+# --- EXPLAIN helpers --------------------------------------------------------
+# Hot queries as the routes run them ('?' placeholders; swapped for PG):
+# (name, target, sql, params). target is the table (or alias) the index has
+# to serve; a full SCAN of it means the index is missing or not matched.
+# The Issue Hub list views are added by hot_queries() from the route's own
+# helpers; tests/test_db_indexes.py also EXPLAINs the SQL the routes really run.
+HOT_QUERIES = [
+    ("issuehub_by_game", "issuehub_issues",
+     "SELECT id FROM issuehub_issues WHERE category = ? "
+     "AND LOWER(TRIM(COALESCE(location,''))) = ? AND deleted_at IS NULL "
+     "AND status IN ('open','in_progress') ORDER BY created_at DESC",
+     ("gameroom", "skeeball")),
+    ("issuehub_dupe_candidates", "issuehub_issues",
+     "SELECT id FROM issuehub_issues WHERE deleted_at IS NULL "
+     "AND status IN ('open','in_progress') AND ((category = ? AND location_key = ?)) "
+     "AND (title_key IN (?) OR id IN (SELECT issue_id FROM issuehub_title_grams "
+     "WHERE gram IN (?, ?)))",
+     ("gameroom", "skeeball3", "lanejammed", "lan", "jam")),
+    ("dashboard_metrics", "issues",
+     "SELECT SUM(CASE WHEN target_date < ? THEN 1 ELSE 0 END) FROM issues "
+     "WHERE status NOT IN ('resolved','archived','trash')",
+     ("2000-01-01",)),
+    ("dashboard_down_games", "games",
+     "SELECT COUNT(*) FROM games WHERE lower(status)='down'", ()),
+    ("pm_schedule_sync", "p",
+     "SELECT g.id, (SELECT MAX(p.pm_date) FROM pm_logs p "
+     "WHERE p.game_id = g.id) FROM games g", ()),
+    ("pm_due_within", "games",
+     "SELECT id FROM games WHERE pm_next_due <= ? OR pm_next_due IS NULL", ("2000-01-01",)),
+    ("games_downtime_report", "o",
+     "SELECT g.id, SUM(o.down_ts) FROM games g LEFT JOIN game_outages o ON o.game_id = g.id "
+     "AND o.down_ts < ? AND (o.up_ts IS NULL OR o.up_ts > ?) GROUP BY g.id",
+     (2000000000, 0)),
+    ("change_log_since", "change_log",
+     "SELECT seq FROM change_log WHERE seq > ? AND entity IN (?) ORDER BY seq", (0, "games")),
+]
+
+
+def hot_queries():
+    """
+    HOT_QUERIES plus the Issue Hub list views and archive sweep, built with
+    the route's own WHERE helpers so the archive rule is checked as it runs.
+    """
+    # imported here: issue_hub_bp imports this module
+    from issue_hub_bp import _archive_due_sql, _archive_threshold, _status_where
+
+    threshold = _archive_threshold()
+    out = []
+    for status in ("all", "open", "resolved", "archived", "trash"):
+        where, params = _status_where(status, "?", threshold)
+        out.append((f"issuehub_list_{status}", "issuehub_issues",
+                    f"SELECT id FROM issuehub_issues WHERE {' AND '.join(where)} AND category = ? "
+                    f"ORDER BY created_at DESC, id DESC",
+                    (*params, "gameroom")))
+    out.append(("issuehub_archive_sweep", "issuehub_issues",
+                f"SELECT id FROM issuehub_issues WHERE deleted_at IS NULL AND {_archive_due_sql('?')}",
+                (threshold, threshold)))
+    return out + HOT_QUERIES
+
+
+def _plan_uses_index(lines):
+    text = " ".join(lines).lower()
+    # SQLite: "SEARCH ... USING INDEX ix_..." / "USING COVERING INDEX"
+    # Postgres: "Index Scan" / "Index Only Scan" / "Bitmap Index Scan"
+    return ("using index" in text or "using covering index" in text
+            or "index scan" in text or "index only scan" in text)
+
+
+def _plan_full_scan(lines, target):
+    # SQLite: "SCAN issues" (table walk) and "SCAN issues USING INDEX ..." (walks
+    # every index entry, then the table) are full scans; "SCAN issues USING
+    # COVERING INDEX ..." is the intended aggregate over a partial index.
+    # Postgres: "Seq Scan on issues" / "Seq Scan on games g"
+    for line in lines:
+        text = line.strip()
+        if ((text == f"SCAN {target}" or text.startswith(f"SCAN {target} "))
+                and "USING COVERING INDEX" not in text):
+            return True
+        if text.startswith("Seq Scan on ") and target in text[len("Seq Scan on "):].split()[:2]:
+            return True
+    return False
+
+
+def explain_hot_queries(db):
+    """
+    Run EXPLAIN on each hot_queries() entry.
+    Returns [{name, target, uses_index, full_scan, plan:[...]}, ...].
+    On Postgres seq scans are disabled for the check, so tiny tables still
+    show whether an index is *usable* for the query.
+    """
+    pg = _is_postgres(db)
+    results = []
+    for name, target, query, params in hot_queries():
+        cur = db.cursor()
+        try:
+            if pg:
+                cur.execute("SET LOCAL enable_seqscan = off;")
+                cur.execute("EXPLAIN " + query.replace("?", "%s"), params)
+                lines = [r[0] for r in cur.fetchall()]
+            else:
+                cur.execute("EXPLAIN QUERY PLAN " + query, params)
+                lines = [r[-1] for r in cur.fetchall()]
+            results.append({"name": name, "target": target, "uses_index": _plan_uses_index(lines),
+                            "full_scan": _plan_full_scan(lines, target), "plan": lines})
+        except Exception as e:
+            results.append({"name": name, "target": target, "uses_index": False, "full_scan": True,
+                            "plan": [], "error": str(e)})
+        finally:
+            cur.close()
+            db.rollback()  # drop SET LOCAL / aborted txn state
+    return results
@@ -0,0 +1,252 @@
+# =========================================================================
+# ARCADE MANAGER - GAME STATUS HISTORY + DOWNTIME STATS
+# Up/Down transitions, outage periods and running per-game aggregates.
+#
+# What this file does:
+# - apply_transitions(db, changes)   -> for each real status change: a
+#     game_status_history row, an outage opened (-> Down) or closed (-> Up),
+#     and the running totals on games updated in place:
+#       outage_count, downtime_seconds (closed outages), down_since,
+#       status_tracked_since. Batched (executemany); caller commits.
+# - record_status(db, game_id, status, reason) -> apply_transitions for one
+#     game if its status actually changes (reads the row first)
+# - start_tracking(db)       -> startup: games without stats start now (a
+#                               game that is already Down gets an open outage)
+# - game_stats(db)           -> all-time MTBF / MTTR / downtime per game,
+#                               straight from the running totals
+# - downtime_report(db, start, end) -> downtime, outages, uptime %, MTBF and
+#                               MTTR per game for any window, one query over
+#                               game_outages (ix_game_outages_game_down)
+# - status_history(db, game_id, limit)
+#
+# Definitions (all in seconds, converted to hours in the API):
+#   MTTR = downtime of closed outages / closed outages
+#   MTBF = (observed time - downtime) / outages
+#   observed time starts at status_tracked_since (first tracked moment).
+#
+# Connected files:
+# - games_db.py (tables + columns), games_api.py (writers + routes),
+#   db_indexes.py
+# =========================================================================
+
+import time
+from datetime import datetime, timezone
+
+DOWN = "Down"
+UP = "Up"
+HISTORY_LIMIT = 200
+
+
+def _is_postgres(db):
+    return hasattr(db, "dsn")
+
+
+def _now():
+    return int(time.time())
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts is not None else None
+
+
+def _hours(seconds):
+    return round(seconds / 3600, 2) if seconds is not None else None
+
+
+# --- writes -----------------------------------------------------------------
+def apply_transitions(db, changes, now=None):
+    """
+    changes: [(game_id, old_status, down_since, new_status, reason)], one per
+    game, real changes only (old_status None = a new game). Runs in the
+    caller's transaction.
+    """
+    if not changes:
+        return 0
+    now = _now() if now is None else now
+    changed_at = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None)
+    ph = "%s" if _is_postgres(db) else "?"
+
+    history = [(gid, old, new, reason, changed_at) for gid, old, _, new, reason in changes]
+    new_games = [(now, gid) for gid, old, _, _, _ in changes if old is None]
+    downs = [(gid, reason) for gid, old, _, new, reason in changes if new == DOWN and old != DOWN]
+    ups = [(gid, since) for gid, old, since, new, _ in changes if old == DOWN and new != DOWN]
+
+    cur = db.cursor()
+    try:
+        cur.executemany(
+            f"INSERT INTO game_status_history (game_id, from_status, to_status, reason, changed_at) "
+            f"VALUES ({ph}, {ph}, {ph}, {ph}, {ph});",
+            history,
+        )
+        if new_games:
+            cur.executemany(
+                f"UPDATE games SET status_tracked_since = {ph} "
+                f"WHERE id = {ph} AND status_tracked_since IS NULL;",
+                new_games,
+            )
+        if downs:
+            cur.executemany(
+                f"INSERT INTO game_outages (game_id, down_ts, reason) VALUES ({ph}, {ph}, {ph});",
+                [(gid, now, reason) for gid, reason in downs],
+            )
+            cur.executemany(
+                f"UPDATE games SET down_since = {ph}, "
+                f"outage_count = COALESCE(outage_count, 0) + 1 WHERE id = {ph};",
+                [(now, gid) for gid, _ in downs],
+            )
+        if ups:
+            cur.executemany(
+                f"UPDATE game_outages SET up_ts = {ph} WHERE game_id = {ph} AND up_ts IS NULL;",
+                [(now, gid) for gid, _ in ups],
+            )
+            cur.executemany(
+                f"UPDATE games SET down_since = NULL, "
+                f"downtime_seconds = COALESCE(downtime_seconds, 0) + {ph} WHERE id = {ph};",
+                [(max(0, now - (since or now)), gid) for gid, since in ups],
+            )
+        return len(changes)
+    finally:
+        cur.close()
+
+
+def record_status(db, game_id, status, reason=None, now=None):
+    """
+    Record a status change for one game before its row is updated.
+    Returns True if it was a transition, False if unchanged, None if no such game.
+    """
+    ph = "%s" if _is_postgres(db) else "?"
+    lock = " FOR UPDATE" if _is_postgres(db) else ""  # two PUTs must not both open an outage
+    cur = db.cursor()
+    try:
+        cur.execute(f"SELECT status, down_since FROM games WHERE id = {ph}{lock};", (game_id,))
+        row = cur.fetchone()
+    finally:
+        cur.close()
+    if row is None:
+        return None
+    old, down_since = row
+    if old == status:
+        return False
+    apply_transitions(db, [(game_id, old, down_since, status, reason)], now)
+    return True
+
+
+def start_tracking(db):
+    """
+    Games that have no stats yet (new columns, older rows) start being tracked
+    now; a game that is already Down gets an open outage from now. Idempotent.
+    """
+    ph = "%s" if _is_postgres(db) else "?"
+    now = _now()
+    cur = db.cursor()
+    try:
+        cur.execute("SELECT id, status, down_reason FROM games WHERE status_tracked_since IS NULL;")
+        rows = cur.fetchall()
+        if rows:
+            cur.executemany(
+                f"UPDATE games SET status_tracked_since = {ph}, outage_count = 0, "
+                f"downtime_seconds = 0, down_since = NULL WHERE id = {ph};",
+                [(now, gid) for gid, _, _ in rows],
+            )
+            apply_transitions(db, [(gid, None, None, DOWN, reason)
+                                   for gid, status, reason in rows if status == DOWN], now)
+        db.commit()
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+# --- reads ------------------------------------------------------------------
+def game_stats(db, now=None):
+    """All-time figures per game from the running totals (no history scan)."""
+    now = _now() if now is None else now
+    cur = db.cursor()
+    try:
+        cur.execute("""
+            SELECT id, name, status, COALESCE(outage_count, 0), COALESCE(downtime_seconds, 0),
+                   down_since, status_tracked_since
+            FROM games ORDER BY name;
+        """)
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+    out = []
+    for gid, name, status, outages, closed_down, down_since, tracked in rows:
+        current = now - down_since if down_since is not None else 0
+        downtime = closed_down + current
+        closed = outages - (1 if down_since is not None else 0)
+        observed = now - tracked if tracked is not None else None
+        out.append({
+            "id": gid,
+            "name": name,
+            "status": status,
+            "outages": outages,
+            "downtime_hours": _hours(downtime),
+            "down_since": _iso(down_since),
+            "tracked_since": _iso(tracked),
+            "mttr_hours": _hours(closed_down / closed) if closed > 0 else None,
+            "mtbf_hours": _hours((observed - downtime) / outages) if outages and observed else None,
+        })
+    return out
+
+
+def downtime_report(db, start, end, now=None):
+    """
+    Downtime per game in [start, end) (unix seconds), every game listed.
+    Outages are clipped to the window; an open outage counts up to now.
+    One query: games LEFT JOIN game_outages on the (game_id, down_ts) index.
+    """
+    now = _now() if now is None else now
+    end = min(end, now)
+    ph = "%s" if _is_postgres(db) else "?"
+    # CASE instead of MIN/MAX(a, b) / LEAST/GREATEST: same SQL on both engines
+    up = f"COALESCE(o.up_ts, {ph})"
+    overlap = (f"(CASE WHEN {up} < {ph} THEN {up} ELSE {ph} END) - "
+               f"(CASE WHEN o.down_ts > {ph} THEN o.down_ts ELSE {ph} END)")
+    cur = db.cursor()
+    try:
+        cur.execute(f"""
+            SELECT g.id, g.name, g.status, g.status_tracked_since,
+                   COUNT(o.id), COALESCE(SUM({overlap}), 0)
+            FROM games g
+            LEFT JOIN game_outages o
+              ON o.game_id = g.id AND o.down_ts < {ph} AND (o.up_ts IS NULL OR o.up_ts > {ph})
+            GROUP BY g.id, g.name, g.status, g.status_tracked_since
+            ORDER BY g.name;
+        """, (now, end, now, end, start, start, end, start))
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+    out = []
+    for gid, name, status, tracked, outages, downtime in rows:
+        window = max(0, end - max(start, tracked if tracked is not None else start))
+        downtime = min(int(downtime), window)
+        out.append({
+            "id": gid,
+            "name": name,
+            "status": status,
+            "outages": outages,
+            "downtime_hours": _hours(downtime),
+            "uptime_pct": round(100 * (window - downtime) / window, 2) if window else None,
+            "mttr_hours": _hours(downtime / outages) if outages else None,
+            "mtbf_hours": _hours((window - downtime) / outages) if outages else None,
+        })
+    return out
+
+
+def status_history(db, game_id, limit=HISTORY_LIMIT):
+    ph = "%s" if _is_postgres(db) else "?"
+    cur = db.cursor()
+    try:
+        cur.execute(
+            f"SELECT from_status, to_status, reason, changed_at FROM game_status_history "
+            f"WHERE game_id = {ph} ORDER BY changed_at DESC, id DESC LIMIT {int(limit)};",
+            (game_id,),
+        )
+        return [{"from": r[0], "to": r[1], "reason": r[2], "changed_at": r[3]}
+                for r in cur.fetchall()]
+    finally:
+        cur.close()
@@ -5,9 +5,35 @@ API endpoints for the Game Inventory system.
 Separate from app.py to keep code modular and clean.
 """
 
+from datetime import datetime, timedelta, timezone
+
 from flask import request, jsonify
 from psycopg2 import sql
 
+import game_status
+
+from cache_utils import invalidate
+from pm_schedule import refresh_game
+from table_versions import bump_table_version
+from change_log import log_change, delta_since, latest_seq
+from http_cache import not_modified, with_etag
+from pagination import encode_cursor, decode_cursor
+
+GAME_COLUMNS = "id, name, status, down_reason, updated_at"
+BULK_STATUS_MAX = 500
+_IN_CHUNK = 400  # stay under SQLite's bound-parameter limit
+
+
+def _game_from_row(row):
+    return {
+        "id": row[0],
+        "name": row[1],
+        "status": row[2],
+        "down_reason": row[3],
+        "updated_at": row[4]  # ISO 8601 via app.json
+    }
+
+
 def register_game_routes(app, get_db):
     """
     Registers all /api/games routes with the Flask app.
@@ -20,26 +46,22 @@ def register_game_routes(app, get_db):
         cur = db.cursor()
 
         if request.method == 'GET':
+            if request.args.get('since'):
+                cur.close()
+                return games_delta(db)
             try:
-                cur.execute("SELECT id, name, status, down_reason, updated_at FROM games ORDER BY id;")
-                rows = cur.fetchall()
-
-                def safe_iso(val):
-                    if val is None:
-                        return None
-                    return val.isoformat() if hasattr(val, "isoformat") else str(val)
-
-                games_list = []
-                for row in rows:
-                    games_list.append({
-                        "id": row[0],
-                        "name": row[1],
-                        "status": row[2],
-                        "down_reason": row[3],
-                        "updated_at": safe_iso(row[4])
-                    })
-
-                return jsonify(games_list)
+                etag, unchanged = not_modified(db, "games")
+                if unchanged:
+                    return unchanged
+
+                # start point for ?since= (taken first: a write in between is re-sent, not lost)
+                sync_cursor = encode_cursor(latest_seq(db, "games"))
+                cur.execute(f"SELECT {GAME_COLUMNS} FROM games ORDER BY id;")
+                games_list = [_game_from_row(row) for row in cur.fetchall()]
+
+                resp = with_etag(jsonify(games_list), etag)
+                resp.headers['X-Sync-Cursor'] = sync_cursor
+                return resp
             except Exception as e:
                 print(f"ERROR: Failed to fetch games: {e}")
                 return jsonify({"error": "Failed to retrieve games"}), 500
@@ -61,9 +83,16 @@ def register_game_routes(app, get_db):
                     INSERT INTO games (name, status, down_reason, updated_at)
                     VALUES ({placeholder}, {placeholder}, {placeholder}, CURRENT_TIMESTAMP)
                 """
+                if is_postgres:
+                    query += " RETURNING id"
 
                 cur.execute(query, (name, status, down_reason))
+                new_id = cur.fetchone()[0] if is_postgres else cur.lastrowid
+                game_status.apply_transitions(db, [(new_id, None, None, status, down_reason)])
+                log_change(db, "games", new_id, "insert")
+                bump_table_version(db, "games")
                 db.commit()
+                invalidate("games")
 
                 return jsonify({"message": "Game added successfully!"}), 201
             except Exception as e:
@@ -73,6 +102,53 @@ def register_game_routes(app, get_db):
             finally:
                 cur.close()
 
+    def games_delta(db):
+        """
+        GET /api/games?since=<cursor>  (cursor: X-Sync-Cursor of a full GET,
+        or sync_cursor of the previous delta)
+        Returns {"items": [changed games], "removed": [deleted ids],
+                 "sync_cursor": "<token>", "more": bool, "reset": bool}.
+        Deleted games come from the change log's delete entries (tombstones);
+        reset=true means the log no longer reaches back that far: GET in full.
+        """
+        try:
+            seq = int(decode_cursor(request.args['since'], size=1)[0])
+        except (TypeError, ValueError):
+            return jsonify({"error": "invalid since cursor"}), 400
+
+        etag, unchanged = not_modified(db, "games")
+        if unchanged:
+            return unchanged
+
+        placeholder = '%s' if hasattr(db, 'dsn') else '?'
+        cur = db.cursor()
+        try:
+            delta = delta_since(db, "games", seq)
+            ids = [int(i) for i in delta["ids"]]
+            items = []
+            for start in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[start:start + _IN_CHUNK]
+                cur.execute(
+                    f"SELECT {GAME_COLUMNS} FROM games "
+                    f"WHERE id IN ({', '.join([placeholder] * len(chunk))}) ORDER BY id;",
+                    tuple(chunk),
+                )
+                items.extend(_game_from_row(row) for row in cur.fetchall())
+            present = {g["id"] for g in items}
+            return with_etag(jsonify({
+                "items": items,
+                "removed": [i for i in ids if i not in present],
+                "sync_cursor": encode_cursor(delta["seq"]),
+                "more": delta["more"],
+                "reset": delta["reset"],
+            }), etag)
+        except Exception as e:
+            db.rollback()
+            print(f"ERROR: Failed to fetch games delta: {e}")
+            return jsonify({"error": "Failed to retrieve games"}), 500
+        finally:
+            cur.close()
+
     @app.route('/api/games/<int:game_id>', methods=['PUT', 'DELETE'])
     def modify_game(game_id):
         db = get_db()
@@ -82,7 +158,7 @@ def register_game_routes(app, get_db):
         if request.method == 'PUT':
             try:
                 data = request.get_json(force=True)
-                allowed_fields = ['name', 'status', 'down_reason']
+                allowed_fields = ['name', 'status', 'down_reason', 'game_type', 'pm_interval_days']
 
                 set_parts = []
                 values = []
@@ -98,6 +174,10 @@ def register_game_routes(app, get_db):
 
                 set_parts.append("updated_at = CURRENT_TIMESTAMP")
 
+                # history + outage totals first (it compares with the stored status)
+                if 'status' in data:
+                    game_status.record_status(db, game_id, data['status'], data.get('down_reason'))
+
                 query = f"""
                     UPDATE games
                     SET {', '.join(set_parts)}
@@ -111,7 +191,14 @@ def register_game_routes(app, get_db):
                     db.commit()
                     return jsonify({"error": "Game not found"}), 404
 
+                # interval inputs changed -> move the stored next PM due date with them
+                if {'name', 'game_type', 'pm_interval_days'} & set(data):
+                    refresh_game(db, game_id)  # also logs the change
+                else:
+                    log_change(db, "games", game_id, "update")
+                bump_table_version(db, "games")
                 db.commit()
+                invalidate("games")
                 return jsonify({"message": "Game updated successfully!"})
             except Exception as e:
                 db.rollback()
@@ -128,7 +215,10 @@ def register_game_routes(app, get_db):
                     db.commit()
                     return jsonify({"error": "Game not found"}), 404
 
+                log_change(db, "games", game_id, "delete")
+                bump_table_version(db, "games")
                 db.commit()
+                invalidate("games")
                 return jsonify({"message": "Game deleted successfully!"})
             except Exception as e:
                 db.rollback()
@@ -136,4 +226,188 @@ def register_game_routes(app, get_db):
                 return jsonify({"error": "Failed to delete game"}), 500
             finally:
                 cur.close()
+
+    @app.route('/api/games/bulk_status', methods=['POST'])
+    def games_bulk_status():
+        """
+        POST JSON, either one status for many games:
+          {"ids": [1, 2, 3], "status": "Down", "down_reason": "Power out, bank B"}
+        or one per game:
+          {"items": [{"id": 1, "status": "Down", "down_reason": "..."},
+                     {"id": 4, "status": "Up"}]}
+        down_reason is set as sent (Up clears it when omitted).
+        All in one transaction: one UPDATE ... WHERE id IN (...) per distinct
+        (status, reason), history/outage rows batched (game_status.apply_transitions).
+
+        Response: {
+          "results": [{"id": 1, "result": "updated", "from": "Up", "to": "Down"},
+                      {"id": 9, "result": "not_found"},
+                      {"id": null, "result": "invalid", "error": "..."}],
+          "updated": 1, "not_found": 1, "invalid": 1
+        }
+        """
+        db = get_db()
+        data = request.get_json(silent=True) or {}
+
+        if isinstance(data.get('items'), list):
+            patches = [p if isinstance(p, dict) else {"_invalid": "item must be an object"}
+                       for p in data['items']]
+        elif isinstance(data.get('ids'), list):
+            shared = {k: data[k] for k in ('status', 'down_reason') if k in data}
+            patches = [{**shared, "id": i} for i in data['ids']]
+        else:
+            return jsonify({"error": "send 'ids' + status or 'items'"}), 400
+
+        if not patches:
+            return jsonify({"error": "nothing to update"}), 400
+        if len(patches) > BULK_STATUS_MAX:
+            return jsonify({"error": f"at most {BULK_STATUS_MAX} items per request"}), 400
+
+        # ---- validate ----
+        results = []
+        wanted = {}  # game id -> (position in results, status, reason)
+        for p in patches:
+            error = p.get('_invalid')
+            try:
+                game_id = int(p.get('id'))
+            except (TypeError, ValueError):
+                game_id = None
+            status = str(p.get('status') or '').strip().capitalize()
+            reason = p.get('down_reason') or None
+            if not error and game_id is None:
+                error = "id must be a game id"
+            elif not error and game_id in wanted:
+                error = "id appears more than once"
+            elif not error and status not in (game_status.UP, game_status.DOWN):
+                error = "status must be Up or Down"
+            if error:
+                results.append({"id": game_id, "result": "invalid", "error": error})
+                continue
+            wanted[game_id] = (len(results), status, reason)
+            results.append(None)  # decided below
+
+        placeholder = '%s' if hasattr(db, 'dsn') else '?'
+        lock = " FOR UPDATE" if hasattr(db, 'dsn') else ""
+        # rows are locked and written in id order, so two overlapping bulk
+        # calls wait on each other instead of deadlocking (Postgres)
+        ids = sorted(wanted)
+        cur = db.cursor()
+        try:
+            # current status (locked on Postgres, like record_status)
+            current = {}
+            for start in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[start:start + _IN_CHUNK]
+                cur.execute(
+                    f"SELECT id, status, down_since FROM games "
+                    f"WHERE id IN ({', '.join([placeholder] * len(chunk))}) ORDER BY id{lock};",
+                    tuple(chunk),
+                )
+                current.update((r[0], (r[1], r[2])) for r in cur.fetchall())
+
+            # one set-based UPDATE per distinct (status, reason)
+            groups, transitions = {}, []
+            for gid in ids:
+                if gid not in current:
+                    continue
+                _, status, reason = wanted[gid]
+                groups.setdefault((status, reason), []).append(gid)
+                old, down_since = current[gid]
+                if old != status:
+                    transitions.append((gid, old, down_since, status, reason))
+            for (status, reason), gids in groups.items():
+                for start in range(0, len(gids), _IN_CHUNK):
+                    chunk = gids[start:start + _IN_CHUNK]
+                    cur.execute(
+                        f"UPDATE games SET status = {placeholder}, down_reason = {placeholder}, "
+                        f"updated_at = CURRENT_TIMESTAMP "
+                        f"WHERE id IN ({', '.join([placeholder] * len(chunk))});",
+                        (status, reason, *chunk),
+                    )
+
+            game_status.apply_transitions(db, transitions)
+            found = [gid for gid in ids if gid in current]
+            if found:
+                log_change(db, "games", found, "update")
+                bump_table_version(db, "games")
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"ERROR: Failed bulk game status update: {e}")
+            return jsonify({"error": "Failed to update games"}), 500
+        finally:
+            cur.close()
+        invalidate("games")
+
+        for gid, (pos, status, _) in wanted.items():
+            if gid in current:
+                results[pos] = {"id": gid, "result": "updated", "from": current[gid][0], "to": status}
+            else:
+                results[pos] = {"id": gid, "result": "not_found"}
+        counts = {k: sum(1 for r in results if r["result"] == k)
+                  for k in ("updated", "not_found", "invalid")}
+        return jsonify({"results": results, **counts})
+
+    # --- status history + downtime analytics (see game_status.py) ---------
+    @app.route('/api/games/stats', methods=['GET'])
+    def games_stats():
+        """All-time outages, downtime, MTBF and MTTR per game (running totals)."""
+        db = get_db()
+        etag, unchanged = not_modified(db, "games")
+        if unchanged:
+            return unchanged
+        try:
+            return with_etag(jsonify({"items": game_status.game_stats(db)}), etag)
+        except Exception as e:
+            db.rollback()
+            print(f"ERROR: Failed to compute game stats: {e}")
+            return jsonify({"error": "Failed to compute game stats"}), 500
+
+    @app.route('/api/games/downtime', methods=['GET'])
+    def games_downtime():
+        """
+        GET /api/games/downtime?start=YYYY-MM-DD&end=YYYY-MM-DD (UTC, end day
+        included; default: the last 30 days). Per game: outages, downtime,
+        uptime %, MTBF and MTTR within the window.
+        """
+        db = get_db()
+        today = datetime.now(timezone.utc).date()
+        try:
+            start = _parse_day(request.args.get('start')) or today - timedelta(days=29)
+            end = _parse_day(request.args.get('end')) or today
+        except ValueError:
+            return jsonify({"error": "start/end must be YYYY-MM-DD"}), 400
+        if end < start:
+            return jsonify({"error": "end is before start"}), 400
+        start_ts = _day_ts(start)
+        end_ts = _day_ts(end + timedelta(days=1))
+        try:
+            items = game_status.downtime_report(db, start_ts, end_ts)
+        except Exception as e:
+            db.rollback()
+            print(f"ERROR: Failed to build downtime report: {e}")
+            return jsonify({"error": "Failed to build downtime report"}), 500
+        return jsonify({"start": start.isoformat(), "end": end.isoformat(), "items": items})
+
+    @app.route('/api/games/<int:game_id>/history', methods=['GET'])
+    def game_history(game_id):
+        """Status changes for one game, newest first (?limit=, max 1000)."""
+        db = get_db()
+        try:
+            limit = max(1, min(int(request.args.get('limit', game_status.HISTORY_LIMIT)), 1000))
+        except ValueError:
+            return jsonify({"error": "limit must be a number"}), 400
+        try:
+            return jsonify({"id": game_id, "items": game_status.status_history(db, game_id, limit)})
+        except Exception as e:
+            db.rollback()
+            print(f"ERROR: Failed to fetch game history: {e}")
+            return jsonify({"error": "Failed to fetch game history"}), 500
+
+
+def _parse_day(raw):
+    return datetime.strptime(raw, "%Y-%m-%d").date() if raw else None
+
+
+def _day_ts(day):
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
 # --- END NEW CODE ---
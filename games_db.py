@@ -5,6 +5,8 @@ Backend helper for the Game Inventory table.
 Keeps database schema setup for 'games' separate from app.py.
 """
 
+from db_indexes import ensure_indexes
+
 def ensure_games_table(db):
     """
     Ensures the 'games' table exists in the database.
@@ -21,7 +23,15 @@ def ensure_games_table(db):
                     name TEXT NOT NULL,
                     status TEXT NOT NULL CHECK (status IN ('Up', 'Down')),
                     down_reason TEXT,
-                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                    game_type TEXT,
+                    pm_interval_days INTEGER,
+                    last_pm_date DATE,
+                    pm_next_due DATE,
+                    outage_count INTEGER DEFAULT 0,
+                    downtime_seconds BIGINT DEFAULT 0,
+                    down_since BIGINT,
+                    status_tracked_since BIGINT
                 );
             """)
         else:
@@ -31,51 +41,297 @@ def ensure_games_table(db):
                     name TEXT NOT NULL,
                     status TEXT NOT NULL CHECK (status IN ('Up', 'Down')),
                     down_reason TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    game_type TEXT,
+                    pm_interval_days INTEGER,
+                    last_pm_date TEXT,          -- 'YYYY-MM-DD'
+                    pm_next_due TEXT,           -- 'YYYY-MM-DD'
+                    outage_count INTEGER DEFAULT 0,
+                    downtime_seconds INTEGER DEFAULT 0,
+                    down_since INTEGER,         -- unix seconds
+                    status_tracked_since INTEGER
                 );
             """)
 
         db.commit()
+        _ensure_game_columns(db, _PM_SCHEDULE_COLUMNS, "PM")
+        _ensure_game_columns(db, _STATUS_STAT_COLUMNS, "status stats")
         print("✅ 'games' table ready.")
     finally:
         cur.close()
+
+    ensure_indexes(db, "games")
+
+
+# PM scheduling columns (see pm_schedule.py), added to older tables in place
+_PM_SCHEDULE_COLUMNS = (
+    ("game_type", "TEXT", "TEXT"),
+    ("pm_interval_days", "INTEGER", "INTEGER"),
+    ("last_pm_date", "DATE", "TEXT"),
+    ("pm_next_due", "DATE", "TEXT"),
+)
+
+# running outage aggregates (see game_status.py); times are unix seconds
+_STATUS_STAT_COLUMNS = (
+    ("outage_count", "INTEGER DEFAULT 0", "INTEGER DEFAULT 0"),
+    ("downtime_seconds", "BIGINT DEFAULT 0", "INTEGER DEFAULT 0"),
+    ("down_since", "BIGINT", "INTEGER"),
+    ("status_tracked_since", "BIGINT", "INTEGER"),
+)
+
+
+def _ensure_game_columns(db, columns, label):
+    is_postgres = hasattr(db, 'dsn')
+    cur = db.cursor()
+    try:
+        if is_postgres:
+            for name, pg_type, _ in columns:
+                cur.execute(f"ALTER TABLE games ADD COLUMN IF NOT EXISTS {name} {pg_type};")
+        else:
+            cur.execute("PRAGMA table_info(games);")
+            have = {r[1] for r in cur.fetchall()}
+            for name, _, sqlite_type in columns:
+                if name not in have:
+                    cur.execute(f"ALTER TABLE games ADD COLUMN {name} {sqlite_type};")
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: games {label} columns skipped: {e}")
+    finally:
+        cur.close()
+
+
+# --- STATUS HISTORY + OUTAGES --------------------------------------------
+# game_status_history: one row per status change (audit trail).
+# game_outages: one row per Down period; up_ts stays NULL while the game is
+# down (at most one open row per game, enforced by ux_game_outages_open).
+_STATUS_TABLES_PG = (
+    """
+    CREATE TABLE IF NOT EXISTS game_status_history (
+        id BIGSERIAL PRIMARY KEY,
+        game_id INTEGER NOT NULL,
+        from_status TEXT,
+        to_status TEXT NOT NULL,
+        reason TEXT,
+        changed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS game_outages (
+        id BIGSERIAL PRIMARY KEY,
+        game_id INTEGER NOT NULL,
+        down_ts BIGINT NOT NULL,
+        up_ts BIGINT,
+        reason TEXT
+    );
+    """,
+)
+
+_STATUS_TABLES_SQLITE = (
+    """
+    CREATE TABLE IF NOT EXISTS game_status_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_id INTEGER NOT NULL,
+        from_status TEXT,
+        to_status TEXT NOT NULL,
+        reason TEXT,
+        changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS game_outages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_id INTEGER NOT NULL,
+        down_ts INTEGER NOT NULL,   -- unix seconds
+        up_ts INTEGER,              -- NULL while still down
+        reason TEXT
+    );
+    """,
+)
+
+
+def ensure_game_status_tables(db):
+    """Creates game_status_history + game_outages (both engines) and their indexes."""
+    is_postgres = hasattr(db, 'dsn')
+    cur = db.cursor()
+    try:
+        for ddl in (_STATUS_TABLES_PG if is_postgres else _STATUS_TABLES_SQLITE):
+            cur.execute(ddl)
+        cur.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_game_outages_open "
+            "ON game_outages (game_id) WHERE up_ts IS NULL;"
+        )
+        db.commit()
+    finally:
+        cur.close()
+
+    ensure_indexes(db, "game_status_history")
+    ensure_indexes(db, "game_outages")
 # --- END NEW CODE ---
 # --- PM LOGS (Preventative Maintenance) -------------------------
 
+# One schema for both engines (the old app.py copy had game_id TEXT,
+# date_logged and no game_name; rows from it are migrated below).
+PM_MIGRATION_BATCH = 5000
+
+_PM_LOGS_PG = """
+    CREATE TABLE IF NOT EXISTS pm_logs (
+        id SERIAL PRIMARY KEY,
+        game_id INTEGER,
+        game_name TEXT NOT NULL DEFAULT '',
+        pm_date DATE NOT NULL,
+        notes TEXT DEFAULT '',
+        completed_by TEXT DEFAULT '',
+        created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+_PM_LOGS_SQLITE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_id INTEGER,
+        game_name TEXT NOT NULL DEFAULT '',
+        pm_date TEXT NOT NULL,      -- store as 'YYYY-MM-DD'
+        notes TEXT DEFAULT '',
+        completed_by TEXT DEFAULT '',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+
 def ensure_pm_logs_table(db):
     """
-    Makes the 'pm_logs' table if it doesn't exist.
+    Makes the 'pm_logs' table if it doesn't exist, and converts a table
+    in the old shape (game_id TEXT) to the typed one.
     Works on SQLite (local) and Postgres (Render).
     """
     is_postgres = hasattr(db, 'dsn')
     cur = db.cursor()
     try:
         if is_postgres:
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS pm_logs (
-                    id SERIAL PRIMARY KEY,
-                    game_id INTEGER,
-                    game_name TEXT NOT NULL,
-                    pm_date DATE NOT NULL,
-                    notes TEXT DEFAULT '',
-                    completed_by TEXT DEFAULT '',
-                    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
-                );
-            """)
+            cur.execute(_PM_LOGS_PG)
+        else:
+            cur.execute(_PM_LOGS_SQLITE.format(name="pm_logs"))
+        db.commit()
+    finally:
+        cur.close()
+
+    try:
+        if is_postgres:
+            _migrate_pm_logs_pg(db)
         else:
+            _migrate_pm_logs_sqlite(db)
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: pm_logs migration skipped: {e}")
+
+    ensure_indexes(db, "pm_logs")
+    print("✅ 'pm_logs' table ready.")
+
+
+def _sqlite_pm_needs_rebuild(cur):
+    cur.execute("PRAGMA table_info(pm_logs);")
+    cols = {r[1]: (r[2] or "").upper() for r in cur.fetchall()}
+    # old shape: TEXT game_id and/or "id SERIAL" (not a rowid alias, so ids were NULL)
+    return cols.get("game_id") != "INTEGER" or cols.get("id") != "INTEGER" or "game_name" not in cols
+
+
+def _migrate_pm_logs_sqlite(db):
+    """
+    SQLite can't change a column type in place: copy into pm_logs_new in
+    rowid batches, then swap the tables. One transaction, so a crash
+    leaves the old table untouched.
+    """
+    cur = db.cursor()
+    try:
+        if not _sqlite_pm_needs_rebuild(cur):
+            return
+        cur.execute("PRAGMA table_info(pm_logs);")
+        old_cols = {r[1] for r in cur.fetchall()}
+        created = "p.date_logged" if "date_logged" in old_cols else (
+            "p.created_at" if "created_at" in old_cols else "CURRENT_TIMESTAMP")
+        name = "p.game_name" if "game_name" in old_cols else "NULL"
+
+        cur.execute("DROP TABLE IF EXISTS pm_logs_new;")
+        cur.execute(_PM_LOGS_SQLITE.format(name="pm_logs_new"))
+        cur.execute("SELECT COALESCE(MAX(rowid), 0) FROM pm_logs;")
+        max_rowid = cur.fetchone()[0]
+        for lo in range(0, max_rowid, PM_MIGRATION_BATCH):
+            cur.execute(f"""
+                INSERT INTO pm_logs_new (id, game_id, game_name, pm_date, notes, completed_by, created_at)
+                SELECT p.rowid, gid,
+                       COALESCE({name}, (SELECT g.name FROM games g WHERE g.id = gid), ''),
+                       p.pm_date, COALESCE(p.notes, ''), COALESCE(p.completed_by, ''),
+                       COALESCE({created}, CURRENT_TIMESTAMP)
+                FROM (SELECT q.*, q.rowid AS rowid,
+                             CASE WHEN TRIM(q.game_id) <> '' AND TRIM(q.game_id) NOT GLOB '*[^0-9]*'
+                                  THEN CAST(TRIM(q.game_id) AS INTEGER) END AS gid
+                      FROM pm_logs q WHERE q.rowid > ? AND q.rowid <= ?) p;
+            """, (lo, lo + PM_MIGRATION_BATCH))
+        cur.execute("DROP TABLE pm_logs;")
+        cur.execute("ALTER TABLE pm_logs_new RENAME TO pm_logs;")
+        db.commit()
+        print(f"✅ pm_logs migrated to typed game_id ({max_rowid} rows max).")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def _migrate_pm_logs_pg(db):
+    """
+    game_id TEXT -> INTEGER without one long table rewrite: fill a new
+    column in committed batches, then swap the columns in one short step.
+    Re-running after an interruption picks up where it stopped.
+    """
+    cur = db.cursor()
+    try:
+        cur.execute("""
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_name = 'pm_logs' AND table_schema = current_schema();
+        """)
+        cols = dict(cur.fetchall())
+        if cols.get("game_id") == "integer" and "game_name" in cols and "created_at" in cols:
+            return
+
+        cur.execute("ALTER TABLE pm_logs ADD COLUMN IF NOT EXISTS game_name TEXT NOT NULL DEFAULT '';")
+        cur.execute("ALTER TABLE pm_logs ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP;")
+        if "date_logged" in cols:
+            cur.execute("UPDATE pm_logs SET created_at = date_logged WHERE date_logged IS NOT NULL;")
+        db.commit()
+        if cols.get("game_id") == "integer":
+            return
+
+        cur.execute("ALTER TABLE pm_logs ADD COLUMN IF NOT EXISTS game_id_int INTEGER;")
+        cur.execute("ALTER TABLE pm_logs ADD COLUMN IF NOT EXISTS game_id_done BOOLEAN NOT NULL DEFAULT FALSE;")
+        db.commit()
+        while True:
             cur.execute("""
-                CREATE TABLE IF NOT EXISTS pm_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    game_id INTEGER,
-                    game_name TEXT NOT NULL,
-                    pm_date TEXT NOT NULL,      -- store as 'YYYY-MM-DD'
-                    notes TEXT DEFAULT '',
-                    completed_by TEXT DEFAULT '',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-            """)
+                UPDATE pm_logs p
+                SET game_id_int = gid.v,
+                    game_name = COALESCE(NULLIF(p.game_name, ''),
+                                         (SELECT g.name FROM games g WHERE g.id = gid.v), ''),
+                    game_id_done = TRUE
+                FROM (SELECT id, CASE WHEN TRIM(game_id) ~ '^[0-9]+$'
+                                      THEN TRIM(game_id)::INTEGER END AS v
+                      FROM pm_logs WHERE NOT game_id_done ORDER BY id LIMIT %s) gid
+                WHERE p.id = gid.id;
+            """, (PM_MIGRATION_BATCH,))
+            done = cur.rowcount
+            db.commit()
+            if done == 0:
+                break
+
+        cur.execute("ALTER TABLE pm_logs DROP COLUMN game_id;")  # drops the old CAST index too
+        cur.execute("ALTER TABLE pm_logs RENAME COLUMN game_id_int TO game_id;")
+        cur.execute("ALTER TABLE pm_logs DROP COLUMN game_id_done;")
+        cur.execute("ALTER TABLE pm_logs DROP COLUMN IF EXISTS date_logged;")
         db.commit()
-        print("✅ 'pm_logs' table ready.")
+        print("✅ pm_logs migrated to typed game_id.")
+    except Exception:
+        db.rollback()
+        raise
     finally:
         cur.close()
 
@@ -108,32 +364,83 @@ def add_pm_log(db, game_name, pm_date, notes="", completed_by="", game_id=None):
         cur.close()
 
 
-def list_pm_logs(db, limit=500):
+PM_LOG_FIELDS = ("id", "game_id", "game_name", "pm_date", "notes", "completed_by", "created_at")
+PM_FETCH_BATCH = 500
+
+
+def _iso(v):
+    # Postgres hands back date/datetime; SQLite already has 'YYYY-MM-DD' strings
+    return v.isoformat() if hasattr(v, "isoformat") else v
+
+
+def iter_pm_logs(db, game_id=None, date_from=None, date_to=None, technician=None,
+                 after=None, limit=None, batch_size=PM_FETCH_BATCH):
     """
-    Get recent PM entries as a list of dicts.
+    PM entries newest first (pm_date DESC, id DESC) as dicts, fetched
+    `batch_size` rows at a time, so memory stays flat however long the
+    history is. On Postgres an unlimited read uses a named (server-side)
+    cursor, so rows are not all pulled into the client at once.
+
+    Filters: game_id, date_from/date_to ('YYYY-MM-DD', inclusive),
+    technician (completed_by, case-insensitive).
+    after=(pm_date, id) continues a keyset page.
     """
     is_postgres = hasattr(db, 'dsn')
-    cur = db.cursor()
+    ph = "%s" if is_postgres else "?"
+    where, params = [], []
+    if game_id is not None:
+        where.append(f"p.game_id = {ph}")
+        params.append(game_id)
+    if date_from:
+        where.append(f"p.pm_date >= {ph}")
+        params.append(date_from)
+    if date_to:
+        where.append(f"p.pm_date <= {ph}")
+        params.append(date_to)
+    if technician:
+        where.append(f"LOWER(p.completed_by) = LOWER({ph})")
+        params.append(technician)
+    if after is not None:
+        where.append(f"(p.pm_date < {ph} OR (p.pm_date = {ph} AND p.id < {ph}))")
+        params.extend([after[0], after[0], after[1]])
+
+    sql_text = (
+        "SELECT p.id, p.game_id, COALESCE(g.name, p.game_name, '') AS game_name, "
+        "p.pm_date, COALESCE(p.notes, '') AS notes, "
+        "COALESCE(p.completed_by, '') AS completed_by, p.created_at "
+        "FROM pm_logs p LEFT JOIN games g ON g.id = p.game_id"
+        + (" WHERE " + " AND ".join(where) if where else "")
+        + " ORDER BY p.pm_date DESC, p.id DESC"
+    )
+    if limit is not None:
+        sql_text += f" LIMIT {ph}"
+        params.append(int(limit))
+
+    if is_postgres and limit is None:
+        cur = db.cursor(name="pm_logs_stream")
+        cur.itersize = batch_size
+    else:
+        cur = db.cursor()
     try:
-        if is_postgres:
-            cur.execute(
-                "SELECT id, game_id, game_name, pm_date, notes, completed_by, created_at "
-                "FROM pm_logs "
-                "ORDER BY pm_date DESC, id DESC "
-                "LIMIT %s",
-                (limit,)
-            )
-        else:
-            cur.execute(
-                "SELECT id, game_id, game_name, pm_date, notes, completed_by, created_at "
-                "FROM pm_logs "
-                "ORDER BY date(pm_date) DESC, id DESC "
-                "LIMIT ?",
-                (limit,)
-            )
-        rows = cur.fetchall()
-        cols = [d[0] for d in cur.description]
-        return [dict(zip(cols, r)) for r in rows]
+        cur.execute(sql_text, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for r in rows:
+                item = dict(zip(PM_LOG_FIELDS, r))
+                item["pm_date"] = _iso(item["pm_date"])
+                item["created_at"] = _iso(item["created_at"])
+                yield item
     finally:
         cur.close()
+
+
+def list_pm_logs(db, limit=500, **filters):
+    """
+    Get recent PM entries as a list of dicts (see iter_pm_logs for filters).
+    """
+    return list(iter_pm_logs(db, limit=limit, **filters))
+
+
 # ---------------------------------------------------------------
\ No newline at end of file
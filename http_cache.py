@@ -0,0 +1,53 @@
+# =========================================================================
+# ARCADE MANAGER - CONDITIONAL GET (ETAGS)
+# Lets polling pages skip unchanged list downloads.
+#
+# What this file does:
+# - list_etag(db, *tables)        -> tag built from the tables' change markers
+#                                    (table_versions) + the request's query string
+# - not_modified(db, *tables)     -> (etag, 304 response or None); call it before
+#                                    running the list query
+# - with_etag(resp, etag)         -> stamps ETag + Cache-Control: no-cache
+#
+# An unchanged poll costs one primary-key lookup on table_versions: no list
+# query, no JSON. Tags are weak (W/"...") because the same data may be sent
+# compressed or not. Browsers revalidate on their own thanks to no-cache,
+# so fetch() callers need no changes.
+#
+# Every write to a listed table must bump_table_version() in its
+# transaction, otherwise clients keep their old copy.
+#
+# Connected files:
+# - table_versions.py (markers), games_api.py, issue_hub_bp.py, app.py (/api/pms)
+# =========================================================================
+
+import hashlib
+
+from flask import Response, request
+
+from table_versions import table_versions
+
+
+def list_etag(db, *tables):
+    versions = table_versions(db, *tables)
+    raw = ";".join(f"{t}={versions[t]}" for t in tables)
+    # different filters / pages / fields are different bodies
+    raw += "?" + request.query_string.decode("latin-1")
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def with_etag(resp, etag):
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+def not_modified(db, *tables):
+    """
+    Returns (etag, response). response is a ready 304 when the client's
+    If-None-Match still matches, else None (build the list, then with_etag()).
+    """
+    etag = list_etag(db, *tables)
+    if request.if_none_match and request.if_none_match.contains_weak(etag):
+        return etag, with_etag(Response(status=304), etag)
+    return etag, None
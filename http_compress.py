@@ -0,0 +1,100 @@
+# =========================================================================
+# ARCADE MANAGER - RESPONSE COMPRESSION
+# gzip / brotli for API + page responses, negotiated per request.
+#
+# What this file does:
+# - init_compression(app) -> after_request hook that compresses responses
+#   when all of these hold:
+#     * the client accepts br or gzip (Accept-Encoding, q-values respected;
+#       br only if the Brotli package is installed)
+#     * status 200, not HEAD, no Content-Encoding yet, compressible mimetype
+#     * body >= COMPRESS_MIN_BYTES (default 1024) - small bodies are left
+#       alone, compressing them costs more than it saves
+#   Streamed bodies (GET /api/pms) are compressed chunk by chunk as they go.
+# - Vary: Accept-Encoding is set on every compressible response.
+#
+# Settings (env): COMPRESS_MIN_BYTES, COMPRESS_GZIP_LEVEL (4),
+# COMPRESS_BR_QUALITY (4). Levels are kept low on purpose: bodies are
+# compressed per request, and on a 2 MB issue list gzip -6 took twice as
+# long as -4 for ~15% fewer bytes (benchmarks/bench_json_compress.py).
+#
+# Connected files:
+# - app.py (init_compression(app)), json_provider.py
+# =========================================================================
+
+import gzip
+import os
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.environ.get("COMPRESS_GZIP_LEVEL", "4"))
+COMPRESS_BR_QUALITY = int(os.environ.get("COMPRESS_BR_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = {
+    "application/json", "application/javascript", "text/html", "text/css",
+    "text/plain", "text/csv", "text/javascript", "image/svg+xml",
+}
+
+
+def _encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress_bytes(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=COMPRESS_BR_QUALITY)
+    return gzip.compress(data, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+def _compress_stream(chunks, encoding):
+    """Compress an iterable of chunks; only yields when the encoder has output."""
+    if encoding == "br":
+        enc = brotli.Compressor(quality=COMPRESS_BR_QUALITY)
+        feed, finish = enc.process, enc.finish
+    else:
+        enc = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        feed, finish = enc.compress, enc.flush
+    try:
+        for chunk in chunks:
+            out = feed(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+            if out:
+                yield out
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()  # runs the generator's own cleanup (e.g. closing its DB connection)
+
+
+def compress_response(resp):
+    if resp.mimetype not in COMPRESSIBLE_TYPES:
+        return resp
+    resp.vary.add("Accept-Encoding")
+    if (request.method == "HEAD" or resp.status_code != 200
+            or "Content-Encoding" in resp.headers or resp.direct_passthrough):
+        return resp
+    encoding = request.accept_encodings.best_match(_encodings())
+    if not encoding:
+        return resp
+
+    if resp.is_streamed:
+        resp.response = _compress_stream(resp.response, encoding)
+        resp.headers.pop("Content-Length", None)
+    else:
+        data = resp.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return resp
+        resp.set_data(compress_bytes(data, encoding))
+    resp.headers["Content-Encoding"] = encoding
+    return resp
+
+
+def init_compression(app):
+    app.after_request(compress_response)
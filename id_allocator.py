@@ -0,0 +1,136 @@
+# =========================================================================
+# ARCADE MANAGER - BLOCK (HI/LO) ID ALLOCATOR
+# Hands out padded-ID counters from memory, reserving them from
+# id_sequences N at a time with one atomic UPDATE ... RETURNING.
+#
+# What this file does:
+# - BlockIdAllocator(...).next(db, entity)    -> next counter (int)
+# - BlockIdAllocator(...).take(db, entity, n) -> n counters in one step
+# - ID_BLOCKS: shared allocator for id_sequences(entity, counter)
+#
+# How it stays safe across workers:
+# - the counter row always holds the highest id *reserved* by anyone, and
+#   a reservation is a single UPDATE (row lock on Postgres, write lock on
+#   SQLite), so two processes can never get overlapping blocks
+# - blocks are remembered per process id, so a forked worker never reuses
+#   a block its parent had already started handing out
+# Unused ids in a block are skipped when the process exits (gaps are fine,
+# ids only need to be unique and increasing per process).
+#
+# Connected files:
+# - issue_hub_bp.py (next_id: IH001, EMP-001)
+# - issues_api.py   (get_next_padded_id: IS-001)
+# - issues_db.py    (next_issue_id: 001)
+# =========================================================================
+
+import os
+import sqlite3
+import threading
+
+DEFAULT_BLOCK_SIZE = int(os.environ.get("ID_BLOCK_SIZE", "10"))
+
+# UPDATE ... RETURNING needs SQLite 3.35+
+_SQLITE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _is_postgres(db):
+    return hasattr(db, "dsn")
+
+
+class BlockIdAllocator:
+    def __init__(self, table="id_sequences", key_col="entity", value_col="counter",
+                 block_size=None):
+        self.table = table
+        self.key_col = key_col
+        self.value_col = value_col
+        self.block_size = block_size or DEFAULT_BLOCK_SIZE
+        self._lock = threading.Lock()
+        self._blocks = {}  # entity -> [next_value, last_value, pid]
+
+    # ---------- public ----------
+    def next(self, db, entity):
+        return self.take(db, entity, 1)[0]
+
+    def take(self, db, entity, n):
+        """
+        Return `n` increasing ids for `entity`. Uses what is left of the
+        current block first; one reservation covers the rest (at least a block).
+        """
+        if n <= 0:
+            return []
+        pid = os.getpid()
+        out = []
+        with self._lock:
+            block = self._blocks.get(entity)
+            if block and block[2] == pid:
+                while block[0] <= block[1] and len(out) < n:
+                    out.append(block[0])
+                    block[0] += 1
+            missing = n - len(out)
+            if missing:
+                size = max(missing, self.block_size)
+                lo, hi = self._reserve(db, entity, size)
+                out.extend(range(lo, lo + missing))
+                self._blocks[entity] = [lo + missing, hi, pid]
+        return out
+
+    def reset(self):
+        """Forget cached blocks (tests / after restoring a DB)."""
+        with self._lock:
+            self._blocks.clear()
+
+    # ---------- DB ----------
+    def _reserve(self, db, entity, size):
+        """Atomically bump the counter by `size`; returns (first, last) of the new block."""
+        pg = _is_postgres(db)
+        ph = "%s" if pg else "?"
+        bump = (
+            f"UPDATE {self.table} SET {self.value_col} = {self.value_col} + {ph} "
+            f"WHERE {self.key_col} = {ph}"
+        )
+        cur = db.cursor()
+        try:
+            hi = self._bump(cur, bump, ph, entity, size, pg)
+            if hi is None:
+                # first use of this entity: seed the row, then bump again
+                if pg:
+                    cur.execute(
+                        f"INSERT INTO {self.table} ({self.key_col}, {self.value_col}) "
+                        f"VALUES (%s, 0) ON CONFLICT ({self.key_col}) DO NOTHING;",
+                        (entity,),
+                    )
+                else:
+                    cur.execute(
+                        f"INSERT OR IGNORE INTO {self.table} ({self.key_col}, {self.value_col}) "
+                        f"VALUES (?, 0);",
+                        (entity,),
+                    )
+                hi = self._bump(cur, bump, ph, entity, size, pg)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cur.close()
+        hi = int(hi)
+        return hi - size + 1, hi
+
+    def _bump(self, cur, bump, ph, entity, size, pg):
+        if pg or _SQLITE_RETURNING:
+            cur.execute(f"{bump} RETURNING {self.value_col};", (size, entity))
+            row = cur.fetchone()
+            return row[0] if row else None
+        # old SQLite: the UPDATE holds the write lock until commit,
+        # so reading the row back in the same transaction is still atomic
+        cur.execute(bump + ";", (size, entity))
+        if cur.rowcount == 0:
+            return None
+        cur.execute(
+            f"SELECT {self.value_col} FROM {self.table} WHERE {self.key_col} = {ph};",
+            (entity,),
+        )
+        return cur.fetchone()[0]
+
+
+# shared allocator for app.ensure_id_sequences' table
+ID_BLOCKS = BlockIdAllocator()
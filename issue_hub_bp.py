@@ -2,15 +2,35 @@
 # Issue Hub lives in its own blueprint.
 # It is now correctly passed the database functions from app.py.
 
+import os
+import re
+import difflib
+import unicodedata
 from flask import Blueprint, render_template, request, jsonify
 from datetime import datetime, timedelta
 
+from db_indexes import ensure_indexes
+from search_index import ensure_search_index, search_join, search_terms
+from id_allocator import ID_BLOCKS
+from scheduler import start_periodic
+from table_versions import bump_table_version
+from change_log import log_change, delta_since, latest_seq
+from http_cache import not_modified, with_etag
+from pagination import (
+    wants_page, parse_limit, parse_fields, encode_cursor, decode_cursor,
+)
+
 
 issue_hub_bp = Blueprint("issue_hub", __name__)
 
 # we'll stash app.py's get_db here so routes can use it
 _get_db_fn = None
 
+# resolved items count as archived after this many days; the background
+# sweep persists that every ARCHIVE_SWEEP_INTERVAL seconds (0 = off)
+ARCHIVE_AFTER_DAYS = int(os.environ.get("ISSUEHUB_ARCHIVE_DAYS", "14"))
+ARCHIVE_SWEEP_INTERVAL = float(os.environ.get("ISSUEHUB_ARCHIVE_INTERVAL", "900"))
+
 
 # -------- helpers -----------------------------------------------------------
 def _is_pg(db):
@@ -22,6 +42,34 @@ def _get_db():
     return _get_db_fn()
 
 
+# columns returned by the list endpoints, in SELECT order
+ITEM_COLUMNS = [
+    "id", "category", "title", "details", "location", "priority", "status",
+    "resolution", "reporter", "assignee", "target_date", "created_at",
+    "updated_at", "resolved_at", "deleted_at",
+]
+# fields a client may ask for with ?fields= ('notes' is the details alias)
+ITEM_FIELDS = ITEM_COLUMNS + ["notes"]
+
+
+def _item_from_row(cols, r, fields=None):
+    """
+    Turn a row (selected as `cols`) into the JSON shape the frontend expects.
+    `fields` limits the output keys (None = everything, incl. the notes alias).
+    Dates go out as-is; app.json (json_provider) writes them as ISO 8601.
+    """
+    row = dict(zip(cols, r))
+    item = dict(row)
+    for k in ("target_date", "resolved_at", "deleted_at"):
+        if k in item and not item[k]:
+            item[k] = None
+    if "details" in row:
+        item["notes"] = row["details"]  # alias for frontend
+    if fields is not None:
+        item = {k: item[k] for k in fields if k in item}
+    return item
+
+
 def ensure_issuehub_tables(get_db_fn, ensure_id_sequences):
     """
     Creates base tables if missing, ensures id_sequences rows,
@@ -111,52 +159,136 @@ def ensure_issuehub_tables(get_db_fn, ensure_id_sequences):
             db.commit()
         except Exception:
             db.rollback()
+
+        # normalized keys for the duplicate check (see _key)
+        for col in ("title_key", "location_key"):
+            try:
+                cur.execute(f"ALTER TABLE issuehub_issues ADD COLUMN {col} TEXT;")
+                db.commit()
+            except Exception:
+                db.rollback()
     finally:
         cur.close()
 
-
-def next_id(db, prefix="IH", entity="ih", width=3):
-    """Make IDs like IH001, IH002… using id_sequences."""
+    # --- title n-gram index for the duplicate check ---
     cur = db.cursor()
     try:
-        if _is_pg(db):
-            cur.execute("UPDATE id_sequences SET counter = counter + 1 WHERE entity = %s;", (entity,))
-            if cur.rowcount == 0:
-                cur.execute("INSERT INTO id_sequences (entity, counter) VALUES (%s, 1);", (entity,))
-            cur.execute("SELECT counter FROM id_sequences WHERE entity = %s;", (entity,))
-        else:
-            cur.execute("UPDATE id_sequences SET counter = counter + 1 WHERE entity = ?;", (entity,))
-            if cur.rowcount == 0:
-                cur.execute("INSERT INTO id_sequences (entity, counter) VALUES (?, 1);", (entity,))
-            cur.execute("SELECT counter FROM id_sequences WHERE entity = ?;", (entity,))
-        counter = cur.fetchone()[0]
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS issuehub_title_grams (
+                gram     TEXT NOT NULL,
+                issue_id TEXT NOT NULL,
+                PRIMARY KEY (gram, issue_id)
+            );
+            """
+        )
         db.commit()
-        return f"{prefix}{str(counter).zfill(width)}"
     finally:
         cur.close()
 
-def auto_archive_resolved(db, days: int = 14) -> int:
+    # --- secondary indexes for list / by_game / duplicate scan ---
+    ensure_indexes(db, "issuehub_issues")
+    ensure_indexes(db, "issuehub_title_grams")
+
+    # --- fill keys + grams for rows written before they existed ---
+    _backfill_dedupe_keys(db)
+
+    # --- full-text search (FTS5 / tsvector) for ?q= ---
+    ensure_search_index(db, "issuehub_issues")
+
+
+def next_id(db, prefix="IH", entity="ih", width=3):
+    """
+    Make IDs like IH001, IH002… using id_sequences.
+    Counters come from a per-process block (see id_allocator.py), so most
+    calls never touch the DB.
+    """
+    counter = ID_BLOCKS.next(db, entity)
+    return f"{prefix}{str(counter).zfill(width)}"
+
+def _archive_due_sql(ph):
+    """
+    Predicate for 'resolved long enough ago to count as archived'.
+    Written as an OR (not COALESCE) so it can use ix_issuehub_live_status_resolved.
+    Takes two params: (threshold, threshold).
+    """
+    return (
+        f"status = 'resolved' AND (resolved_at < {ph} "
+        f"OR (resolved_at IS NULL AND updated_at < {ph}))"
+    )
+
+
+def _archive_threshold(days=None):
+    return datetime.utcnow() - timedelta(days=ARCHIVE_AFTER_DAYS if days is None else days)
+
+
+def _status_select(cols, ph, threshold):
+    """
+    SELECT list where `status` reports the archive rule even before the sweep
+    has run, so reads never have to write. Returns (sql, params).
+    """
+    out, params = [], []
+    for c in cols:
+        if c == "status":
+            out.append(
+                f"CASE WHEN deleted_at IS NULL AND {_archive_due_sql(ph)} "
+                f"THEN 'archived' ELSE status END AS status"
+            )
+            params.extend([threshold, threshold])
+        else:
+            out.append(c)
+    return ", ".join(out), params
+
+
+def _status_where(status, ph, threshold):
+    """WHERE parts for ?status= (all|trash|<status>) with the archive rule applied."""
+    if status == "trash":
+        return ["deleted_at IS NOT NULL"], []
+    where, params = ["deleted_at IS NULL"], []
+    if status == "all":
+        where.append("status IN ('open','in_progress')")
+    elif status == "resolved":
+        where.append(f"status = 'resolved' AND NOT ({_archive_due_sql(ph)})")
+        params.extend([threshold, threshold])
+    elif status == "archived":
+        where.append(f"(status = 'archived' OR ({_archive_due_sql(ph)}))")
+        params.extend([threshold, threshold])
+    else:
+        where.append(f"status = {ph}")
+        params.append(status)
+    return where, params
+
+
+def auto_archive_resolved(db, days: int = None) -> int:
     """
     Move items to 'archived' when they have been 'resolved' for > days.
     Uses UTC and works for both Postgres and SQLite by passing a Python datetime threshold.
+    Runs from the background sweep (never from a GET); reads apply the same
+    rule in their query, so they are correct between sweeps.
     Returns number of rows changed.
     """
     now = datetime.utcnow()
-    threshold = now - timedelta(days=days)
+    threshold = _archive_threshold(days)
     ph = "%s" if _is_pg(db) else "?"
 
-    sql = f"""
-        UPDATE issuehub_issues
-        SET status = 'archived', updated_at = {ph}
-        WHERE deleted_at IS NULL
-          AND status = 'resolved'
-          AND COALESCE(resolved_at, updated_at) < {ph};
-    """
+    due = f"deleted_at IS NULL AND {_archive_due_sql(ph)}"
 
     cur = db.cursor()
     try:
-        cur.execute(sql, (now, threshold))
-        changed = cur.rowcount or 0
+        # ids first so the change log can name each archived row
+        cur.execute(f"SELECT id FROM issuehub_issues WHERE {due};", (threshold, threshold))
+        ids = [r[0] for r in cur.fetchall()]
+        changed = 0
+        for chunk in _chunks(ids):
+            cur.execute(
+                f"UPDATE issuehub_issues SET status = 'archived', updated_at = {ph} "
+                f"WHERE {due} AND id IN ({', '.join([ph] * len(chunk))});",
+                (now, threshold, threshold, *chunk),
+            )
+            changed += cur.rowcount or 0
+        if changed:
+            log_change(db, "issuehub_issues", ids, "update")
+            bump_table_version(db, "issuehub_issues")
         db.commit()
         return changed
     except Exception:
@@ -166,6 +298,12 @@ def auto_archive_resolved(db, days: int = 14) -> int:
         cur.close()
 
 
+def _archive_sweep():
+    changed = auto_archive_resolved(_get_db())
+    if changed:
+        print(f"Issue Hub: auto-archived {changed} resolved item(s)")
+
+
 # -------- page route (keeps endpoint name 'issue_hub') ----------------------
 @issue_hub_bp.route("/issue-hub")
 def issue_hub_page():
@@ -181,69 +319,182 @@ def issuehub_list():
     - status=trash => show ONLY deleted (deleted_at IS NOT NULL)
     - status=all (or missing) => show non-deleted AND status IN ('open','in_progress')
     - otherwise => non-deleted AND status = <value>
+
+    Paged mode (any of these turns it on; without them the full list is returned):
+    - limit=<n>          page size (default 100, max 500)
+    - cursor=<token>     next_cursor from the previous page
+    - fields=a,b,c       only return these keys (id is always included)
+    Response: {"items": [...], "next_cursor": "<token>" | null}
+    Pages are keyset-ordered on (created_at DESC, id DESC).
+
+    Search: q=<words> matches title, details, location and resolution
+    (full-text, see search_index.py) within the status/category filters.
+    Results are ranked best first; their cursors are page offsets.
+
+    Read-only: resolved items older than ARCHIVE_AFTER_DAYS are reported as
+    'archived' by the query itself; the background sweep persists it.
+
+    Delta sync: since=<sync_cursor> returns only what changed after that
+    cursor within the same category/status view (see _issuehub_delta).
+    Full responses carry "sync_cursor" to start from.
+
+    Sends an ETag; If-None-Match with the current one gets a bare 304.
     """
     db = _get_db()
-    # auto-move old resolved → archived (14 days)
+    if request.args.get("since"):
+        return _issuehub_delta(db)
+    paged = wants_page(request.args)
+    q = (request.args.get("q") or "").strip()
+    if not search_terms(q):
+        q = ""
     try:
-        auto_archive_resolved(db, 14)
-    except Exception:
-        # don’t block listing if cleanup hiccups
-        pass
+        fields = parse_fields(request.args.get("fields"), ITEM_FIELDS)
+        cursor = request.args.get("cursor")
+        after = decode_cursor(cursor) if cursor and not q else None
+        offset = int(decode_cursor(cursor, size=1)[0]) if cursor and q else 0
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e) or "invalid cursor"}), 400
+    limit = parse_limit(request.args.get("limit")) if paged else None
+
+    # unchanged since the client's copy -> 304 without running the list query
+    # (the resolved -> archived rollover shows up once the sweep persists it)
+    etag, unchanged = not_modified(db, "issuehub_issues")
+    if unchanged:
+        return unchanged
+
+    # projection: requested columns + what the cursor needs
+    if fields is None:
+        cols = list(ITEM_COLUMNS)
+    else:
+        if "id" not in fields:
+            fields = ["id"] + fields
+        wanted = {"details" if f == "notes" else f for f in fields} | {"id", "created_at"}
+        cols = [c for c in ITEM_COLUMNS if c in wanted]
+
+    ph = "%s" if _is_pg(db) else "?"
     cur = db.cursor()
     try:
+        # taken before the list query: a write in between is re-sent, never lost
+        sync_cursor = encode_cursor(latest_seq(db, "issuehub_issues"))
         category = request.args.get("category")
         status = (request.args.get("status") or "all").strip().lower()
-
-        base = (
-            "SELECT id, category, title, details, location, priority, status, resolution, "
-            "reporter, assignee, target_date, created_at, updated_at, resolved_at, deleted_at "
-            "FROM issuehub_issues"
-        )
-        where = []
-        params = []
-
-        if status == "trash":
-            where.append("deleted_at IS NOT NULL")
-        else:
-            where.append("deleted_at IS NULL")
-            if status == "all":
-                where.append("status IN ('open','in_progress')")
-            else:
-                where.append("status = %s" if _is_pg(db) else "status = ?")
-                params.append(status)
+        threshold = _archive_threshold()
+
+        select_sql, params = _status_select(cols, ph, threshold)
+        base = f"SELECT {select_sql} FROM issuehub_issues"
+        where, where_params = _status_where(status, ph, threshold)
+        hits = search_join(db, "issuehub_issues", q) if q else None
+        if hits:
+            base += " " + hits[0]
+            params.extend(hits[1])
+        elif q:
+            # no search index in this process: plain substring match
+            like = f"%{q.lower()}%"
+            where.append("(" + " OR ".join(
+                f"LOWER(COALESCE({c}, '')) LIKE {ph}"
+                for c in ("title", "details", "location", "resolution")) + ")")
+            where_params.extend([like] * 4)
+        params.extend(where_params)
 
         if category:
-            where.append("category = %s" if _is_pg(db) else "category = ?")
+            where.append(f"category = {ph}")
             params.append(category)
 
+        if after:
+            where.append(f"(created_at < {ph} OR (created_at = {ph} AND id < {ph}))")
+            params.extend([after[0], after[0], after[1]])
+
         if where:
             base += " WHERE " + " AND ".join(where)
-        base += " ORDER BY created_at DESC"
+        if hits:
+            base += " ORDER BY hits.score DESC, created_at DESC, id DESC"
+        else:
+            base += " ORDER BY created_at DESC, id DESC"
+        if limit:
+            base += f" LIMIT {limit + 1}"
+            if q:
+                base += f" OFFSET {offset}"
 
         cur.execute(base, tuple(params))
         rows = cur.fetchall()
 
+        if not paged:
+            return with_etag(jsonify({
+                "items": [_item_from_row(cols, r) for r in rows],
+                "sync_cursor": sync_cursor,
+            }), etag)
+
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            if q:
+                next_cursor = encode_cursor(offset + limit)
+            else:
+                last = dict(zip(cols, rows[-1]))
+                next_cursor = encode_cursor(last["created_at"], last["id"])
+        return with_etag(jsonify({
+            "items": [_item_from_row(cols, r, fields) for r in rows],
+            "next_cursor": next_cursor,
+            "sync_cursor": sync_cursor,
+        }), etag)
+    finally:
+        cur.close()
+
+
+def _issuehub_delta(db):
+    """
+    GET /api/issuehub/list?since=<sync_cursor>[&category=..&status=..]
+    Response: {"items": [...], "removed": [ids], "sync_cursor": "<token>",
+               "more": bool, "reset": bool}
+    - items:   rows changed after the cursor that are in the view now
+               (created, updated, trashed/restored into it)
+    - removed: ids to drop - hard-deleted (change_log tombstones), or
+               changed so they left the view (trashed, resolved, moved)
+    - more:    call again at once with the new cursor (big backlog)
+    - reset:   the change log no longer reaches back that far -> reload in full
+    A resolved item passing ARCHIVE_AFTER_DAYS shows up once the sweep persists it.
+    """
+    try:
+        seq = int(decode_cursor(request.args["since"], size=1)[0])
+    except (TypeError, ValueError):
+        return jsonify({"error": "invalid since cursor"}), 400
+
+    etag, unchanged = not_modified(db, "issuehub_issues")
+    if unchanged:
+        return unchanged
+
+    ph = "%s" if _is_pg(db) else "?"
+    cur = db.cursor()
+    try:
+        delta = delta_since(db, "issuehub_issues", seq)
         items = []
-        for r in rows:
-            items.append({
-                "id": r[0],
-                "category": r[1],
-                "title": r[2],
-                "details": r[3],
-                "notes": r[3],
-                "location": r[4],
-                "priority": r[5],
-                "status": r[6],
-                "resolution": r[7],
-                "reporter": r[8],
-                "assignee": r[9],
-                "target_date": (str(r[10]) if r[10] else None),
-                "created_at": str(r[11]),
-                "updated_at": str(r[12]),
-                "resolved_at": (str(r[13]) if r[13] else None),
-                "deleted_at": (str(r[14]) if r[14] else None),
-            })
-        return jsonify({"items": items})
+        if delta["ids"]:
+            category = request.args.get("category")
+            status = (request.args.get("status") or "all").strip().lower()
+            threshold = _archive_threshold()
+            select_sql, sel_params = _status_select(ITEM_COLUMNS, ph, threshold)
+            where, where_params = _status_where(status, ph, threshold)
+            if category:
+                where.append(f"category = {ph}")
+                where_params.append(category)
+            for chunk in _chunks(delta["ids"]):
+                cur.execute(
+                    f"SELECT {select_sql} FROM issuehub_issues WHERE {' AND '.join(where)} "
+                    f"AND id IN ({', '.join([ph] * len(chunk))})",
+                    tuple(sel_params) + tuple(where_params) + tuple(chunk),
+                )
+                items.extend(_item_from_row(ITEM_COLUMNS, r) for r in cur.fetchall())
+        present = {it["id"] for it in items}
+        return with_etag(jsonify({
+            "items": items,
+            "removed": [i for i in delta["ids"] if i not in present],
+            "sync_cursor": encode_cursor(delta["seq"]),
+            "more": delta["more"],
+            "reset": delta["reset"],
+        }), etag)
+    except Exception as e:
+        db.rollback()
+        return jsonify({"error": f"delta failed: {e}"}), 500
     finally:
         cur.close()
 
@@ -256,13 +507,6 @@ def issuehub_by_game():
     - trash shows only deleted items
     """
     db = _get_db()
-
-    # tiny safety: auto-archive old resolved first
-    try:
-        auto_archive_resolved(db, 14)
-    except Exception:
-        pass
-
     cur = db.cursor()
     try:
         location = (request.args.get("location") or "").strip()
@@ -270,32 +514,24 @@ def issuehub_by_game():
         if not location:
             return jsonify({"items": []})  # no game picked yet
 
-        base = (
-            "SELECT id, category, title, details, location, priority, status, resolution, "
-            "reporter, assignee, target_date, created_at, updated_at, resolved_at, deleted_at "
-            "FROM issuehub_issues"
-        )
+        ph = "%s" if _is_pg(db) else "?"
+        threshold = _archive_threshold()
+        select_sql, params = _status_select(ITEM_COLUMNS, ph, threshold)
+        base = f"SELECT {select_sql} FROM issuehub_issues"
         where = []
-        params = []
 
         # only gameroom items
-        where.append("category = %s" if _is_pg(db) else "category = ?")
+        where.append(f"category = {ph}")
         params.append("gameroom")
 
         # match exact location (you type it from the games list)
-        where.append("LOWER(TRIM(COALESCE(location,''))) = " + ("%s" if _is_pg(db) else "?"))
+        where.append(f"LOWER(TRIM(COALESCE(location,''))) = {ph}")
         params.append(location.lower().strip())
 
-        # trash vs normal
-        if status == "trash":
-            where.append("deleted_at IS NOT NULL")
-        else:
-            where.append("deleted_at IS NULL")
-            if status == "all":
-                where.append("status IN ('open','in_progress')")
-            else:
-                where.append("status = " + ("%s" if _is_pg(db) else "?"))
-                params.append(status)
+        # trash vs normal (archive rule applied in the query)
+        status_where, status_params = _status_where(status, ph, threshold)
+        where.extend(status_where)
+        params.extend(status_params)
 
         if where:
             base += " WHERE " + " AND ".join(where)
@@ -303,86 +539,116 @@ def issuehub_by_game():
 
         cur.execute(base, tuple(params))
         rows = cur.fetchall()
-
-        items = []
-        for r in rows:
-            items.append({
-                "id": r[0],
-                "category": r[1],
-                "title": r[2],
-                "details": r[3],
-                "notes": r[3],  # alias for frontend
-                "location": r[4],
-                "priority": r[5],
-                "status": r[6],
-                "resolution": r[7],
-                "reporter": r[8],
-                "assignee": r[9],
-                "target_date": (str(r[10]) if r[10] else None),
-                "created_at": str(r[11]),
-                "updated_at": str(r[12]),
-                "resolved_at": (str(r[13]) if r[13] else None),
-                "deleted_at": (str(r[14]) if r[14] else None),
-            })
-        return jsonify({"items": items})
+        return jsonify({"items": [_item_from_row(ITEM_COLUMNS, r) for r in rows]})
     finally:
         cur.close()
 
 
 
-@issue_hub_bp.route("/api/issuehub/create", methods=["POST"])
-def issuehub_create():
+# -------- duplicate-detection keys -----------------------------------------
+# Titles/locations are normalized once on write into title_key/location_key,
+# and title keys are split into 3-grams in issuehub_title_grams.
+# A create then only compares against rows with the same location_key
+# that share at least one gram (or the exact title_key).
+_RE_NUMBER_WORD = re.compile(r'\b(?:no\.?|num(?:ber)?)\s*([0-9]+)\b')
+_RE_HASH_NUMBER = re.compile(r'#\s*([0-9]+)\b')
+_RE_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_RE_SPACES = re.compile(r'\s+')
+
+GRAM_SIZE = 3
+_MAX_GRAM_PARAMS = 800  # skip gram pruning rather than blow the param limit
+
+
+def _key(s: str) -> str:
+    """Normalize a title/location for duplicate matching ('Skee #3' == 'skee no. 3')."""
+    if not s:
+        return ""
+    s = unicodedata.normalize("NFKD", s)
+    s = s.encode("ascii", "ignore").decode("ascii")
+    s = s.lower().strip()
+    s = _RE_NUMBER_WORD.sub(r'\1', s)
+    s = _RE_HASH_NUMBER.sub(r'\1', s)
+    s = _RE_NON_ALNUM.sub(' ', s)
+    s = _RE_SPACES.sub('', s)
+    return s
+
+
+def _similar(a: str, b: str) -> bool:
+    if not a or not b:
+        return False
+    if a == b:
+        return True
+    if (len(a) >= 4 and len(b) >= 4) and (a in b or b in a):
+        return True
+    return difflib.SequenceMatcher(None, a, b).ratio() >= 0.92
+
+
+def _grams(title_key: str):
+    """3-grams of a title key (short keys are their own single gram)."""
+    if len(title_key) < GRAM_SIZE:
+        return {title_key} if title_key else set()
+    return {title_key[i:i + GRAM_SIZE] for i in range(len(title_key) - GRAM_SIZE + 1)}
+
+
+def _write_grams(cur, ph, rows):
     """
-    POST JSON:
-    {
-      "category": "gameroom" | "facility" | "attraction",
-      "title": "text",
-      "details": "text?" OR "notes": "text?",
-      "location": "text?",
-      "priority": "low|medium|high" (default medium),
-      "reporter": "text?",
-      "assignee": "text?",
-      "status": "open" | "in_progress" (optional; defaults to open),
-      "target_date": "YYYY-MM-DD" or ISO datetime (optional),
-      "allow_duplicate": true|false  <-- if true, skip dupe check
-    }
+    (Re)index titles. rows = [(issue_id, title_key), ...].
+    Runs on the caller's cursor so it commits with the item itself.
     """
-    import re, unicodedata, difflib
-    from datetime import datetime
-
-    def _key(s: str) -> str:
-        if not s:
-            return ""
-        s = unicodedata.normalize("NFKD", s)
-        s = s.encode("ascii", "ignore").decode("ascii")
-        s = s.lower().strip()
-        s = re.sub(r'\b(?:no\.?|num(?:ber)?)\s*([0-9]+)\b', r'\1', s)
-        s = re.sub(r'#\s*([0-9]+)\b', r'\1', s)
-        s = re.sub(r'[^a-z0-9]+', ' ', s)
-        s = re.sub(r'\s+', '', s)
-        return s
-
-    def _similar(a: str, b: str) -> bool:
-        if not a or not b:
-            return False
-        if a == b:
-            return True
-        if (len(a) >= 4 and len(b) >= 4) and (a in b or b in a):
-            return True
-        import difflib as _dl
-        return _dl.SequenceMatcher(None, a, b).ratio() >= 0.92
+    if not rows:
+        return
+    for i in range(0, len(rows), 400):
+        ids = [r[0] for r in rows[i:i + 400]]
+        cur.execute(
+            f"DELETE FROM issuehub_title_grams WHERE issue_id IN ({', '.join([ph] * len(ids))})",
+            tuple(ids),
+        )
+    cur.executemany(
+        f"INSERT INTO issuehub_title_grams (gram, issue_id) VALUES ({ph}, {ph})",
+        [(g, issue_id) for issue_id, t_key in rows for g in _grams(t_key)],
+    )
 
-    db = _get_db()
-    data = request.get_json(silent=True) or {}
 
-    # ---- validate + normalize ----
+def _backfill_dedupe_keys(db, batch=500):
+    """Compute title_key/location_key (+ grams) for rows that don't have them yet."""
+    ph = "%s" if _is_pg(db) else "?"
+    cur = db.cursor()
+    try:
+        while True:
+            cur.execute(
+                f"SELECT id, title, location FROM issuehub_issues "
+                f"WHERE title_key IS NULL LIMIT {batch}"
+            )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            keyed = [(_key(t), _key(loc or ""), i) for i, t, loc in rows]
+            cur.executemany(
+                f"UPDATE issuehub_issues SET title_key = {ph}, location_key = {ph} WHERE id = {ph}",
+                keyed,
+            )
+            _write_grams(cur, ph, [(i, t_key) for t_key, _, i in keyed])
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: Issue Hub dedupe backfill skipped: {e}")
+    finally:
+        cur.close()
+
+
+# -------- create helpers (shared by create + bulk_create) ------------------
+def _normalize_new_item(data):
+    """
+    Validate + normalize one create payload.
+    Returns (item, None) or (None, "error message").
+    """
     category = (data.get("category") or "").strip().lower()
     title    = (data.get("title") or "").strip()
     # NEW: The category validation check has been updated to include 'attraction'
     if category not in ("gameroom", "facility", "attraction"):
-        return jsonify({"error": "category must be 'gameroom', 'facility', or 'attraction'"}), 400
+        return None, "category must be 'gameroom', 'facility', or 'attraction'"
     if not title:
-        return jsonify({"error": "title is required"}), 400
+        return None, "title is required"
 
     raw_details = data.get("notes", data.get("details", ""))
     details  = (raw_details or "").strip() or None
@@ -402,84 +668,156 @@ def issuehub_create():
     raw_td = (data.get("target_date") or "").strip()
     target_date = raw_td or None  # DB parses; blank -> NULL
 
-    allow_duplicate = bool(data.get("allow_duplicate", False))
+    return {
+        "category": category,
+        "title": title,
+        "details": details,
+        "location": location,
+        "priority": priority,
+        "status": status,
+        "reporter": reporter,
+        "assignee": assignee,
+        "target_date": target_date,
+        "title_key": _key(title),
+        "location_key": _key(location or ""),
+        "allow_duplicate": bool(data.get("allow_duplicate", False)),
+    }, None
+
+
+def _open_candidates(db, items):
+    """
+    One query for the duplicate scan of `items` (normalized create payloads):
+    open/in_progress, non-deleted rows with the same category + location_key
+    that share a title gram (or the exact title_key) with any item.
+    Returns {(category, location_key): [(id, title_key), ...]}.
+    """
+    out = {}
+    if not items:
+        return out
+    ph = "%s" if _is_pg(db) else "?"
+    pairs = sorted({(it["category"], it["location_key"]) for it in items})
+    grams = sorted(set().union(*(_grams(it["title_key"]) for it in items)))
+    t_keys = sorted({it["title_key"] for it in items})
+
+    where = " OR ".join([f"(category = {ph} AND location_key = {ph})"] * len(pairs))
+    params = [v for pair in pairs for v in pair]
+    sql = (
+        f"SELECT id, category, location_key, title_key FROM issuehub_issues "
+        f"WHERE deleted_at IS NULL AND status IN ('open','in_progress') AND ({where})"
+    )
+    if grams and len(grams) + len(params) <= _MAX_GRAM_PARAMS:
+        sql += (
+            f" AND (title_key IN ({', '.join([ph] * len(t_keys))})"
+            f" OR id IN (SELECT issue_id FROM issuehub_title_grams"
+            f" WHERE gram IN ({', '.join([ph] * len(grams))})))"
+        )
+        params += t_keys + grams
+
+    cur = db.cursor()
+    try:
+        cur.execute(sql, tuple(params))
+        for existing_id, cat, l_key, t_key in cur.fetchall():
+            out.setdefault((cat, l_key), []).append((existing_id, t_key))
+    finally:
+        cur.close()
+    return out
+
+
+def _find_duplicate(item, candidates):
+    """Return the id of a very-similar candidate ([(id, title_key), ...]), or None."""
+    for existing_id, ex_t_key in candidates:
+        if _similar(ex_t_key, item["title_key"]):
+            return existing_id
+    return None
+
+
+_INSERT_SQL = """
+    INSERT INTO issuehub_issues
+    (id, category, title, details, location, priority, status, resolution,
+     reporter, assignee, target_date, created_at, updated_at, resolved_at, deleted_at,
+     title_key, location_key)
+    VALUES
+    ({ph},{ph},{ph},{ph},{ph},{ph},{ph},NULL,{ph},{ph},{ph},{ph},{ph},NULL,NULL,{ph},{ph})
+"""
+
+
+def _insert_params(new_id, item, now):
+    return (new_id, item["category"], item["title"], item["details"], item["location"],
+            item["priority"], item["status"], item["reporter"], item["assignee"],
+            item["target_date"], now, now, item["title_key"], item["location_key"])
+
+
+def _created_payload(new_id, item, now):
+    return {
+        "id": new_id,
+        "category": item["category"],
+        "title": item["title"],
+        "details": item["details"],
+        "location": item["location"],
+        "priority": item["priority"],
+        "status": item["status"],
+        "resolution": None,
+        "reporter": item["reporter"],
+        "assignee": item["assignee"],
+        "target_date": item["target_date"],
+        "created_at": now.isoformat(),
+        "updated_at": now.isoformat(),
+        "resolved_at": None,
+        "deleted_at": None,
+    }
 
-    # ---- improved duplicate stopper (unless overridden) ----
-    if not allow_duplicate:
-        t_key = _key(title)
-        l_key = _key(location or "")
 
-        ph = "%s" if _is_pg(db) else "?"
-        cur = db.cursor()
-        try:
-            cur.execute(
-                f"""
-                SELECT id, title, COALESCE(location,'')
-                FROM issuehub_issues
-                WHERE deleted_at IS NULL
-                  AND status IN ('open','in_progress')
-                  AND category = {ph}
-                """,
-                (category,)
-            )
-            for existing_id, ex_title, ex_loc in cur.fetchall():
-                if _key(ex_loc) == l_key and _similar(_key(ex_title), t_key):
-                    return jsonify({
-                        "error": "duplicate_issue",
-                        "message": "A very similar issue for this equipment is already open.",
-                        "existing_id": existing_id
-                    }), 409
-        finally:
-            cur.close()
+@issue_hub_bp.route("/api/issuehub/create", methods=["POST"])
+def issuehub_create():
+    """
+    POST JSON:
+    {
+      "category": "gameroom" | "facility" | "attraction",
+      "title": "text",
+      "details": "text?" OR "notes": "text?",
+      "location": "text?",
+      "priority": "low|medium|high" (default medium),
+      "reporter": "text?",
+      "assignee": "text?",
+      "status": "open" | "in_progress" (optional; defaults to open),
+      "target_date": "YYYY-MM-DD" or ISO datetime (optional),
+      "allow_duplicate": true|false  <-- if true, skip dupe check
+    }
+    """
+    db = _get_db()
+    data = request.get_json(silent=True) or {}
+
+    # ---- validate + normalize ----
+    item, error = _normalize_new_item(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    # ---- improved duplicate stopper (unless overridden) ----
+    if not item["allow_duplicate"]:
+        candidates = _open_candidates(db, [item])
+        existing_id = _find_duplicate(
+            item, candidates.get((item["category"], item["location_key"]), [])
+        )
+        if existing_id:
+            return jsonify({
+                "error": "duplicate_issue",
+                "message": "A very similar issue for this equipment is already open.",
+                "existing_id": existing_id
+            }), 409
 
     # ---- insert ----
     now = datetime.utcnow()
     new_id = next_id(db)
 
+    ph = "%s" if _is_pg(db) else "?"
     cur = db.cursor()
     try:
-        if _is_pg(db):
-            cur.execute(
-                """
-                INSERT INTO issuehub_issues
-                (id, category, title, details, location, priority, status, resolution,
-                 reporter, assignee, target_date, created_at, updated_at, resolved_at, deleted_at)
-                VALUES
-                (%s,%s,%s,%s,%s,%s,%s,NULL,%s,%s,%s,%s,%s,NULL,NULL)
-                """,
-                (new_id, category, title, details, location, priority,
-                 status, reporter, assignee, target_date, now, now),
-            )
-        else:
-            cur.execute(
-                """
-                INSERT INTO issuehub_issues
-                (id, category, title, details, location, priority, status, resolution,
-                 reporter, assignee, target_date, created_at, updated_at, resolved_at, deleted_at)
-                VALUES
-                (?,?,?,?,?,?,?,NULL,?,?,?, ?, ?, NULL, NULL)
-                """,
-                (new_id, category, title, details, location, priority,
-                 status, reporter, assignee, target_date, now, now),
-            )
+        cur.execute(_INSERT_SQL.format(ph=ph), _insert_params(new_id, item, now))
+        _write_grams(cur, ph, [(new_id, item["title_key"])])
+        log_change(db, "issuehub_issues", new_id, "insert")
+        bump_table_version(db, "issuehub_issues")
         db.commit()
-        return jsonify({
-            "id": new_id,
-            "category": category,
-            "title": title,
-            "details": details,
-            "location": location,
-            "priority": priority,
-            "status": status,
-            "resolution": None,
-            "reporter": reporter,
-            "assignee": assignee,
-            "target_date": target_date,
-            "created_at": now.isoformat(),
-            "updated_at": now.isoformat(),
-            "resolved_at": None,
-            "deleted_at": None,
-        }), 201
+        return jsonify(_created_payload(new_id, item, now)), 201
     except Exception as e:
         db.rollback()
         return jsonify({"error": f"failed to create: {e}"}), 500
@@ -487,8 +825,112 @@ def issuehub_create():
         cur.close()
 
 
+BULK_CREATE_MAX = 200
+
+
+@issue_hub_bp.route("/api/issuehub/bulk_create", methods=["POST"])
+def issuehub_bulk_create():
+    """
+    POST JSON:
+    {
+      "items": [ {same fields as /api/issuehub/create}, ... ],   (max 200)
+      "allow_duplicate": true|false   (default for items that don't set it)
+    }
+    One duplicate-scan query, one id reservation and one transaction for the
+    whole batch. Items that repeat an earlier item in the same batch count
+    as duplicates too.
+
+    Response: {
+      "results": [
+        {"index": 0, "result": "created",   "id": "IH010", "item": {...}},
+        {"index": 1, "result": "duplicate", "existing_id": "IH004"},
+        {"index": 2, "result": "invalid",   "error": "title is required"}
+      ],
+      "created": 1, "duplicates": 1, "invalid": 1
+    }
+    """
+    db = _get_db()
+    data = request.get_json(silent=True) or {}
+    raw_items = data.get("items")
+    if not isinstance(raw_items, list) or not raw_items:
+        return jsonify({"error": "items must be a non-empty list"}), 400
+    if len(raw_items) > BULK_CREATE_MAX:
+        return jsonify({"error": f"at most {BULK_CREATE_MAX} items per request"}), 400
+    default_allow = bool(data.get("allow_duplicate", False))
+
+    # ---- validate + normalize ----
+    results = [None] * len(raw_items)
+    valid = []  # (index, item)
+    for i, raw in enumerate(raw_items):
+        if not isinstance(raw, dict):
+            results[i] = {"index": i, "result": "invalid", "error": "item must be an object"}
+            continue
+        if "allow_duplicate" not in raw:
+            raw = {**raw, "allow_duplicate": default_allow}
+        item, error = _normalize_new_item(raw)
+        if error:
+            results[i] = {"index": i, "result": "invalid", "error": error}
+        else:
+            valid.append((i, item))
+
+    # ---- duplicate scan (one query for every category in the batch) ----
+    candidates = _open_candidates(db, [it for _, it in valid if not it["allow_duplicate"]])
+    to_create = []
+    batch_seen = {}  # (category, location_key) -> [(index, title_key)] of earlier items
+    for i, item in valid:
+        if not item["allow_duplicate"]:
+            scope = (item["category"], item["location_key"])
+            existing_id = _find_duplicate(item, candidates.get(scope, []))
+            if existing_id:
+                results[i] = {"index": i, "result": "duplicate", "existing_id": existing_id}
+                continue
+            earlier = _find_duplicate(item, batch_seen.get(scope, []))
+            if earlier is not None:
+                # filled in with the earlier item's new id below
+                results[i] = {"index": i, "result": "duplicate", "existing_index": earlier}
+                continue
+        batch_seen.setdefault((item["category"], item["location_key"]), []).append(
+            (i, item["title_key"])
+        )
+        to_create.append((i, item))
+
+    # ---- ids (one reservation) + insert (one transaction) ----
+    now = datetime.utcnow()
+    if to_create:
+        counters = ID_BLOCKS.take(db, "ih", len(to_create))
+        rows, gram_rows = [], []
+        for (i, item), counter in zip(to_create, counters):
+            new_id = f"IH{str(counter).zfill(3)}"
+            rows.append(_insert_params(new_id, item, now))
+            gram_rows.append((new_id, item["title_key"]))
+            results[i] = {"index": i, "result": "created", "id": new_id,
+                          "item": _created_payload(new_id, item, now)}
+
+        ph = "%s" if _is_pg(db) else "?"
+        cur = db.cursor()
+        try:
+            cur.executemany(_INSERT_SQL.format(ph=ph), rows)
+            _write_grams(cur, ph, gram_rows)
+            log_change(db, "issuehub_issues", [r[0] for r in gram_rows], "insert")
+            bump_table_version(db, "issuehub_issues")
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            return jsonify({"error": f"bulk create failed: {e}"}), 500
+        finally:
+            cur.close()
 
+    for r in results:
+        if r["result"] == "duplicate" and "existing_index" in r:
+            r["existing_id"] = results[r.pop("existing_index")]["id"]
 
+    created = sum(1 for r in results if r["result"] == "created")
+    return jsonify({
+        "results": results,
+        "created": created,
+        "duplicates": sum(1 for r in results if r["result"] == "duplicate"),
+        "invalid": sum(1 for r in results if r["result"] == "invalid"),
+    }), (201 if created else 200)
 
 
 @issue_hub_bp.route("/api/issuehub/update_status", methods=["POST"])
@@ -579,6 +1021,8 @@ def issuehub_update_status():
             db.commit()
             return jsonify({"error": f"no issue found with id {issue_id}"}), 404
 
+        log_change(db, "issuehub_issues", issue_id, "update")
+        bump_table_version(db, "issuehub_issues")
         db.commit()
         return jsonify({"ok": True, "id": issue_id, "status": status})
     except Exception as e:
@@ -608,6 +1052,8 @@ def issuehub_trash():
         if cur.rowcount == 0:
             db.commit()
             return jsonify({"error": "not found (or already in Trash)"}), 404
+        log_change(db, "issuehub_issues", issue_id, "update")
+        bump_table_version(db, "issuehub_issues")
         db.commit()
         return jsonify({"ok": True, "id": issue_id})
     except Exception as e:
@@ -639,6 +1085,8 @@ def issuehub_restore():
         if cur.rowcount == 0:
             db.commit()
             return jsonify({"error": "not found (or not in Trash)"}), 404
+        log_change(db, "issuehub_issues", issue_id, "update")
+        bump_table_version(db, "issuehub_issues")
         db.commit()
         return jsonify({"ok": True, "id": issue_id})
     except Exception as e:
@@ -647,6 +1095,31 @@ def issuehub_restore():
     finally:
         cur.close()
 
+def _field_patch(data):
+    """Allowlisted, normalized column -> value map from an update_fields payload."""
+    fields_map = {}
+    if "title" in data:        fields_map["title"]   = (data["title"] or "").strip()
+    # notes -> details
+    if "notes" in data:        fields_map["details"] = (data["notes"] or "").strip()
+    if "details" in data and not fields_map.get("details"):
+        fields_map["details"] = (data["details"] or "").strip()
+    if "location" in data:     fields_map["location"] = (data["location"] or "").strip()
+    if "priority" in data:
+        pr = (data["priority"] or "").strip().lower()
+        if pr in ("low", "medium", "high"):
+            fields_map["priority"] = pr
+    if "assignee" in data:     fields_map["assignee"] = (data["assignee"] or "").strip()
+    if "target_date" in data:
+        td = (data["target_date"] or "").strip()
+        fields_map["target_date"] = (td or None)
+    # keep the duplicate-check keys in step with what they were built from
+    if "title" in fields_map:
+        fields_map["title_key"] = _key(fields_map["title"])
+    if "location" in fields_map:
+        fields_map["location_key"] = _key(fields_map["location"])
+    return fields_map
+
+
 @issue_hub_bp.route("/api/issuehub/update_fields", methods=["POST"])
 def issuehub_update_fields():
     """
@@ -669,21 +1142,7 @@ def issuehub_update_fields():
         return jsonify({"error": "id is required"}), 400
 
     # normalize + allowlist
-    fields_map = {}
-    if "title" in data:        fields_map["title"]   = (data["title"] or "").strip()
-    # notes -> details
-    if "notes" in data:        fields_map["details"] = (data["notes"] or "").strip()
-    if "details" in data and not fields_map.get("details"):
-        fields_map["details"] = (data["details"] or "").strip()
-    if "location" in data:     fields_map["location"] = (data["location"] or "").strip()
-    if "priority" in data:
-        pr = (data["priority"] or "").strip().lower()
-        if pr in ("low", "medium", "high"):
-            fields_map["priority"] = pr
-    if "assignee" in data:     fields_map["assignee"] = (data["assignee"] or "").strip()
-    if "target_date" in data:
-        td = (data["target_date"] or "").strip()
-        fields_map["target_date"] = (td or None)
+    fields_map = _field_patch(data)
 
     if not fields_map:
         return jsonify({"error": "no fields to update"}), 400
@@ -705,6 +1164,10 @@ def issuehub_update_fields():
         if cur.rowcount == 0:
             db.commit()
             return jsonify({"error": "not found (or in Trash)"}), 404
+        if "title_key" in fields_map:
+            _write_grams(cur, ph, [(issue_id, fields_map["title_key"])])
+        log_change(db, "issuehub_issues", issue_id, "update")
+        bump_table_version(db, "issuehub_issues")
         db.commit()
         return jsonify({"ok": True, "id": issue_id})
     except Exception as e:
@@ -714,6 +1177,161 @@ def issuehub_update_fields():
         cur.close()
 
 
+BULK_UPDATE_MAX = 500
+_IN_CHUNK = 400  # stay under SQLite's bound-parameter limit
+
+
+def _chunks(seq, size=_IN_CHUNK):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+@issue_hub_bp.route("/api/issuehub/bulk_update", methods=["POST"])
+def issuehub_bulk_update():
+    """
+    POST JSON, either one patch for many ids:
+    {
+      "ids": ["IH001", "IH002"],
+      "status": "open|in_progress|resolved|archived"   (optional),
+      "resolution": "text (required when status='resolved')",
+      "fields": { same keys as /api/issuehub/update_fields }  (optional)
+    }
+    or a patch per id:
+    {
+      "items": [ {"id": "IH001", "status": "resolved", "resolution": "..."},
+                 {"id": "IH002", "priority": "high", "assignee": "Sam"} ]
+    }
+    Items with the same patch are applied as one UPDATE ... WHERE id IN (...),
+    all inside one transaction. Trashed items are treated as not found.
+
+    Response: {
+      "results": [{"id": "IH001", "result": "updated"},
+                  {"id": "IH002", "result": "not_found"},
+                  {"id": "IH003", "result": "invalid", "error": "..."}],
+      "updated": 1, "not_found": 1, "invalid": 1
+    }
+    """
+    db = _get_db()
+    data = request.get_json(silent=True) or {}
+
+    # ---- expand to one patch per id ----
+    if isinstance(data.get("items"), list):
+        patches = []
+        for raw in data["items"]:
+            if not isinstance(raw, dict):
+                patches.append({"id": "", "_invalid": "item must be an object"})
+                continue
+            patches.append({**{k: v for k, v in raw.items() if k != "fields"},
+                            **(raw.get("fields") or {})})
+    elif isinstance(data.get("ids"), list):
+        shared = {k: v for k, v in data.items() if k in ("status", "resolution")}
+        shared.update(data.get("fields") or {})
+        patches = [{**shared, "id": i} for i in data["ids"]]
+    else:
+        return jsonify({"error": "send 'ids' + patch or 'items'"}), 400
+
+    if not patches:
+        return jsonify({"error": "nothing to update"}), 400
+    if len(patches) > BULK_UPDATE_MAX:
+        return jsonify({"error": f"at most {BULK_UPDATE_MAX} items per request"}), 400
+
+    # ---- validate each patch (same rules as the single-item endpoints) ----
+    results = []
+    wanted = {}  # id -> position in results
+    groups = {}  # patch signature -> [ids]
+    for p in patches:
+        issue_id = str(p.get("id") or "").strip()
+        status = (p.get("status") or "").strip().lower() or None
+        resolution = p.get("resolution") or None
+        fields_map = _field_patch(p)
+        error = p.get("_invalid")
+        if not error and not issue_id:
+            error = "id is required"
+        elif not error and issue_id in wanted:
+            error = "id appears more than once"
+        elif not error and status and status not in ("open", "in_progress", "resolved", "archived"):
+            error = "invalid status"
+        elif not error and status == "resolved" and (not resolution or not str(resolution).strip()):
+            error = "resolution text required to resolve"
+        elif not error and not status and not fields_map:
+            error = "no fields to update"
+        if error:
+            results.append({"id": issue_id or None, "result": "invalid", "error": error})
+            continue
+
+        sig = (status, resolution if status == "resolved" else None,
+               tuple(sorted(fields_map.items())))
+        groups.setdefault(sig, []).append(issue_id)
+        wanted[issue_id] = len(results)
+        results.append(None)  # decided below
+
+    ph = "%s" if _is_pg(db) else "?"
+    now = datetime.utcnow()
+
+    cur = db.cursor()
+    try:
+        # which ids exist (and are not in Trash)?
+        found = set()
+        for chunk in _chunks(list(wanted)):
+            cur.execute(
+                f"SELECT id FROM issuehub_issues WHERE deleted_at IS NULL "
+                f"AND id IN ({', '.join([ph] * len(chunk))})",
+                tuple(chunk),
+            )
+            found.update(r[0] for r in cur.fetchall())
+
+        # one set-based UPDATE per distinct patch
+        for (status, resolution, fields_items), ids in groups.items():
+            ids = [i for i in ids if i in found]
+            if not ids:
+                continue
+            sets, vals = [], []
+            for k, v in fields_items:
+                sets.append(f"{k} = {ph}")
+                vals.append(v)
+            if status:
+                sets.append(f"status = {ph}")
+                vals.append(status)
+                if status == "resolved":
+                    sets.append(f"resolution = {ph}")
+                    vals.append(resolution)
+                    sets.append(f"resolved_at = {ph}")
+                    vals.append(now)
+                elif status == "open":
+                    sets.append("resolved_at = NULL")
+            sets.append(f"updated_at = {ph}")
+            vals.append(now)
+
+            for chunk in _chunks(ids):
+                cur.execute(
+                    f"UPDATE issuehub_issues SET {', '.join(sets)} "
+                    f"WHERE deleted_at IS NULL AND id IN ({', '.join([ph] * len(chunk))})",
+                    tuple(vals) + tuple(chunk),
+                )
+            title_key = dict(fields_items).get("title_key")
+            if title_key is not None:
+                _write_grams(cur, ph, [(i, title_key) for i in ids])
+        if found:  # nothing updated -> no version bump (caches/ETags stay valid)
+            log_change(db, "issuehub_issues", sorted(found), "update")
+            bump_table_version(db, "issuehub_issues")
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        return jsonify({"error": f"bulk update failed: {e}"}), 500
+    finally:
+        cur.close()
+
+    for issue_id, pos in wanted.items():
+        results[pos] = {"id": issue_id, "result": "updated" if issue_id in found else "not_found"}
+
+    return jsonify({
+        "results": results,
+        "updated": sum(1 for r in results if r["result"] == "updated"),
+        "not_found": sum(1 for r in results if r["result"] == "not_found"),
+        "invalid": sum(1 for r in results if r["result"] == "invalid"),
+    })
+
+
 # =========================
 # Employees API
 # =========================
@@ -856,6 +1474,9 @@ def issuehub_delete():
         if cur.rowcount == 0:
             db.commit()
             return jsonify({"error": "not found"}), 404
+        _write_grams(cur, "%s" if _is_pg(db) else "?", [(issue_id, "")])  # drop its grams
+        log_change(db, "issuehub_issues", issue_id, "delete")
+        bump_table_version(db, "issuehub_issues")
         db.commit()
         return jsonify({"ok": True, "id": issue_id})
     except Exception as e:
@@ -873,3 +1494,5 @@ def register_issue_hub_blueprint(app, get_db_fn, ensure_id_sequences_fn):
     with app.app_context():
         ensure_issuehub_tables(get_db_fn, ensure_id_sequences_fn)
     app.register_blueprint(issue_hub_bp)
+    # resolved → archived housekeeping, off the request path
+    start_periodic(app, "issuehub_archive", ARCHIVE_SWEEP_INTERVAL, _archive_sweep)
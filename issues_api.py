@@ -3,7 +3,8 @@
 # REST endpoints for Issues (list/create/update/delete, helpers).
 #
 # Routes:
-# - GET  /api/issues
+# - GET  /api/issues              (optional keyset paging: limit/cursor/fields;
+#                                   q= ranked full-text search, see search_index.py)
 # - POST /api/issues              (creates padded ID via id_sequences)
 # - PUT  /api/issues/<id>
 # - DELETE /api/issues/<id>
@@ -14,6 +15,21 @@
 
 from flask import jsonify, request
 
+from cache_utils import invalidate
+from table_versions import bump_table_version
+from change_log import log_change
+from id_allocator import ID_BLOCKS
+from search_index import search_join, search_terms
+from pagination import (
+    wants_page, parse_limit, parse_fields, encode_cursor, decode_cursor,
+)
+
+# columns of the legacy issues table, in SELECT order
+ISSUE_COLUMNS = [
+    "id", "priority", "date_logged", "last_updated", "area", "equipment_location",
+    "description", "notes", "status", "target_date", "assigned_to",
+]
+
 def register_issue_routes(app, get_db):
 
     # ---------- helpers ----------
@@ -22,62 +38,12 @@ def register_issue_routes(app, get_db):
 
     def get_next_padded_id(db, entity: str, width: int = 3, prefix: str = "IS-") -> str:
         """
-        Returns a new padded ID like 'IS-001' by incrementing id_sequences(entity).
-        Creates the table/row if missing (works on both engines).
+        Returns a new padded ID like 'IS-001' from id_sequences(entity).
+        The table is made by app.ensure_id_sequences at startup; counters are
+        handed out from a reserved block (see id_allocator.py).
         """
-        pg = is_postgres(db)
-        cur = db.cursor()
-        try:
-            # Ensure table exists
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS id_sequences (
-                    entity  TEXT PRIMARY KEY,
-                    counter INTEGER NOT NULL
-                );
-            """)
-            db.commit()
-
-            # Ensure row exists
-            if pg:
-                cur.execute(
-                    "INSERT INTO id_sequences (entity, counter) VALUES (%s, 0) "
-                    "ON CONFLICT (entity) DO NOTHING;",
-                    (entity,)
-                )
-            else:
-                cur.execute(
-                    "INSERT OR IGNORE INTO id_sequences (entity, counter) VALUES (?, 0);",
-                    (entity,)
-                )
-            db.commit()
-
-            # Bump and fetch
-            if pg:
-                cur.execute(
-                    "UPDATE id_sequences SET counter = counter + 1 WHERE entity = %s RETURNING counter;",
-                    (entity,)
-                )
-                new_counter = cur.fetchone()[0]
-            else:
-                cur.execute(
-                    "UPDATE id_sequences SET counter = counter + 1 WHERE entity = ?;",
-                    (entity,)
-                )
-                cur.execute(
-                    "SELECT counter FROM id_sequences WHERE entity = ?;",
-                    (entity,)
-                )
-                new_counter = cur.fetchone()[0]
-
-            db.commit()
-            return f"{prefix}{str(new_counter).zfill(width)}"
-        finally:
-            cur.close()
-
-    def safe_iso(val):
-        if val is None:
-            return None
-        return val.isoformat() if hasattr(val, "isoformat") else str(val)
+        new_counter = ID_BLOCKS.next(db, entity)
+        return f"{prefix}{str(new_counter).zfill(width)}"
 
     # ---------- routes ----------
     
@@ -110,6 +76,30 @@ def register_issue_routes(app, get_db):
                         'blocked': 'Blocked',
                     }
 
+                    # Paged mode: ?limit=&cursor=&fields= (keyset on date_logged, id).
+                    # Without those params the old bare-array response is kept.
+                    # With ?q= rows are ranked by full-text relevance and the
+                    # cursor is a page offset instead.
+                    paged = wants_page(request.args)
+                    if not search_terms(q_param):
+                        q_param = ''
+                    try:
+                        fields = parse_fields(request.args.get('fields'), ISSUE_COLUMNS)
+                        cursor = request.args.get('cursor')
+                        after = decode_cursor(cursor) if cursor and not q_param else None
+                        offset = int(decode_cursor(cursor, size=1)[0]) if cursor and q_param else 0
+                    except (TypeError, ValueError) as e:
+                        return jsonify({"error": str(e) or "invalid cursor"}), 400
+                    limit = parse_limit(request.args.get('limit')) if paged else None
+
+                    if fields is None:
+                        cols = list(ISSUE_COLUMNS)
+                    else:
+                        if 'id' not in fields:
+                            fields = ['id'] + fields
+                        wanted = set(fields) | {'id', 'date_logged'}
+                        cols = [c for c in ISSUE_COLUMNS if c in wanted]
+
                     filters, params = [], []
                     pg = is_postgres(db)
                     ph = '%s' if pg else '?'
@@ -124,39 +114,55 @@ def register_issue_routes(app, get_db):
                         filters.append(f"LOWER(area) = LOWER({ph})")
                         params.append(category_param)
 
-                    if q_param:
+                    hits = search_join(db, "issues", q_param) if q_param else None
+                    if q_param and not hits:
+                        # no search index in this process: substring match
                         like = f"%{q_param}%"
                         filters.append(
                             f"(LOWER(description) LIKE LOWER({ph}) OR LOWER(notes) LIKE LOWER({ph}) OR LOWER(equipment_location) LIKE LOWER({ph}))"
                         )
                         params.extend([like, like, like])
 
-                    sql = (
-                        "SELECT id, priority, date_logged, last_updated, area, equipment_location, "
-                        "description, notes, status, target_date, assigned_to "
-                        "FROM issues"
-                    )
+                    if after:
+                        filters.append(f"(date_logged < {ph} OR (date_logged = {ph} AND id < {ph}))")
+                        params.extend([after[0], after[0], after[1]])
+
+                    sql = f"SELECT {', '.join(cols)} FROM issues"
+                    if hits:
+                        sql += " " + hits[0]
+                        params[:0] = hits[1]  # join params come before the WHERE ones
                     if filters:
                         sql += " WHERE " + " AND ".join(filters)
-                    sql += " ORDER BY date_logged DESC;"
-
-                    cur.execute(sql, tuple(params))
+                    if hits:
+                        sql += " ORDER BY hits.score DESC, date_logged DESC, id DESC"
+                    else:
+                        sql += " ORDER BY date_logged DESC, id DESC"
+                    if limit:
+                        sql += f" LIMIT {limit + 1}"
+                        if q_param:
+                            sql += f" OFFSET {offset}"
+
+                    cur.execute(sql + ";", tuple(params))
                     rows = cur.fetchall()
+
+                    next_cursor = None
+                    if limit and len(rows) > limit:
+                        rows = rows[:limit]
+                        if q_param:
+                            next_cursor = encode_cursor(offset + limit)
+                        else:
+                            last = dict(zip(cols, rows[-1]))
+                            next_cursor = encode_cursor(last['date_logged'], last['id'])
+
                     out = []
                     for r in rows:
-                        out.append({
-                            "id": r[0],
-                            "priority": r[1],
-                            "date_logged": safe_iso(r[2]),
-                            "last_updated": safe_iso(r[3]),
-                            "area": r[4],
-                            "equipment_location": r[5],
-                            "description": r[6],
-                            "notes": r[7],
-                            "status": r[8],
-                            "target_date": safe_iso(r[9]),
-                            "assigned_to": r[10],
-                        })
+                        item = dict(zip(cols, r))  # dates -> ISO 8601 via app.json
+                        if fields is not None:
+                            item = {k: item[k] for k in fields}
+                        out.append(item)
+
+                    if paged:
+                        return jsonify({"items": out, "next_cursor": next_cursor})
                     return jsonify(out)
                 except Exception as e:
                     print(f"ERROR: GET /api/issues failed: {e}")
@@ -210,7 +216,10 @@ def register_issue_routes(app, get_db):
                     VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph});
                 """
                 cur.execute(sql, (issue_id, description, priority, status, area, equipment_location, notes, target_date, assigned_to))
+                log_change(db, "issues", issue_id, "insert")
+                bump_table_version(db, "issues")
                 db.commit()
+                invalidate("issues")
 
                 # Mirror to Issue Hub table (best-effort)
                 try:
@@ -243,6 +252,8 @@ def register_issue_routes(app, get_db):
                     cur2.execute(hub_sql, (
                         issue_id, description, priority, status, area, None, equipment_location, notes, target_date, assigned_to
                     ))
+                    log_change(db, "issuehub_issues", issue_id, "insert")
+                    bump_table_version(db, "issuehub_issues")
                     db.commit()
                     cur2.close()
                 except Exception as e:
@@ -288,7 +299,10 @@ def register_issue_routes(app, get_db):
                 if cur.rowcount == 0:
                     db.commit()
                     return jsonify({"error": "Issue not found"}), 404
+                log_change(db, "issues", issue_id, "update")
+                bump_table_version(db, "issues")
                 db.commit()
+                invalidate("issues")
                 return jsonify({"message": "Issue updated", "issue_id": issue_id})
             except Exception as e:
                 db.rollback()
@@ -312,7 +326,10 @@ def register_issue_routes(app, get_db):
                 if cur.rowcount == 0:
                     db.commit()
                     return jsonify({"error": "Issue not found"}), 404
+                log_change(db, "issues", issue_id, "delete")
+                bump_table_version(db, "issues")
                 db.commit()
+                invalidate("issues")
                 return jsonify({"message": "Issue deleted", "issue_id": issue_id})
             except Exception as e:
                 db.rollback()
@@ -405,9 +422,10 @@ def register_issue_routes(app, get_db):
         db = get_db()
         cur = db.cursor()
         try:
-            # Try to clear Issue Hub table
+            # Try to clear Issue Hub table (+ its duplicate-check grams)
             try:
                 cur.execute("DELETE FROM issuehub_issues;")
+                cur.execute("DELETE FROM issuehub_title_grams;")
             except Exception:
                 db.rollback()
                 cur = db.cursor()  # reset cursor if table missing
@@ -419,7 +437,11 @@ def register_issue_routes(app, get_db):
                 db.rollback()
                 cur = db.cursor()
 
+            log_change(db, "issues", "*", "reset")
+            log_change(db, "issuehub_issues", "*", "reset")
+            bump_table_version(db, "issues", "issuehub_issues")
             db.commit()
+            invalidate("issues", "issuehub_issues")
             return jsonify({"success": True, "message": "All issues cleared."}), 200
         except Exception as e:
             db.rollback()
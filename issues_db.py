@@ -6,14 +6,24 @@
 # - Creates id_sequences table (name TEXT PK, last_value INTEGER)
 # - Seeds a row for "issues" if missing
 # - Ensures the issues table exists with all expected columns
-# - Provides next_issue_id(db) -> "001" style string
+# - Provides next_issue_id(db) -> "001" style string (block-allocated)
+# - count_all_open_issues(db) / _debug_active_breakdown(db): SQL counts,
+#   cached until the issues table changes
 #
 # Connected files:
-# - app.py (calls ensure_issues_schema(db) during startup; uses next_issue_id on POST)
+# - app.py (calls ensure_issues_schema(db) during startup; uses next_issue_id on POST;
+#           /api/issues/count + /api/issues/_debug_counts)
+# - table_versions.py (issues change marker)
+# - legacy_import.py (moves data/issues.json into the issues table)
 # =========================================================================
 
+import threading
+
 from psycopg2 import sql
 
+from id_allocator import BlockIdAllocator
+from table_versions import table_versions
+
 def _is_postgres(db):
     """Heuristic: psycopg2 connections have 'dsn' attr."""
     return hasattr(db, 'dsn')
@@ -88,201 +98,112 @@ def ensure_issues_schema(db):
     finally:
         cur.close()
 
+# this module's id_sequences shape is (name, last_value)
+_ISSUE_IDS = BlockIdAllocator(key_col="name", value_col="last_value")
+
+
 def next_issue_id(db):
     """
-    Increment and return the next issue ID as a zero-padded string: "001", "002", ...
+    Return the next issue ID as a zero-padded string: "001", "002", ...
     Uses id_sequences where name='issues'. Works for SQLite and Postgres.
+    The counter is bumped atomically a block at a time (UPDATE ... RETURNING),
+    so there is no read-modify-write race between workers.
     """
-    is_pg = _is_postgres(db)
-    ph = '%s' if is_pg else '?'
-
+    new_val = _ISSUE_IDS.next(db, 'issues')
+    return f"{new_val:03d}"
+
+
+# ---------------------------------------------------------------------------
+# Open-issue count (/api/issues/count) + debug breakdown
+# DB-only: data/issues.json is imported once by legacy_import.py, so the
+# file is never read on a request. Results are cached per process until the
+# issues table_versions marker changes (any worker's write bumps it).
+# ---------------------------------------------------------------------------
+CLOSED_LIKE = ('closed', 'archived', 'resolved')
+# Active = status NOT in CLOSED_LIKE (empty = active), as SQL
+_STATUS_SQL = "LOWER(TRIM(COALESCE(status, '')))"
+_ACTIVE_SQL = f"{_STATUS_SQL} NOT IN ('closed', 'archived', 'resolved')"
+
+_cache_lock = threading.Lock()
+_view_cache = {}            # name -> (issues version, value)
+_issue_select = None        # sample query for the breakdown, decided on first use
+
+
+def _cached_view(db, name, build):
+    """Return build(db), rebuilt only when the issues marker has moved."""
+    version = table_versions(db, "issues")["issues"]
+    with _cache_lock:
+        hit = _view_cache.get(name)
+        if hit and hit[0] == version:
+            return hit[1]
+    value = build(db)
+    with _cache_lock:
+        _view_cache[name] = (version, value)
+    return value
+
+
+def _build_open_count(db):
     cur = db.cursor()
     try:
-        # Make sure the row exists (belt & suspenders)
-        if is_pg:
-            cur.execute("""
-                INSERT INTO id_sequences (name, last_value)
-                VALUES ('issues', 0)
-                ON CONFLICT (name) DO NOTHING;
-            """)
-            # Atomically bump and return
-            cur.execute(f"UPDATE id_sequences SET last_value = last_value + 1 WHERE name = {ph} RETURNING last_value;", ('issues',))
-            row = cur.fetchone()
-            new_val = int(row[0]) if row else 1
-        else:
-            # SQLite
-            cur.execute(f"INSERT OR IGNORE INTO id_sequences (name, last_value) VALUES ({ph}, 0);", ('issues',))
-            cur.execute(f"SELECT last_value FROM id_sequences WHERE name = {ph};", ('issues',))
-            row = cur.fetchone()
-            current = int(row[0]) if row and row[0] is not None else 0
-            new_val = current + 1
-            cur.execute(f"UPDATE id_sequences SET last_value = {ph} WHERE name = {ph};", (new_val, 'issues'))
-
-        db.commit()
-        return f"{new_val:03d}"
+        cur.execute(f"SELECT COUNT(*) FROM issues WHERE {_ACTIVE_SQL};")
+        return int(cur.fetchone()[0])
     finally:
         cur.close()
 
 
-def count_all_open_issues():
+def count_all_open_issues(db):
     """
-    Count 'active' issues across DB + JSON.
+    Count 'active' issues.
     Active = status NOT in {'closed','archived','resolved'} (empty = active).
-    Merges by id to avoid double-counts.
     """
-    closed_like = {'closed', 'archived', 'resolved'}
-
-    def norm(x): 
-        return (x or "").strip().lower()
-
-    def is_active(status):
-        s = norm(status)
-        return (s == "") or (s not in closed_like)
-
-    # --- collect from DB ---
-    db_items = []
-    try:
-        from extensions import get_db
-        db = get_db()
-        rows = db.execute("SELECT id, status FROM issues").fetchall()
-        for r in rows:
-            try:
-                rid = r["id"]
-                status = r["status"]
-            except Exception:
-                # fallback tuple indexing
-                rid = r[0] if len(r) > 0 else None
-                status = r[1] if len(r) > 1 else None
-            db_items.append({"id": rid, "status": status})
-    except Exception:
-        pass
-
-    # --- collect from JSON ---
-    json_items = []
-    try:
-        import json, os
-        json_path = os.path.join(os.path.dirname(__file__), "data", "issues.json")
-        if os.path.exists(json_path):
-            with open(json_path, "r", encoding="utf-8") as f:
-                for it in (json.load(f) or []):
-                    json_items.append({"id": it.get("id"), "status": it.get("status")})
-    except Exception:
-        pass
+    return _cached_view(db, "open_count", _build_open_count)
 
-    # --- merge by id (DB wins) ---
-    merged = {}
-    for it in json_items:
-        key = it.get("id") if it.get("id") is not None else ("json_" + str(len(merged)))
-        merged[key] = it
-    for it in db_items:
-        key = it.get("id") if it.get("id") is not None else ("db_" + str(len(merged)))
-        merged[key] = it
 
-    # --- count active ---
-    return sum(1 for it in merged.values() if is_active(it.get("status")))
-
-
-def _collect_all_issue_records():
-    """
-    Return a list of {id, status, category, source} from BOTH:
-    - SQLite table `issues`
-    - data/issues.json
-    """
-    items = []
-
-    def norm(x): 
-        return (x or "").strip()
-
-    # --- DB source ---
-    try:
-        from extensions import get_db
-        db = get_db()
-        rows = None
+def _issue_select_sql(db):
+    """Pick the sample query once: use a category column only if the table has one."""
+    global _issue_select
+    if _issue_select is None:
+        cur = db.cursor()
         try:
-            # Try with category column
-            rows = db.execute("SELECT id, status, category FROM issues").fetchall()
-            for r in rows:
-                try:
-                    rid, status, category = r["id"], r["status"], r["category"]
-                except Exception:
-                    rid, status, category = r[0], r[1], r[2] if len(r) > 2 else None
-                items.append({
-                    "id": rid,
-                    "status": norm(status),
-                    "category": norm(category),
-                    "source": "db"
-                })
-        except Exception:
-            # Fallback w/out category
-            rows = db.execute("SELECT id, status FROM issues").fetchall()
-            for r in rows:
-                try:
-                    rid, status = r["id"], r["status"]
-                except Exception:
-                    rid, status = r[0], r[1] if len(r) > 1 else None
-                items.append({
-                    "id": rid,
-                    "status": norm(status),
-                    "category": None,
-                    "source": "db"
-                })
-    except Exception:
-        pass
+            cur.execute("SELECT * FROM issues WHERE 1 = 0;")
+            cols = {d[0].lower() for d in cur.description}
+        finally:
+            cur.close()
+        category = "category" if "category" in cols else "NULL"
+        _issue_select = (f"SELECT id, status, {category} FROM issues "
+                         f"WHERE {_ACTIVE_SQL} LIMIT 20;")
+    return _issue_select
+
 
-    # --- JSON source ---
+def _build_breakdown(db):
+    cur = db.cursor()
     try:
-        import json, os
-        json_path = os.path.join(os.path.dirname(__file__), "data", "issues.json")
-        if os.path.exists(json_path):
-            with open(json_path, "r", encoding="utf-8") as f:
-                arr = json.load(f) or []
-                for it in arr:
-                    items.append({
-                        "id": it.get("id"),
-                        "status": norm(it.get("status")),
-                        "category": norm(it.get("category")),
-                        "source": "json"
-                    })
-    except Exception:
-        pass
+        cur.execute(f"SELECT {_STATUS_SQL}, COUNT(*) FROM issues GROUP BY {_STATUS_SQL};")
+        by_status = {r[0]: int(r[1]) for r in cur.fetchall()}
+
+        cur.execute(_issue_select_sql(db))
+        sample = [{
+            "id": r[0],
+            "status": (r[1] or "").strip(),
+            "category": (r[2] or "").strip() if r[2] is not None else None,
+            "source": "db",
+        } for r in cur.fetchall()]
+    finally:
+        cur.close()
 
-    return items
+    return {
+        "totals": {
+            "merged": sum(by_status.values()),
+            "active": sum(n for s, n in by_status.items() if s not in CLOSED_LIKE),
+        },
+        "by_status": by_status,
+        "sample_active": sample
+    }
 
 
-def _debug_active_breakdown():
+def _debug_active_breakdown(db):
     """
     Build a breakdown of what we're counting.
     Active = status NOT in {'closed','archived','resolved'} (empty = active).
     """
-    closed_like = {'closed', 'archived', 'resolved'}
-    def lower(x): return (x or "").strip().lower()
-    def is_active(status): 
-        s = lower(status)
-        return (s == "") or (s not in closed_like)
-
-    raw = _collect_all_issue_records()
-
-    # Merge by id when present (DB wins). If no id, keep per-source row.
-    merged = {}
-    for it in raw:
-        key = it["id"] if it.get("id") is not None else f'{it["source"]}:{len(merged)}'
-        # DB wins on collision
-        if key in merged and it["source"] == "json" and merged[key]["source"] == "db":
-            continue
-        merged[key] = it
-
-    by_status = {}
-    for it in merged.values():
-        s = lower(it.get("status"))
-        by_status[s] = by_status.get(s, 0) + 1
-
-    active_list = [it for it in merged.values() if is_active(it.get("status"))]
-
-    return {
-        "totals": {
-            "merged": len(merged),
-            "active": len(active_list)
-        },
-        "by_status": by_status,
-        "sample_active": active_list[:20]
-    }
\ No newline at end of file
+    return _cached_view(db, "breakdown", _build_breakdown)
@@ -0,0 +1,79 @@
+# =========================================================================
+# ARCADE MANAGER - JSON PROVIDER
+# Faster jsonify() for the big list responses.
+#
+# What this file does:
+# - FastJSONProvider: Flask JSON provider (app.json) backed by orjson when it
+#   is installed, stdlib json otherwise. Either way:
+#     date / datetime -> ISO 8601 ("2025-08-18", "2025-08-18T03:04:34+00:00")
+#     Decimal         -> string (same as Flask's default)
+#     numpy / pandas scalars -> plain numbers (TPT results)
+#   so routes can hand rows straight to jsonify() without str()/isoformat().
+# - dumps_bytes(obj) -> encoded JSON for streamed bodies (GET /api/pms)
+#
+# Keys are sorted like Flask's default provider, so bodies keep their shape.
+# orjson is optional (requirements.txt lists it); without it this is the
+# stdlib encoder with the same conversions.
+#
+# Connected files:
+# - app.py (app.json = FastJSONProvider(app)), http_compress.py
+# =========================================================================
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+_ORJSON_OPTS = 0
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(o):
+    """Types neither encoder handles natively."""
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, Decimal):
+        return str(o)
+    if hasattr(o, "item"):          # numpy / pandas scalar
+        return o.item()
+    if hasattr(o, "tolist"):        # numpy array
+        return o.tolist()
+    if hasattr(o, "isoformat"):     # pandas Timestamp (if not a datetime subclass)
+        return o.isoformat()
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTS)
+    return json.dumps(obj, default=_default, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTS).decode("utf-8")
+        kwargs.setdefault("default", _default)
+        kwargs.setdefault("sort_keys", True)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """jsonify(): bytes straight into the response (no str round trip)."""
+        obj = self._prepare_response_obj(args, kwargs)
+        if self._app.debug:  # keep pretty output while developing
+            return super().response(obj)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
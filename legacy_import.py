@@ -0,0 +1,231 @@
+# =========================================================================
+# ARCADE MANAGER - LEGACY ISSUES IMPORT
+# Moves data/issues.json into the issues table once, so no request ever
+# has to read the JSON file again.
+#
+# What this file does:
+# - iter_json_array(path)        -> yields the elements of a top-level JSON
+#                                   array one by one (constant memory)
+# - import_legacy_issues(db)     -> inserts rows whose id is not in the DB yet,
+#                                   in batches, and records a watermark
+#                                   (file mtime/size + counts) in settings
+#
+# Re-runs:
+# - same mtime + size as the watermark -> nothing is read at all
+# - file changed -> streamed again; existing ids are left alone
+#   (INSERT ... ON CONFLICT DO NOTHING), so only new ids are added.
+#   The DB row always wins, same rule the old read-time merge used.
+# - items without an id get "JSON-<position>" (stable for append-only files)
+#
+# Runs at startup from app.init_db, or by hand:
+#   python legacy_import.py [path/to/issues.json]
+#
+# Connected files:
+# - app.py        (init_db calls import_legacy_issues)
+# - issues_db.py  (counts are DB-only once this has run)
+# =========================================================================
+
+import json
+import os
+import sys
+
+from cache_utils import invalidate
+from change_log import log_change
+from table_versions import bump_table_version
+
+LEGACY_JSON_PATH = os.path.join(os.path.dirname(__file__), "data", "issues.json")
+WATERMARK_KEY = "legacy_issues_import"
+BATCH_SIZE = 500
+CHUNK_SIZE = 1 << 16  # chars read per step while parsing
+
+_COLUMNS = ("id", "description", "priority", "status", "area",
+            "equipment_location", "notes", "target_date", "assigned_to", "date_logged")
+
+
+def _is_postgres(db):
+    return hasattr(db, "dsn")
+
+
+# --- streaming parser -------------------------------------------------------
+def iter_json_array(path, chunk_size=CHUNK_SIZE):
+    """
+    Yield each element of the top-level JSON array in `path`.
+    Only the current element (plus one chunk) is held in memory.
+    An empty / whitespace-only file yields nothing.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos, started = "", 0, False
+        while True:
+            # skip whitespace and separators, reading more when the buffer runs dry
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buf):
+                    break
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    if not started:
+                        return
+                    raise ValueError(f"{path}: unexpected end of file (missing ']')")
+                buf, pos = buf[pos:] + chunk, 0
+
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # element continues past the buffer: read more and retry
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield obj
+            pos = end
+            if pos > chunk_size:
+                buf, pos = buf[pos:], 0
+
+
+# --- mapping ----------------------------------------------------------------
+def _pick(item, *keys):
+    for k in keys:
+        v = item.get(k)
+        if v not in (None, ""):
+            return v
+    return None
+
+
+def _row_from_item(item, position):
+    """Legacy JSON item -> issues row (same aliases as POST /api/issues)."""
+    rid = item.get("id")
+    rid = str(rid) if rid not in (None, "") else f"JSON-{position:05d}"
+    return (
+        rid,
+        _pick(item, "description", "title", "issue", "summary") or "",
+        _pick(item, "priority", "priority_level", "severity") or "Medium",
+        _pick(item, "status", "status_text", "state") or "Open",
+        _pick(item, "area", "category", "tab"),
+        _pick(item, "equipment_location", "equipment_name", "location", "equipment", "game"),
+        _pick(item, "notes", "note", "details"),
+        _pick(item, "target_date", "target", "due_date"),
+        _pick(item, "assigned_to", "assignee", "assigned", "employee"),
+        _pick(item, "date_logged", "created_at", "date"),
+    )
+
+
+# --- watermark --------------------------------------------------------------
+def _read_watermark(db):
+    ph = "%s" if _is_postgres(db) else "?"
+    cur = db.cursor()
+    try:
+        cur.execute(f"SELECT value FROM settings WHERE key = {ph};", (WATERMARK_KEY,))
+        row = cur.fetchone()
+    finally:
+        cur.close()
+    try:
+        return json.loads(row[0]) if row and row[0] else {}
+    except ValueError:
+        return {}
+
+
+def _write_watermark(cur, db, mark):
+    ph = "%s" if _is_postgres(db) else "?"
+    cur.execute(
+        f"INSERT INTO settings (key, value) VALUES ({ph}, {ph}) "
+        f"ON CONFLICT (key) DO UPDATE SET value = excluded.value;",
+        (WATERMARK_KEY, json.dumps(mark)),
+    )
+
+
+# --- import -----------------------------------------------------------------
+def _insert_batch(cur, db, rows):
+    """Insert rows whose id is new; returns how many were inserted."""
+    cols = ", ".join(_COLUMNS)
+    if _is_postgres(db):
+        from psycopg2.extras import execute_values
+        template = "(" + ", ".join(["%s"] * (len(_COLUMNS) - 1)) + ", COALESCE(%s, CURRENT_TIMESTAMP))"
+        execute_values(
+            cur,
+            f"INSERT INTO issues ({cols}) VALUES %s ON CONFLICT (id) DO NOTHING",
+            rows, template=template, page_size=len(rows),
+        )
+        return max(cur.rowcount, 0)
+    before = db.total_changes
+    values = ", ".join(["?"] * (len(_COLUMNS) - 1)) + ", COALESCE(?, CURRENT_TIMESTAMP)"
+    cur.executemany(f"INSERT OR IGNORE INTO issues ({cols}) VALUES ({values});", rows)
+    return db.total_changes - before
+
+
+def import_legacy_issues(db, path=None, force=False):
+    """
+    Import `path` (default data/issues.json) into issues.
+    Returns {"status": "imported"|"unchanged"|"missing", "read": n, "inserted": n}.
+    Everything (rows + watermark + change marker) commits in one transaction.
+    """
+    path = path or LEGACY_JSON_PATH
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {"status": "missing", "read": 0, "inserted": 0}
+
+    mark = _read_watermark(db)
+    if not force and mark.get("mtime_ns") == st.st_mtime_ns and mark.get("size") == st.st_size:
+        return {"status": "unchanged", "read": 0, "inserted": 0}
+
+    read = inserted = 0
+    batch = []
+    cur = db.cursor()
+    try:
+        for position, item in enumerate(iter_json_array(path), start=1):
+            if not isinstance(item, dict):
+                continue
+            batch.append(_row_from_item(item, position))
+            read += 1
+            if len(batch) >= BATCH_SIZE:
+                inserted += _insert_batch(cur, db, batch)
+                batch = []
+        if batch:
+            inserted += _insert_batch(cur, db, batch)
+
+        _write_watermark(cur, db, {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "elements": read,
+            "inserted_total": int(mark.get("inserted_total", 0)) + inserted,
+        })
+        if inserted:
+            log_change(db, "issues", "*", "reset")  # a whole import: readers reload
+            bump_table_version(db, "issues")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+    if inserted:
+        invalidate("issues")
+    return {"status": "imported", "read": read, "inserted": inserted}
+
+
+if __name__ == "__main__":
+    # same connection rules as app.get_db()
+    if os.environ.get("DATABASE_URL"):
+        import psycopg2
+        conn = psycopg2.connect(os.environ["DATABASE_URL"])
+    else:
+        import sqlite3
+        conn = sqlite3.connect("app.db")
+    try:
+        result = import_legacy_issues(conn, sys.argv[1] if len(sys.argv) > 1 else None, force=True)
+        print(result)
+    finally:
+        conn.close()
@@ -0,0 +1,80 @@
+# =========================================================================
+# ARCADE MANAGER - LIST PAGINATION HELPERS
+# Keyset (cursor) pagination + field projection shared by list endpoints.
+#
+# What this file does:
+# - wants_page(args)         -> True when the caller asked for paged mode
+# - parse_limit(raw)         -> clamp ?limit= to 1..MAX_LIMIT
+# - parse_fields(raw, ok)    -> ?fields=a,b,c checked against an allowlist
+# - encode_cursor / decode_cursor -> opaque next-cursor tokens
+#
+# Connected files:
+# - issue_hub_bp.py (GET /api/issuehub/list)
+# - issues_api.py   (GET /api/issues)
+# - games_api.py    (GET /api/games?since= sync cursors)
+# =========================================================================
+
+import base64
+import json
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+PAGE_PARAMS = ("limit", "cursor", "fields")
+
+
+def wants_page(args):
+    """Paged mode only when asked for; otherwise the old full response is kept."""
+    return any(args.get(k) not in (None, "") for k in PAGE_PARAMS)
+
+
+def parse_limit(raw, default=DEFAULT_LIMIT):
+    """Returns an int between 1 and MAX_LIMIT (bad/missing input -> default)."""
+    try:
+        n = int(raw)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(n, MAX_LIMIT))
+
+
+def parse_fields(raw, allowed):
+    """
+    '?fields=id,title,status' -> ['id', 'title', 'status'] (order kept, deduped).
+    Returns None when no projection was asked for.
+    Raises ValueError naming the first unknown field.
+    """
+    if not raw:
+        return None
+    out = []
+    for f in raw.split(","):
+        f = f.strip()
+        if not f or f in out:
+            continue
+        if f not in allowed:
+            raise ValueError(f"unknown field '{f}'")
+        out.append(f)
+    return out or None
+
+
+def cursor_value(val):
+    """Timestamp -> string that both engines compare correctly against the column."""
+    if val is None:
+        return None
+    return val.isoformat() if hasattr(val, "isoformat") else str(val)
+
+
+def encode_cursor(*values):
+    raw = json.dumps([cursor_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, size=2):
+    """Returns the list of values inside a token. Raises ValueError if it is malformed."""
+    try:
+        pad = "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(token + pad).decode("utf-8"))
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("invalid cursor")
+    return values
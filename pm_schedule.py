@@ -0,0 +1,283 @@
+# =========================================================================
+# ARCADE MANAGER - PM SCHEDULING
+# Per-game PM intervals + a stored next-due date on each game.
+#
+# What this file does:
+# - interval_for(name, game_type, override) -> PM interval (days) for a game
+#     1) games.pm_interval_days (set per game in the DB)
+#     2) config/games.json entry with the same name: "pm_interval_days"
+#     3) game type (games.game_type, else the games.json entry's "type"):
+#        PM_TYPE_INTERVALS, or "pm_type_intervals" in games.json entries
+#     4) PM_DEFAULT_INTERVAL_DAYS (90)
+# - refresh_game(db, game_id)  -> recompute last_pm_date / pm_next_due for one
+#                                 game (caller commits; used by /api/pms/add)
+# - sync_all(db)               -> recompute every game (startup + daily job)
+# - due_within(db, days)       -> games due by today + days (index range scan
+#                                 on ix_games_pm_next_due; never-PM'd games too)
+# - status_rows(db)            -> rows for /api/pms/last_by_game (status in SQL)
+# - daily_due_job(db)          -> sync_all + store today's due list in settings
+#
+# A game is "due" when pm_next_due <= today, "soon" within PM_SOON_WINDOW
+# days of it, else "ok". A game with no PM logged is always due.
+#
+# Connected files:
+# - games_db.py (games columns), app.py (routes + daily job), db_indexes.py
+# =========================================================================
+
+import json
+import os
+import threading
+from datetime import date, timedelta
+
+from change_log import log_change
+from table_versions import bump_table_version
+
+PM_DEFAULT_INTERVAL = int(os.environ.get("PM_DEFAULT_INTERVAL_DAYS", "90"))
+PM_SOON_WINDOW = int(os.environ.get("PM_SOON_WINDOW_DAYS", "15"))
+PM_TYPE_INTERVALS = {}  # e.g. {"pinball": 60}; games.json can add/override
+GAMES_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config", "games.json")
+DUE_LIST_KEY = "pm_due_list"
+
+_config_lock = threading.Lock()
+_config = {"mtime": None, "by_name": {}, "type_by_name": {}, "types": {}}
+
+
+def _is_postgres(db):
+    return hasattr(db, "dsn")
+
+
+def _key(name):
+    return (name or "").strip().lower()
+
+
+def _as_date(v):
+    if v is None or v == "":
+        return None
+    if isinstance(v, date):
+        return v
+    try:
+        return date.fromisoformat(str(v)[:10])
+    except ValueError:
+        return None
+
+
+# --- config -----------------------------------------------------------------
+def _games_config():
+    """config/games.json reduced to interval lookups; re-read only when its mtime changes."""
+    try:
+        mtime = os.stat(GAMES_CONFIG_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+    with _config_lock:
+        if _config["mtime"] == mtime:
+            return _config
+    by_name, type_by_name, types = {}, {}, dict(PM_TYPE_INTERVALS)
+    if mtime is not None:
+        try:
+            with open(GAMES_CONFIG_PATH, "r", encoding="utf-8") as f:
+                entries = json.load(f) or []
+            for e in entries:
+                if not isinstance(e, dict):
+                    continue
+                name = _key(e.get("name"))
+                if name and e.get("pm_interval_days"):
+                    by_name[name] = int(e["pm_interval_days"])
+                if name and e.get("type"):
+                    type_by_name[name] = _key(e["type"])
+                for t, days in (e.get("pm_type_intervals") or {}).items():
+                    types[_key(t)] = int(days)
+        except Exception as e:
+            print(f"Warning: could not read PM intervals from {GAMES_CONFIG_PATH}: {e}")
+    with _config_lock:
+        _config.update(mtime=mtime, by_name=by_name, type_by_name=type_by_name, types=types)
+        return _config
+
+
+def interval_for(name, game_type=None, override=None, cfg=None):
+    if override:
+        return int(override)
+    cfg = cfg or _games_config()
+    name = _key(name)
+    if name in cfg["by_name"]:
+        return cfg["by_name"][name]
+    gtype = _key(game_type) or cfg["type_by_name"].get(name)
+    if gtype and gtype in cfg["types"]:
+        return cfg["types"][gtype]
+    return PM_DEFAULT_INTERVAL
+
+
+def _next_due(last_pm, interval):
+    last = _as_date(last_pm)
+    return (last + timedelta(days=interval)).isoformat() if last else None
+
+
+# --- maintenance --------------------------------------------------------------
+def refresh_game(db, game_id):
+    """Recompute one game's last PM + next due. Runs in the caller's transaction."""
+    ph = "%s" if _is_postgres(db) else "?"
+    cur = db.cursor()
+    try:
+        cur.execute(
+            f"SELECT g.name, g.game_type, g.pm_interval_days, "
+            f"(SELECT MAX(p.pm_date) FROM pm_logs p WHERE p.game_id = g.id) "
+            f"FROM games g WHERE g.id = {ph};",
+            (game_id,),
+        )
+        row = cur.fetchone()
+        if not row:
+            return None
+        name, gtype, override, last_pm = row
+        last = _as_date(last_pm)
+        due = _next_due(last, interval_for(name, gtype, override))
+        cur.execute(
+            f"UPDATE games SET last_pm_date = {ph}, pm_next_due = {ph} WHERE id = {ph};",
+            (last.isoformat() if last else None, due, game_id),
+        )
+        # today's stored due list no longer matches; /api/pms/due goes live until the next job
+        cur.execute(f"DELETE FROM settings WHERE key = {ph};", (DUE_LIST_KEY,))
+        log_change(db, "games", game_id, "update")
+        bump_table_version(db, "games")
+        return due
+    finally:
+        cur.close()
+
+
+def sync_all(db):
+    """
+    Recompute last_pm_date / pm_next_due for every game (picks up config and
+    interval changes). One read, then only the changed rows are updated.
+    Returns the number of games updated.
+    """
+    ph = "%s" if _is_postgres(db) else "?"
+    cur = db.cursor()
+    try:
+        cur.execute("""
+            SELECT g.id, g.name, g.game_type, g.pm_interval_days, g.last_pm_date, g.pm_next_due,
+                   (SELECT MAX(p.pm_date) FROM pm_logs p WHERE p.game_id = g.id)
+            FROM games g;
+        """)
+        changes, cfg = [], _games_config()
+        for gid, name, gtype, override, old_last, old_due, last_pm in cur.fetchall():
+            last = _as_date(last_pm)
+            last_s = last.isoformat() if last else None
+            due = _next_due(last, interval_for(name, gtype, override, cfg))
+            old_last_d, old_due_d = _as_date(old_last), _as_date(old_due)
+            if ((old_last_d.isoformat() if old_last_d else None) != last_s
+                    or (old_due_d.isoformat() if old_due_d else None) != due):
+                changes.append((last_s, due, gid))
+        if changes:
+            cur.executemany(
+                f"UPDATE games SET last_pm_date = {ph}, pm_next_due = {ph} WHERE id = {ph};",
+                changes,
+            )
+            log_change(db, "games", [gid for _, _, gid in changes], "update")
+            bump_table_version(db, "games")
+        db.commit()
+        return len(changes)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+# --- reads ------------------------------------------------------------------
+# status is decided in SQL on the stored date ('YYYY-MM-DD' compares as text
+# on SQLite, as DATE on Postgres); NULL next_due = never PM'd = due
+def _status_sql(ph):
+    return (f"CASE WHEN pm_next_due IS NULL OR pm_next_due <= {ph} THEN 'due' "
+            f"WHEN pm_next_due <= {ph} THEN 'soon' ELSE 'ok' END")
+
+
+def _items(rows, today):
+    cfg = _games_config()
+    items = []
+    for gid, name, last_pm, next_due, override, gtype, status in rows:
+        last, due = _as_date(last_pm), _as_date(next_due)
+        items.append({
+            "game_id": gid,
+            "game_name": name,
+            "last_pm_date": last.isoformat() if last else None,
+            "days_since": (today - last).days if last else None,
+            "next_due": due.isoformat() if due else None,
+            # stored dates already encode the interval; config only for never-PM'd games
+            "interval_days": (due - last).days if last and due else interval_for(name, gtype, override, cfg),
+            "status": status,
+        })
+    return items
+
+
+def _select(db, where, params, order, today):
+    ph = "%s" if _is_postgres(db) else "?"
+    soon = (today + timedelta(days=PM_SOON_WINDOW)).isoformat()
+    cur = db.cursor()
+    try:
+        cur.execute(
+            "SELECT id, name, last_pm_date, pm_next_due, pm_interval_days, game_type, "
+            f"{_status_sql(ph)} AS pm_status FROM games {where.format(ph=ph)} ORDER BY {order};",
+            (today.isoformat(), soon) + tuple(params),
+        )
+        return _items(cur.fetchall(), today)
+    finally:
+        cur.close()
+
+
+def due_within(db, days, today=None):
+    """Games due on or before today + days (plus never-PM'd ones), soonest first."""
+    today = today or date.today()
+    cutoff = (today + timedelta(days=int(days))).isoformat()
+    return _select(db, "WHERE pm_next_due <= {ph} OR pm_next_due IS NULL", (cutoff,),
+                   "pm_next_due IS NOT NULL, pm_next_due, LOWER(COALESCE(name, ''))", today)
+
+
+def status_rows(db, today=None):
+    """Every game with its PM status (due → soon → ok, then name)."""
+    today = today or date.today()
+    return _select(db, "", (), "CASE pm_status WHEN 'due' THEN 0 WHEN 'soon' THEN 1 ELSE 2 END, "
+                               "LOWER(COALESCE(name, ''))", today)
+
+
+# --- daily job ----------------------------------------------------------------
+def daily_due_job(db, window=PM_SOON_WINDOW):
+    """
+    Re-sync schedules, then store today's due list (due + soon) in settings
+    so /api/pms/due can serve it without touching games or pm_logs.
+    """
+    updated = sync_all(db)
+    today = date.today()
+    items = due_within(db, window, today=today)
+    payload = json.dumps({"date": today.isoformat(), "window": window, "items": items})
+    ph = "%s" if _is_postgres(db) else "?"
+    cur = db.cursor()
+    try:
+        cur.execute(
+            f"INSERT INTO settings (key, value) VALUES ({ph}, {ph}) "
+            f"ON CONFLICT (key) DO UPDATE SET value = excluded.value;",
+            (DUE_LIST_KEY, payload),
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+    print(f"PM daily job: {updated} schedule(s) updated, {len(items)} game(s) due within {window} days")
+    return items
+
+
+def stored_due_list(db):
+    """Today's list from daily_due_job, or None if it has not run today."""
+    ph = "%s" if _is_postgres(db) else "?"
+    cur = db.cursor()
+    try:
+        cur.execute(f"SELECT value FROM settings WHERE key = {ph};", (DUE_LIST_KEY,))
+        row = cur.fetchone()
+    finally:
+        cur.close()
+    try:
+        data = json.loads(row[0]) if row and row[0] else None
+    except ValueError:
+        return None
+    if not data or data.get("date") != date.today().isoformat():
+        return None
+    return data
@@ -0,0 +1,54 @@
+# =========================================================================
+# ARCADE MANAGER - BACKGROUND JOBS
+# Tiny periodic-job runner for housekeeping that must not run on requests.
+#
+# What this file does:
+# - start_periodic(app, name, interval, fn) -> runs fn() every `interval`
+#   seconds on a daemon thread, inside an app context (so get_db() works
+#   and the connection is closed by the normal teardown after each run)
+# - stop_all() -> stops every job (handy in a shell / when reloading)
+#
+# Each gunicorn worker runs its own copy of a job, so jobs must be
+# idempotent (e.g. "archive what is due" rather than "archive N rows").
+# =========================================================================
+
+import threading
+
+_JOBS = {}  # name -> (thread, stop_event)
+
+
+def start_periodic(app, name, interval, fn, run_at_start=True):
+    """
+    Start `fn` every `interval` seconds. interval <= 0 disables the job.
+    Starting a job that is already running is a no-op. Returns the thread (or None).
+    """
+    if not interval or interval <= 0:
+        app.logger.info("job %s disabled (interval=%s)", name, interval)
+        return None
+    if name in _JOBS and _JOBS[name][0].is_alive():
+        return _JOBS[name][0]
+
+    stop = threading.Event()
+
+    def _loop():
+        if not run_at_start and stop.wait(interval):
+            return
+        while not stop.is_set():
+            try:
+                with app.app_context():
+                    fn()
+            except Exception:
+                app.logger.exception("job %s failed", name)
+            if stop.wait(interval):
+                return
+
+    t = threading.Thread(target=_loop, name=f"job:{name}", daemon=True)
+    _JOBS[name] = (t, stop)
+    t.start()
+    return t
+
+
+def stop_all():
+    for _, stop in _JOBS.values():
+        stop.set()
+    _JOBS.clear()
@@ -0,0 +1,178 @@
+# =========================================================================
+# ARCADE MANAGER - FULL-TEXT SEARCH
+# Ranked text search for issues + issuehub_issues (replaces LIKE '%q%').
+#
+# What this file does:
+# - SEARCH_TABLES: which columns are searchable per table, with weights
+# - ensure_search_index(db, table) -> builds the index once and keeps it in
+#   sync from then on:
+#     SQLite:   FTS5 table <table>_fts (external content = the table itself)
+#               + AFTER INSERT / DELETE / UPDATE OF <columns> triggers
+#     Postgres: generated tsvector column search_tsv (weighted A/B/C) + GIN
+#               index; Postgres recomputes it on every write, no trigger code
+# - search_join(db, table, q) -> (JOIN sql, params) adding hits.score to a
+#   query on `table` (higher = better), or None when q has no words / the
+#   index is unavailable (callers then fall back to LIKE)
+# - rebuild_search_index(db, table) -> SQLite: refill <table>_fts from the table
+#
+# Query words are matched as prefixes ("jam" finds "jammed"; Postgres also
+# stems, so "jammed" finds "jam"); every word must match. Punctuation is dropped, so user input can never
+# produce FTS syntax errors.
+#
+# SQLite caveat: external-content FTS is keyed by rowid. VACUUM may renumber
+# rowids of tables with a TEXT primary key, so run rebuild_search_index()
+# (python search_index.py) after a VACUUM.
+#
+# Connected files:
+# - app.py (issues), issue_hub_bp.py (issuehub_issues), issues_api.py
+# =========================================================================
+
+import re
+import sys
+
+# table -> [(column, weight)], most important first (PG weights A, B, C, C…)
+SEARCH_TABLES = {
+    "issues": [("description", 10.0), ("equipment_location", 5.0), ("notes", 2.0)],
+    "issuehub_issues": [("title", 10.0), ("location", 5.0), ("details", 2.0), ("resolution", 2.0)],
+}
+PG_TS_CONFIG = "english"
+# no porter stemmer: it rewrites prefixes too ("joy"* -> "joi"*, missing "joystick")
+SQLITE_TOKENIZER = "unicode61 remove_diacritics 2"
+MAX_TERMS = 8
+
+_READY = set()  # tables whose index exists in this process
+
+
+def _is_postgres(db):
+    return hasattr(db, "dsn")
+
+
+def _fts(table):
+    return f"{table}_fts"
+
+
+# --- setup ------------------------------------------------------------------
+def _ensure_sqlite(db, table):
+    fts = _fts(table)
+    cols = [c for c, _ in SEARCH_TABLES[table]]
+    col_list = ", ".join(cols)
+    new_vals = ", ".join(f"new.{c}" for c in cols)
+    old_vals = ", ".join(f"old.{c}" for c in cols)
+    cur = db.cursor()
+    try:
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (fts,))
+        created = cur.fetchone() is None
+        cur.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{col_list}, content='{table}', content_rowid='rowid', tokenize='{SQLITE_TOKENIZER}');"
+        )
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {col_list}) VALUES (new.rowid, {new_vals});
+            END;
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {col_list}) VALUES ('delete', old.rowid, {old_vals});
+            END;
+        """)
+        # only when a searchable column changes (status flips don't touch the index)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col_list} ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {col_list}) VALUES ('delete', old.rowid, {old_vals});
+                INSERT INTO {fts} (rowid, {col_list}) VALUES (new.rowid, {new_vals});
+            END;
+        """)
+        if created:
+            cur.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild');")
+        db.commit()
+    finally:
+        cur.close()
+
+
+def _ensure_pg(db, table):
+    parts = [
+        f"setweight(to_tsvector('{PG_TS_CONFIG}'::regconfig, COALESCE({c}, '')), "
+        f"'{'AB'[i] if i < 2 else 'C'}')"
+        for i, (c, _) in enumerate(SEARCH_TABLES[table])
+    ]
+    cur = db.cursor()
+    try:
+        cur.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_tsv tsvector "
+            f"GENERATED ALWAYS AS ({' || '.join(parts)}) STORED;"
+        )
+        cur.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING GIN (search_tsv);")
+        db.commit()
+    finally:
+        cur.close()
+
+
+def ensure_search_index(db, table):
+    """Create (first run) the search index for `table`. Failures are reported, not raised."""
+    try:
+        if _is_postgres(db):
+            _ensure_pg(db, table)
+        else:
+            _ensure_sqlite(db, table)
+        _READY.add(table)
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: search index for {table} skipped (LIKE fallback): {e}")
+        return False
+
+
+def rebuild_search_index(db, table):
+    if _is_postgres(db):
+        return  # generated column, always current
+    fts = _fts(table)
+    cur = db.cursor()
+    try:
+        cur.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild');")
+        db.commit()
+    finally:
+        cur.close()
+
+
+# --- querying -----------------------------------------------------------------
+def search_terms(q):
+    return re.findall(r"\w+", (q or "").lower())[:MAX_TERMS]
+
+
+def search_join(db, table, q):
+    """
+    JOIN that keeps only rows matching q and exposes hits.score
+    (ORDER BY hits.score DESC for best first). Returns (sql, params) or None.
+    """
+    terms = search_terms(q)
+    if not terms or table not in _READY:
+        return None
+    if _is_postgres(db):
+        tsquery = " & ".join(f"{t}:*" for t in terms)
+        return (
+            f"JOIN (SELECT id AS hit_key, ts_rank_cd(search_tsv, q) AS score "
+            f"FROM {table}, to_tsquery('{PG_TS_CONFIG}', %s) q WHERE search_tsv @@ q) hits "
+            f"ON hits.hit_key = {table}.id",
+            [tsquery],
+        )
+    fts = _fts(table)
+    weights = ", ".join(str(w) for _, w in SEARCH_TABLES[table])
+    match = " ".join(f'"{t}"*' for t in terms)
+    return (
+        f"JOIN (SELECT rowid AS hit_key, -bm25({fts}, {weights}) AS score "
+        f"FROM {fts} WHERE {fts} MATCH ?) hits ON hits.hit_key = {table}.rowid",
+        [match],
+    )
+
+
+if __name__ == "__main__":
+    # after a VACUUM on SQLite:  python search_index.py [path/to/app.db]
+    import sqlite3
+    conn = sqlite3.connect(sys.argv[1] if len(sys.argv) > 1 else "app.db")
+    try:
+        for name in SEARCH_TABLES:
+            rebuild_search_index(conn, name)
+            print(f"{name}: search index rebuilt")
+    finally:
+        conn.close()
@@ -0,0 +1,65 @@
+// =========================================================================
+// ARCADE MANAGER - LIVE CHANGE FEED (client)
+// One EventSource per tab on /api/changes/stream; pages register what they
+// care about instead of re-fetching lists on a timer.
+//
+// What this file does:
+// - window.changeFeed.on(entities, fn, { minInterval }) -> fn(changes) after
+//   a change to any of those tables ("issues", "issuehub_issues", "games",
+//   "pm_logs"). Bursts are coalesced (~300 ms), and fn runs at most once per
+//   minInterval ms (default 0): a background widget that used to poll every
+//   60 s passes 60000 and so never loads more than it did, and nothing at all
+//   while nobody writes. A "reset" from the server calls every listener with
+//   []. Returns false when EventSource is unavailable, so callers can fall
+//   back to polling.
+// - Reconnects are handled by EventSource itself (Last-Event-ID), so changes
+//   made while the tab was reconnecting are replayed, not lost.
+//
+// Connected files:
+// - templates/base.html (loaded before the page scripts)
+// - app.py (GET /api/changes/stream)
+// - notifications.js, issue_hub.js, dashboardDownGamesCard.js (listeners)
+// =========================================================================
+(function () {
+  if (window.changeFeed) return;
+
+  const listeners = [];  // { entities:Set, fn, minInterval, pending:[], timer, last }
+  let source = null;
+
+  function deliver(l, change) {
+    if (change) l.pending.push(change);
+    if (l.timer) return;
+    const wait = Math.max(300, l.last + l.minInterval - Date.now());
+    l.timer = setTimeout(() => {
+      const batch = l.pending;
+      l.pending = [];
+      l.timer = null;
+      l.last = Date.now();
+      try { l.fn(batch); } catch (err) { console.error('changeFeed listener failed', err); }
+    }, wait);
+  }
+
+  function connect() {
+    if (source) return;
+    source = new EventSource('/api/changes/stream');
+    source.addEventListener('change', (ev) => {
+      let change;
+      try { change = JSON.parse(ev.data); } catch { return; }
+      listeners.forEach(l => {
+        if (l.entities.has(change.entity)) deliver(l, change);
+      });
+    });
+    // too far behind to replay: everybody reloads
+    source.addEventListener('reset', () => listeners.forEach(l => deliver(l, null)));
+  }
+
+  window.changeFeed = {
+    on(entities, fn, { minInterval = 0 } = {}) {
+      if (typeof EventSource === 'undefined') return false;
+      listeners.push({ entities: new Set([].concat(entities)), fn, minInterval,
+                       pending: [], timer: null, last: Date.now() });
+      connect();
+      return true;
+    },
+  };
+})();
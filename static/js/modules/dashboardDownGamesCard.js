@@ -7,6 +7,7 @@
 // - Count how many are Down
 // - Compute uptime = Up / Total (%)
 // - Update #downGamesCount and #downGamesUptime
+// - Re-run when games change (window.changeFeed, see changeFeed.js)
 //
 // Connected files:
 // - templates/index.html  (the card markup + this module import)
@@ -53,3 +54,7 @@ if (document.readyState === 'loading') {
 } else {
   initDownGamesCard();
 }
+
+if (document.getElementById('downGamesCard')) {
+  window.changeFeed?.on('games', initDownGamesCard, { minInterval: 5000 });
+}
@@ -34,6 +34,7 @@ document.addEventListener('DOMContentLoaded', () => {
   const categoryInput = document.getElementById('categoryInput');
   const statusFilter = document.getElementById('statusFilter');
   const refreshBtn = document.getElementById('refreshBtn');
+  const searchInput = document.getElementById('searchInput');
   const trashAllBtn = document.getElementById('trashAllBtn');
 
 
@@ -354,6 +355,14 @@ document.addEventListener('DOMContentLoaded', () => {
   });
 
   gamesFilterGo?.addEventListener('click', loadList);
+  // full-text search: Enter or clearing the box reloads the list
+  searchInput?.addEventListener('keydown', (e) => {
+    if (e.key === 'Enter') {
+      e.preventDefault();
+      loadList();
+    }
+  });
+  searchInput?.addEventListener('search', loadList);
   gamesFilterInput?.addEventListener('keydown', (e) => {
     if (e.key === 'Enter') {
       e.preventDefault();
@@ -420,13 +429,17 @@ document.addEventListener('DOMContentLoaded', () => {
       url = `/api/issuehub/by_game?${qp.toString()}`;
     } else {
       url = `/api/issuehub/list?category=${encodeURIComponent(currentCategory)}&status=${encodeURIComponent(s)}`;
+      const q = (searchInput?.value || '').trim();
+      if (q) url += `&q=${encodeURIComponent(q)}`;
     }
 
     try {
       const res = await fetch(url);
       const data = await res.json();
       itemsCache = data.items || [];
-      renderRows(applySort(itemsCache.slice()));
+      // search results come back ranked best-first; keep that order
+      const searching = url.includes('&q=');
+      renderRows(searching ? itemsCache.slice() : applySort(itemsCache.slice()));
       updateCountsFromCache();
 
       // NEW: Update trashAllBtn visibility and text after loading the list
@@ -882,4 +895,19 @@ document.addEventListener('DOMContentLoaded', () => {
 
   window.refreshIssuesTableData = loadList;
 
+  // Live updates: reload when another tab/user changes Issue Hub items.
+  // Held back while a row is being edited or the tab is hidden.
+  let staleWhileBusy = false;
+  function liveReload() {
+    if (editingId || document.hidden) { staleWhileBusy = true; return; }
+    staleWhileBusy = false;
+    loadList();
+  }
+  if (issuesBody && window.changeFeed) {
+    window.changeFeed.on('issuehub_issues', liveReload);
+    document.addEventListener('visibilitychange', () => {
+      if (staleWhileBusy) liveReload();
+    });
+  }
+
 });
\ No newline at end of file
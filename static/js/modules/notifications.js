@@ -182,8 +182,12 @@
     }, 0);
   });
 
-  // refresh badge periodically and on focus
+  // refresh badge on focus, and at most once a minute when Issue Hub items
+  // changed (live feed; no requests while nothing changes). Plain polling without it.
   loadAlerts();
   document.addEventListener('visibilitychange', () => { if (!document.hidden) loadAlerts(); });
-  setInterval(loadAlerts, 60000);
+  const live = window.changeFeed && window.changeFeed.on('issuehub_issues', () => {
+    if (!document.hidden) loadAlerts();
+  }, { minInterval: 60000 });
+  if (!live) setInterval(loadAlerts, 60000);
 })();
@@ -37,11 +37,11 @@ async function postJSON(url, body) {
 
 function $(sel) { return document.querySelector(sel); }
 
-function renderRows(items) {
+function renderRows(items, append = false) {
   const tbody = $("#pmTableBody");
   const empty = $("#pmEmpty");
-  tbody.innerHTML = "";
-  if (!items || !items.length) {
+  if (!append) tbody.innerHTML = "";
+  if (!append && (!items || !items.length)) {
     if (empty) empty.style.display = "block";
     return;
   }
@@ -58,10 +58,34 @@ function renderRows(items) {
   }
 }
 
-async function loadPMs() {
-  const data = await getJSON("/api/pms");
+// History is paged (newest first) so the page stays fast as logs pile up.
+const PM_PAGE_SIZE = 100;
+let pmNextCursor = null;
+
+function updateLoadMore() {
+  let btn = $("#pmLoadMore");
+  if (!btn) {
+    const table = $("#pmTableBody") && $("#pmTableBody").closest("table");
+    if (!table) return;
+    btn = document.createElement("button");
+    btn.id = "pmLoadMore";
+    btn.type = "button";
+    btn.textContent = "Load more";
+    btn.style.margin = "10px 0";
+    btn.addEventListener("click", () => loadPMs(true).catch(e => showToast(e.message, "Error")));
+    table.insertAdjacentElement("afterend", btn);
+  }
+  btn.style.display = pmNextCursor ? "inline-block" : "none";
+}
+
+async function loadPMs(more = false) {
+  let url = `/api/pms?limit=${PM_PAGE_SIZE}`;
+  if (more && pmNextCursor) url += `&cursor=${encodeURIComponent(pmNextCursor)}`;
+  const data = await getJSON(url);
   const items = Array.isArray(data) ? data : (data.items || []);
-  renderRows(items);
+  pmNextCursor = Array.isArray(data) ? null : (data.next_cursor || null);
+  renderRows(items, more);
+  updateLoadMore();
 }
 
 async function loadGamesIntoSelect() {
@@ -169,13 +193,14 @@ function renderPMStatus(items) {
 
     const last = it.last_pm_date ? it.last_pm_date : "—";
     const days = it.days_since != null ? `${it.days_since}d` : "—";
+    const next = it.next_due ? it.next_due : "now";
 
     const row = document.createElement("div");
     row.style = `display:flex; justify-content:space-between; align-items:center; padding:8px; border-radius:8px; ${badgeStyle}`;
     row.innerHTML = `
       <div style="display:flex; flex-direction:column;">
         <div style="font-weight:600;">${it.game_name || "Unknown"}</div>
-        <div style="font-size:12px; opacity:.8;">Last PM: ${last} • Days since: ${days}</div>
+        <div style="font-size:12px; opacity:.8;">Last PM: ${last} • Days since: ${days} • Next due: ${next}</div>
       </div>
       <div style="font-weight:600; text-transform:uppercase;">${it.status}</div>
     `;
@@ -0,0 +1,84 @@
+# =========================================================================
+# ARCADE MANAGER - TABLE CHANGE MARKERS
+# One version counter per table, bumped inside every write transaction.
+#
+# What this file does:
+# - ensure_table_versions(db)        -> creates table_versions if missing
+# - bump_table_version(db, *tables)  -> +1 for each table (caller commits)
+# - table_versions(db, *tables)      -> {table: version} in one query
+#
+# Why: per-process caches (see cache_utils) can compare the version they
+# were built from with the current one, so a write made by *another*
+# worker is picked up on the next request instead of after a TTL.
+# http_cache builds list ETags from them too. Writers also append to
+# change_log (same transaction) for the live feed: a version says *that* a
+# table changed, the log says *which rows*.
+#
+# Connected files:
+# - app.py       (startup + clear_issues_temp + pm_logs writes)
+# - issues_api.py (issues writes)
+# - issues_db.py (open-issue count cache)
+# - games_api.py, pm_schedule.py, issue_hub_bp.py (games / issuehub writes)
+# - http_cache.py (ETags)
+# =========================================================================
+
+
+def _is_postgres(db):
+    return hasattr(db, "dsn")
+
+
+def ensure_table_versions(db):
+    cur = db.cursor()
+    try:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS table_versions (
+                table_name TEXT PRIMARY KEY,
+                version    INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Error creating table_versions: {e}")
+    finally:
+        cur.close()
+
+
+def bump_table_version(db, *tables):
+    """
+    Increment the marker of each table. Runs in the caller's transaction,
+    so the bump commits (or rolls back) together with the write itself.
+    """
+    ph = "%s" if _is_postgres(db) else "?"
+    cur = db.cursor()
+    try:
+        for table in tables:
+            cur.execute(
+                f"INSERT INTO table_versions (table_name, version) VALUES ({ph}, 1) "
+                f"ON CONFLICT (table_name) DO UPDATE SET "
+                f"version = table_versions.version + 1, updated_at = CURRENT_TIMESTAMP;",
+                (table,),
+            )
+    finally:
+        cur.close()
+
+
+def table_versions(db, *tables):
+    """{table: version}; tables that were never written report 0."""
+    ph = "%s" if _is_postgres(db) else "?"
+    out = {t: 0 for t in tables}
+    if not tables:
+        return out
+    cur = db.cursor()
+    try:
+        cur.execute(
+            f"SELECT table_name, version FROM table_versions "
+            f"WHERE table_name IN ({', '.join([ph] * len(tables))});",
+            tables,
+        )
+        for name, version in cur.fetchall():
+            out[name] = int(version)
+    finally:
+        cur.close()
+    return out
@@ -0,0 +1,36 @@
+# Shared fixtures: the Flask app on a throwaway SQLite file, AI on the
+# fake backend and every background job that is not needed switched off.
+#
+# Usage (from the project root):  python -m pytest -q
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.pop("DATABASE_URL", None)
+os.environ.pop("GEMINI_API_KEY", None)
+os.environ["AI_BACKEND"] = "fake"
+os.environ["ISSUEHUB_ARCHIVE_INTERVAL"] = "0"
+os.environ["PM_DAILY_INTERVAL"] = "0"
+os.environ["CHANGE_LOG_PRUNE_INTERVAL"] = "0"
+
+
+@pytest.fixture(scope="session")
+def app_module(tmp_path_factory):
+    """app.py imported with the working directory on a fresh app.db."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        import app
+        yield app
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
@@ -0,0 +1,155 @@
+# AIClient.ask_stream and POST /api/ai/ask_stream against FakeBackend:
+# delta order + reflection stripping, retry/fallback rules, ttft_ms,
+# AIBusy -> 503 and the limiter slot always being given back.
+
+import json
+
+import pytest
+
+from ai_client import FALLBACK_MODEL, MAX_TOKENS_FINISH, AIClient, AIEmptyReply, FakeBackend, ReflectionStripper
+
+MODEL = "fake-model"
+
+
+def _client(backend, **kw):
+    kw.setdefault("cache_ttl", 0)
+    return AIClient(backend=backend, max_concurrency=1, max_queue=0, queue_timeout=0.05, **kw)
+
+
+def _slot_free(client):
+    if not client._slots.acquire(blocking=False):
+        return False
+    client.release()
+    return True
+
+
+def _scripted(*replies):
+    """FakeBackend reply fn: one (text, finish) per call, models recorded."""
+    seen = []
+
+    def reply(model_name, message):
+        seen.append(model_name)
+        return replies[len(seen) - 1]
+    return reply, seen
+
+
+def _run(client, prompt="reset?"):
+    deltas, done = [], None
+    for kind, value in client.ask_stream(prompt, prompt, {}, MODEL, "sys", {}):
+        if kind == "delta":
+            deltas.append(value)
+        else:
+            done = value
+    return deltas, done
+
+
+def test_deltas_arrive_in_order_without_the_echoed_prompt():
+    client = _client(FakeBackend(reply="Reset? Hold the red button for five seconds."))
+    deltas, done = _run(client)
+    assert deltas == ["Hold ", "the ", "red ", "button ", "for ", "five ", "seconds."]
+    assert done["reply"] == "Hold the red button for five seconds."
+    assert done["cached"] is False
+    assert client.ask("reset?", "reset?", {}, MODEL, "sys", {})["reply"] == done["reply"]
+    assert _slot_free(client)
+
+
+def test_reflection_stripper_across_chunks():
+    s = ReflectionStripper("why is lane 3 down")
+    out = [s.feed(c) for c in ("Why is ", "lane 3", " down: the ", "ticket feeder jammed")]
+    assert out == ["", "", "the ", "ticket feeder jammed"]
+    assert s.finish() == ""
+
+    s = ReflectionStripper("why is lane 3 down")
+    assert s.feed("Why") == ""
+    assert s.finish() == "Why"  # a short reply that only looked like an echo is kept
+
+
+def test_retry_with_bigger_cap_then_fallback_while_nothing_was_sent():
+    reply, seen = _scripted(("", MAX_TOKENS_FINISH), ("", MAX_TOKENS_FINISH), ("Power-cycle it.", 1))
+    client = _client(FakeBackend(reply=reply))
+    deltas, done = _run(client)
+    assert seen == [MODEL, MODEL, FALLBACK_MODEL]
+    assert "".join(deltas) == "Power-cycle it."
+    assert done["reply"] == "Power-cycle it."
+
+
+def test_no_retry_once_text_was_sent():
+    reply, seen = _scripted(("Check the fuse", MAX_TOKENS_FINISH))
+    client = _client(FakeBackend(reply=reply))
+    deltas, done = _run(client)
+    assert seen == [MODEL]
+    assert done["reply"] == "Check the fuse"
+
+
+def test_empty_after_fallback_raises_and_frees_the_slot():
+    reply, seen = _scripted(("", 1), ("", 1))
+    client = _client(FakeBackend(reply=reply))
+    with pytest.raises(AIEmptyReply):
+        _run(client)
+    assert seen == [MODEL, FALLBACK_MODEL]
+    assert _slot_free(client)
+
+
+def test_ttft_is_reported_before_total():
+    client = _client(FakeBackend(reply="one two three four five", delay=0.25))
+    deltas, done = _run(client)
+    assert len(deltas) == 5
+    assert done["ttft_ms"] is not None
+    assert 0 < done["ttft_ms"] < done["total_ms"]
+
+
+def test_cached_reply_is_one_delta():
+    client = _client(FakeBackend(reply="Refill the tickets."), cache_ttl=60)
+    _run(client)
+    deltas, done = _run(client)
+    assert deltas == ["Refill the tickets."]
+    assert done["cached"] is True
+    assert client.backend.calls == 1
+
+
+def test_slot_released_when_stream_is_closed_unread():
+    client = _client(FakeBackend(reply="never read"))
+    events = client.ask_stream("q", "q", {}, MODEL, "sys", {})
+    assert not _slot_free(client)
+    events.close()
+    assert _slot_free(client)
+    events.close()  # idempotent: no double release
+    assert _slot_free(client)
+
+
+# --- route ------------------------------------------------------------------
+@pytest.fixture
+def ai(app_module, monkeypatch):
+    client = _client(FakeBackend(reply="Swap the coin mech."))
+    monkeypatch.setattr(app_module, "AI", client)
+    return client
+
+
+def test_busy_answers_503(client, ai):
+    ai.acquire()  # the only slot is taken, nobody may queue
+    try:
+        for url in ("/api/ai/ask", "/api/ai/ask_stream"):
+            r = client.post(url, json={"prompt": "coin jam"})
+            assert r.status_code == 503
+            assert r.headers["Retry-After"] == "5"
+            assert "busy" in r.get_json()["error"]
+    finally:
+        ai.release()
+
+
+def test_stream_route_sends_deltas_then_done(client, ai):
+    r = client.post("/api/ai/ask_stream", json={"prompt": "coin jam"})
+    body = r.get_data(as_text=True)
+    assert r.mimetype == "text/event-stream"
+    assert body.index("event: delta") < body.index("event: done")
+    done = json.loads(body.split("event: done\ndata: ")[1])
+    assert done["reply"] == "Swap the coin mech."
+    assert _slot_free(ai)
+
+
+def test_stream_route_frees_the_slot_when_the_body_is_never_read(client, ai):
+    r = client.post("/api/ai/ask_stream", json={"prompt": "coin jam"}, buffered=False)
+    assert r.status_code == 200
+    assert not _slot_free(ai)
+    r.close()
+    assert _slot_free(ai)
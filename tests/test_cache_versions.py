@@ -0,0 +1,36 @@
+# Per-process caches keyed on table_versions: a write made by another worker
+# (rows + bump_table_version, but no in-process invalidate()) must show up
+# on the next read instead of after the TTL.
+
+import pytest
+
+from table_versions import bump_table_version
+
+
+@pytest.fixture
+def other_worker(app_module):
+    """Run SQL the way another gunicorn worker would: its own connection, no invalidate()."""
+    def write(sql, params, *tables):
+        with app_module.app.app_context():
+            db = app_module.get_db()
+            db.execute(sql, params)
+            bump_table_version(db, *tables)
+            db.commit()
+    return write
+
+
+def _names(client):
+    return {it["game_name"] for it in client.get("/api/pms/last_by_game").get_json()["items"]}
+
+
+def test_pm_status_sees_a_write_from_another_worker(client, other_worker):
+    _names(client)  # warm the cache
+    other_worker("INSERT INTO games (name, status) VALUES (?, 'Up')", ("Cache Probe Racer",), "games")
+    assert "Cache Probe Racer" in _names(client)
+
+
+def test_dashboard_metrics_see_a_write_from_another_worker(client, other_worker):
+    before = client.get("/api/dashboard/metrics").get_json()
+    other_worker("INSERT INTO games (name, status) VALUES (?, 'Down')", ("Cache Probe Down",), "games")
+    after = client.get("/api/dashboard/metrics").get_json()
+    assert after["down_games"] == before["down_games"] + 1
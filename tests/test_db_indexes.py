@@ -0,0 +1,125 @@
+# Hot queries must be served by an index on a freshly created SQLite database.
+# 1) every hot_queries() entry (what /api/_debug/indexes reports)
+# 2) the SQL the routes really run: each request is traced, and every SELECT
+#    touching the route's hot table is EXPLAINed - a full SCAN of that table
+#    (or its alias) fails, so a route that drifts away from its index is caught.
+
+import os
+import re
+import sqlite3
+
+import pytest
+
+import cache_utils
+from db_indexes import _plan_full_scan, explain_hot_queries, hot_queries
+
+_real_connect = sqlite3.connect
+
+ROUTES = [  # (method, url, json body, hot table)
+    ("get", "/api/issuehub/list?category=gameroom&status=all", None, "issuehub_issues"),
+    ("get", "/api/issuehub/list?category=gameroom&status=open", None, "issuehub_issues"),
+    ("get", "/api/issuehub/list?category=gameroom&status=resolved", None, "issuehub_issues"),
+    ("get", "/api/issuehub/list?category=gameroom&status=archived", None, "issuehub_issues"),
+    ("get", "/api/issuehub/list?category=gameroom&status=trash", None, "issuehub_issues"),
+    ("get", "/api/issuehub/list?status=all&limit=20", None, "issuehub_issues"),
+    ("get", "/api/issuehub/by_game?location=Skeeball", None, "issuehub_issues"),
+    ("post", "/api/issuehub/create",
+     {"category": "gameroom", "title": "Index probe lane jammed", "location": "Skeeball #3"},
+     "issuehub_issues"),
+    ("get", "/api/dashboard/metrics", None, "issues"),
+    ("get", "/api/pms/due?within=15", None, "games"),
+    ("get", "/api/games/downtime?start=2025-01-01&end=2025-01-31", None, "game_outages"),
+    ("get", "/api/changes?since=0&entities=games", None, "change_log"),
+]
+
+_NOT_ALIAS = {"where", "left", "join", "inner", "on", "group", "order", "limit", "set", "values"}
+
+
+@pytest.fixture(scope="module")
+def plans(app_module):
+    with app_module.app.app_context():
+        return {r["name"]: r for r in explain_hot_queries(app_module.get_db())}
+
+
+@pytest.mark.parametrize("name", [q[0] for q in hot_queries()])
+def test_hot_query_uses_an_index(plans, name):
+    r = plans[name]
+    assert "error" not in r, r.get("error")
+    assert not r["full_scan"], f"{name}: full scan of {r['target']}: {r['plan']}"
+    assert r["uses_index"], f"{name}: no index in plan {r['plan']}"
+
+
+# --- real route SQL -----------------------------------------------------------
+@pytest.fixture
+def traced(app_module, monkeypatch):
+    """Every statement run on connections opened by get_db(), parameters inlined."""
+    statements = []
+
+    def connect(*args, **kw):
+        conn = _real_connect(*args, **kw)
+        conn.set_trace_callback(statements.append)
+        return conn
+    monkeypatch.setattr(app_module.sqlite3, "connect", connect)
+    cache_utils.invalidate("issues", "games", "pm_logs", "issuehub_issues")
+    return statements
+
+
+def _names_for(table, sql):
+    """The table plus any alias it has in this statement (plans show the alias)."""
+    names = {table}
+    for alias in re.findall(rf"\b(?:FROM|JOIN)\s+{table}\s+(?:AS\s+)?(\w+)", sql, re.I):
+        if alias.lower() not in _NOT_ALIAS:
+            names.add(alias)
+    return names
+
+
+def _full_scans(statements, table):
+    """(sql, plan) for each SELECT on `table` whose plan walks the whole table."""
+    checked, bad = 0, []
+    conn = _real_connect(os.path.abspath("app.db"))
+    try:
+        for sql in statements:
+            head = sql.lstrip().upper()
+            if not head.startswith(("SELECT", "WITH")) or not re.search(rf"\b{table}\b", sql):
+                continue
+            plan = [r[-1] for r in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+            checked += 1
+            if any(_plan_full_scan(plan, name) for name in _names_for(table, sql)):
+                bad.append((sql, plan))
+    finally:
+        conn.close()
+    return checked, bad
+
+
+@pytest.mark.parametrize("method,url,body,table", ROUTES, ids=[f"{m} {u}" for m, u, _, _ in ROUTES])
+def test_route_sql_uses_an_index(client, traced, method, url, body, table):
+    r = getattr(client, method)(url, json=body) if body is not None else getattr(client, method)(url)
+    assert r.status_code < 300, r.get_data(as_text=True)
+    checked, bad = _full_scans(traced, table)
+    assert checked, f"{url}: no SELECT on {table} was run"
+    assert not bad, f"{url}: full scan of {table}: {bad}"
+
+
+def test_jobs_sql_uses_an_index(app_module, traced):
+    import issue_hub_bp
+    import pm_schedule
+
+    with app_module.app.app_context():
+        issue_hub_bp.auto_archive_resolved(app_module.get_db())
+        checked, bad = _full_scans(traced, "issuehub_issues")
+        assert checked and not bad, bad
+
+        del traced[:]
+        pm_schedule.sync_all(app_module.get_db())
+        checked, bad = _full_scans(traced, "pm_logs")
+        assert checked and not bad, bad
+
+
+def test_full_scan_detection():
+    assert _plan_full_scan(["SCAN g", "SEARCH o USING INDEX ix (game_id=?)"], "g")
+    assert not _plan_full_scan(["SCAN g", "SEARCH o USING INDEX ix (game_id=?)"], "o")
+    assert not _plan_full_scan(["SCAN issues USING COVERING INDEX ix_issues_live"], "issues")
+    assert _plan_full_scan(["SCAN issuehub_issues USING INDEX ix_issuehub_live_status_created"],
+                           "issuehub_issues")  # walks every index entry
+    assert _plan_full_scan(["Seq Scan on games g  (cost=0.00..1.01 rows=1 width=4)"], "g")
+    assert not _plan_full_scan(["Index Scan using ix_games on games  (cost=0.14..8.16)"], "games")
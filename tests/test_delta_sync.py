@@ -0,0 +1,112 @@
+# ?since= delta sync round trip: a client holding a cursor from a full GET
+# sees exactly what changed after it - created/updated rows in `items`,
+# deleted rows and rows that left its view in `removed` - and is told to
+# reload in full (`reset`) once the change log has been pruned past it.
+
+import itertools
+
+import pytest
+
+from change_log import prune_change_log
+
+
+def _since(client, url, cursor):
+    sep = "&" if "?" in url else "?"
+    r = client.get(f"{url}{sep}since={cursor}")
+    assert r.status_code == 200, r.get_data(as_text=True)
+    return r.get_json()
+
+
+_n = itertools.count()
+
+
+def _create(client):
+    n = next(_n)  # distinct title + location, or create answers duplicate_issue
+    r = client.post("/api/issuehub/create", json={
+        "category": "gameroom", "title": f"Delta probe {n} ticket dispenser empty",
+        "location": f"Delta Lane {n}"})
+    assert r.status_code == 201, r.get_data(as_text=True)
+    return r.get_json()["id"]
+
+
+def _add_game(client, name):
+    r = client.post("/api/games", json={"name": name, "status": "Up"})
+    assert r.status_code == 201, r.get_data(as_text=True)
+    return max(g["id"] for g in client.get("/api/games").get_json() if g["name"] == name)
+
+
+def _ok(r):
+    assert r.status_code == 200, r.get_data(as_text=True)
+
+
+LIST = "/api/issuehub/list?category=gameroom"
+
+
+@pytest.fixture
+def issuehub_changes(client):
+    """Cursor from a full GET, then create/update/resolve/trash/delete after it."""
+    cursor = client.get(f"{LIST}&status=all").get_json()["sync_cursor"]
+    edited, resolved, trashed, deleted, fresh = (_create(client) for _ in range(5))
+    _ok(client.post("/api/issuehub/update_fields", json={"id": edited, "title": "Delta probe edited"}))
+    _ok(client.post("/api/issuehub/update_status",
+                    json={"id": resolved, "status": "resolved", "resolution": "refilled"}))
+    _ok(client.post("/api/issuehub/trash", json={"id": trashed}))
+    _ok(client.post("/api/issuehub/delete", json={"id": deleted}))
+    return cursor, dict(edited=edited, resolved=resolved, trashed=trashed, deleted=deleted, fresh=fresh)
+
+
+def test_issuehub_round_trip(client, issuehub_changes):
+    cursor, ids = issuehub_changes
+
+    d = _since(client, f"{LIST}&status=all", cursor)
+    assert {it["id"] for it in d["items"]} == {ids["edited"], ids["fresh"]}
+    assert set(d["removed"]) == {ids["resolved"], ids["trashed"], ids["deleted"]}
+    assert d["reset"] is False and d["more"] is False
+    assert next(it for it in d["items"] if it["id"] == ids["edited"])["title"] == "Delta probe edited"
+
+    d = _since(client, f"{LIST}&status=trash", cursor)
+    assert [it["id"] for it in d["items"]] == [ids["trashed"]]
+    assert ids["deleted"] in d["removed"]
+
+    d = _since(client, f"{LIST}&status=resolved", cursor)
+    assert [it["id"] for it in d["items"]] == [ids["resolved"]]
+
+    # caught up: nothing new, then a restore brings the trashed row back
+    nxt = _since(client, f"{LIST}&status=all", d["sync_cursor"])
+    assert nxt["items"] == [] and nxt["removed"] == []
+    _ok(client.post("/api/issuehub/restore", json={"id": ids["trashed"]}))
+    d = _since(client, f"{LIST}&status=all", nxt["sync_cursor"])
+    assert [it["id"] for it in d["items"]] == [ids["trashed"]] and d["removed"] == []
+
+
+def test_games_round_trip(client):
+    cursor = client.get("/api/games").headers["X-Sync-Cursor"]
+    kept = _add_game(client, "Delta Pinball")
+    gone = _add_game(client, "Delta Claw")
+    _ok(client.put(f"/api/games/{kept}", json={"name": "Delta Pinball", "status": "Down",
+                                               "down_reason": "flipper"}))
+    _ok(client.delete(f"/api/games/{gone}"))
+
+    d = _since(client, "/api/games", cursor)
+    assert [(g["id"], g["status"]) for g in d["items"]] == [(kept, "Down")]
+    assert d["removed"] == [gone]
+    assert d["reset"] is False
+
+    assert _since(client, "/api/games", d["sync_cursor"])["items"] == []
+
+
+def test_reset_after_prune(client, app_module, issuehub_changes):
+    cursor, _ = issuehub_changes
+    games_cursor = client.get("/api/games").headers["X-Sync-Cursor"]
+    _add_game(client, "Delta Prune")
+    latest = _since(client, f"{LIST}&status=all", cursor)["sync_cursor"]
+
+    with app_module.app.app_context():
+        assert prune_change_log(app_module.get_db(), keep_days=-1)  # everything but the newest entry
+
+    for url, old in ((f"{LIST}&status=all", cursor), ("/api/games", games_cursor)):
+        d = _since(client, url, old)
+        assert d["reset"] is True
+        assert d["items"] == [] and d["removed"] == []
+
+    assert _since(client, f"{LIST}&status=all", latest)["reset"] is False  # still reachable
@@ -0,0 +1,77 @@
+# BlockIdAllocator: two allocators (two workers) sharing one database never
+# hand out the same id, and each one's ids only ever go up - including after
+# a fork and alongside the real Issue Hub create route.
+
+import os
+import sqlite3
+
+import pytest
+
+import id_allocator
+from id_allocator import BlockIdAllocator
+
+ENTITY = "alloc_test"
+
+
+@pytest.fixture
+def two_workers(app_module):
+    """Two allocators, each with its own connection to the app's database."""
+    conns = [sqlite3.connect(os.path.abspath("app.db"), timeout=5) for _ in range(2)]
+    for conn in conns:
+        conn.execute("DELETE FROM id_sequences WHERE entity = ?", (ENTITY,))
+        conn.commit()
+    yield [(BlockIdAllocator(block_size=3), conn) for conn in conns]
+    for conn in conns:
+        conn.close()
+
+
+def _increasing(ids):
+    return all(a < b for a, b in zip(ids, ids[1:]))
+
+
+def test_interleaved_workers_never_collide(two_workers):
+    (a, conn_a), (b, conn_b) = two_workers
+    got_a, got_b = [], []
+    for step in range(20):
+        got_a.append(a.next(conn_a, ENTITY))
+        got_b.extend(b.take(conn_b, ENTITY, step % 4))
+        if step % 5 == 0:
+            got_a.extend(a.take(conn_a, ENTITY, 7))  # more than a block at once
+
+    assert _increasing(got_a) and _increasing(got_b)
+    assert not set(got_a) & set(got_b)
+    top = conn_a.execute("SELECT counter FROM id_sequences WHERE entity = ?", (ENTITY,)).fetchone()[0]
+    assert max(got_a + got_b) <= top  # nothing handed out past what was reserved
+
+
+def test_forked_worker_does_not_reuse_the_parent_block(two_workers, monkeypatch):
+    (a, conn), _ = two_workers
+    parent = [a.next(conn, ENTITY)]  # reserves a block of 3, hands out 1
+    child_pid = os.getpid() + 1
+    monkeypatch.setattr(id_allocator.os, "getpid", lambda: child_pid)
+    child = [a.next(conn, ENTITY), a.next(conn, ENTITY)]  # inherited the block, must not use it
+    monkeypatch.undo()
+    parent.append(a.next(conn, ENTITY))
+
+    assert child[0] > parent[0] + 2  # past the parent's whole block
+    assert _increasing(child) and _increasing(parent)
+    assert not set(parent) & set(child)
+
+
+def test_route_ids_stay_unique_next_to_another_worker(client, app_module):
+    other = sqlite3.connect(os.path.abspath("app.db"), timeout=5)
+    try:
+        allocator = BlockIdAllocator(block_size=2)
+        route_ids, other_ids = [], []
+        for i in range(6):
+            r = client.post("/api/issuehub/create", json={
+                "category": "gameroom", "title": f"Allocator probe {i} coin door",
+                "location": f"Allocator Lane {i}"})
+            assert r.status_code == 201, r.get_data(as_text=True)
+            route_ids.append(int(r.get_json()["id"][2:]))
+            other_ids.append(allocator.next(other, "ih"))
+    finally:
+        other.close()
+
+    assert _increasing(route_ids) and _increasing(other_ids)
+    assert not set(route_ids) & set(other_ids)
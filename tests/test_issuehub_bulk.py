@@ -0,0 +1,129 @@
+# POST /api/issuehub/bulk_create and /bulk_update with a batch mixing valid
+# and invalid items: every invalid item reports its first validation error
+# and writes nothing (no row, no change_log entry), and a batch with nothing
+# valid in it leaves the database - and its table version - untouched.
+
+import pytest
+
+from table_versions import table_versions
+
+
+@pytest.fixture
+def snapshot(app_module):
+    """() -> (live rows by id, last change_log seq, issuehub_issues version)."""
+    def take():
+        with app_module.app.app_context():
+            db = app_module.get_db()
+            rows = {r[0]: tuple(r[1:]) for r in db.execute(
+                "SELECT id, title, status, resolution, priority FROM issuehub_issues")}
+            seq = db.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+            return rows, seq, table_versions(db, "issuehub_issues")["issuehub_issues"]
+    return take
+
+
+def _changes_after(app_module, seq):
+    with app_module.app.app_context():
+        return [tuple(r) for r in app_module.get_db().execute(
+            "SELECT entity, entity_id, op FROM change_log WHERE seq > ? ORDER BY seq", (seq,))]
+
+
+# --- bulk_create --------------------------------------------------------------
+def test_bulk_create_mixed_batch(client, app_module, snapshot):
+    rows, seq, _ = snapshot()
+    r = client.post("/api/issuehub/bulk_create", json={"items": [
+        {"category": "gameroom", "title": "Bulk mix claw drops prizes", "location": "Bulk Claw"},
+        {"category": "gameroom", "title": "   ", "location": "Bulk Claw"},
+        {"category": "kitchen", "title": "Bulk mix fryer", "location": "Bulk Kitchen"},
+        "not an object",
+        {"title": "Bulk mix no category"},
+    ]})
+    assert r.status_code == 201
+    body = r.get_json()
+    assert (body["created"], body["duplicates"], body["invalid"]) == (1, 0, 4)
+    assert [(x["index"], x["result"], x.get("error")) for x in body["results"]] == [
+        (0, "created", None),
+        (1, "invalid", "title is required"),
+        (2, "invalid", "category must be 'gameroom', 'facility', or 'attraction'"),
+        (3, "invalid", "item must be an object"),
+        (4, "invalid", "category must be 'gameroom', 'facility', or 'attraction'"),
+    ]
+
+    new_id = body["results"][0]["id"]
+    after, _, _ = snapshot()
+    assert set(after) - set(rows) == {new_id}  # only the valid item was written
+    assert after[new_id][0] == "Bulk mix claw drops prizes"
+    assert _changes_after(app_module, seq) == [("issuehub_issues", new_id, "insert")]
+
+
+def test_bulk_create_all_invalid_writes_nothing(client, snapshot):
+    before = snapshot()
+    r = client.post("/api/issuehub/bulk_create", json={"items": [
+        {"category": "gameroom"}, {"category": "arcade", "title": "Bulk bad category"}]})
+    assert r.status_code == 200
+    body = r.get_json()
+    assert (body["created"], body["invalid"]) == (0, 2)
+    assert [x["error"] for x in body["results"]] == [
+        "title is required", "category must be 'gameroom', 'facility', or 'attraction'"]
+    assert snapshot() == before
+
+
+# --- bulk_update --------------------------------------------------------------
+def _create(client, title):
+    r = client.post("/api/issuehub/create", json={
+        "category": "facility", "title": title, "location": f"Bulk {title}"})
+    assert r.status_code == 201, r.get_data(as_text=True)
+    return r.get_json()["id"]
+
+
+def test_bulk_update_mixed_batch(client, app_module, snapshot):
+    ok, dup, unresolved, bad, empty = (_create(client, f"Bulk upd {n} door sticks") for n in range(5))
+    rows, seq, _ = snapshot()
+    r = client.post("/api/issuehub/bulk_update", json={"items": [
+        {"id": ok, "status": "in_progress", "priority": "high"},
+        {"id": dup, "status": "in_progress"},
+        {"id": dup, "priority": "low"},
+        {"id": unresolved, "status": "resolved"},
+        {"id": unresolved + "x", "status": "bogus", "resolution": None},
+        {"id": bad, "status": "bogus"},
+        {"id": empty},
+        ["not", "an", "object"],
+        {"status": "open"},
+        {"id": "IH9999", "priority": "low"},
+    ]})
+    assert r.status_code == 200
+    body = r.get_json()
+    assert (body["updated"], body["not_found"], body["invalid"]) == (2, 1, 7)
+    assert [(x["id"], x["result"], x.get("error")) for x in body["results"]] == [
+        (ok, "updated", None),
+        (dup, "updated", None),
+        (dup, "invalid", "id appears more than once"),
+        (unresolved, "invalid", "resolution text required to resolve"),
+        (unresolved + "x", "invalid", "invalid status"),
+        (bad, "invalid", "invalid status"),
+        (empty, "invalid", "no fields to update"),
+        (None, "invalid", "item must be an object"),  # first error wins over "id is required"
+        (None, "invalid", "id is required"),
+        ("IH9999", "not_found", None),
+    ]
+
+    after, _, _ = snapshot()
+    assert after[ok][1:] == ("in_progress", None, "high")
+    assert after[dup][1:] == ("in_progress", None, rows[dup][3])  # the repeat's priority was not applied
+    for issue_id in (unresolved, bad, empty):
+        assert after[issue_id] == rows[issue_id]  # invalid items wrote nothing
+    assert sorted(_changes_after(app_module, seq)) == sorted(
+        [("issuehub_issues", ok, "update"), ("issuehub_issues", dup, "update")])
+
+
+def test_bulk_update_nothing_valid_writes_nothing(client, snapshot):
+    target = _create(client, "Bulk upd none valid leak")
+    before = snapshot()
+    r = client.post("/api/issuehub/bulk_update", json={"items": [
+        {"id": target, "status": "resolved", "resolution": "  "},
+        {"id": target + "-missing", "priority": "high"},
+    ]})
+    assert r.status_code == 200
+    body = r.get_json()
+    assert [(x["result"], x.get("error")) for x in body["results"]] == [
+        ("invalid", "resolution text required to resolve"), ("not_found", None)]
+    assert snapshot() == before  # no row, change_log entry or version bump
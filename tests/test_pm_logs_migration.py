@@ -0,0 +1,82 @@
+# The SQLite pm_logs migration (old app.py shape: game_id TEXT, id SERIAL,
+# date_logged, no game_name) keeps every row and running it again is a no-op.
+
+import sqlite3
+
+import pytest
+
+import games_db
+
+OLD_PM_LOGS = """
+    CREATE TABLE pm_logs (
+        id SERIAL PRIMARY KEY,
+        game_id TEXT NOT NULL,
+        pm_date DATE NOT NULL,
+        notes TEXT,
+        completed_by TEXT,
+        date_logged TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+OLD_ROWS = [  # game_id as the old app stored it
+    ("1", "2025-01-02", "belts", "sam", "2025-01-02 09:00:00"),
+    (" 2 ", "2025-01-03", None, "ana", "2025-01-03 10:00:00"),
+    ("skeeball", "2025-01-04", "typed a name", None, "2025-01-04 11:00:00"),
+    ("", "2025-01-05", "blank", "sam", "2025-01-05 12:00:00"),
+    ("1", "2025-01-06", "coin mech", "ana", "2025-01-06 13:00:00"),
+    ("3", "2025-01-07", "gone game", "sam", "2025-01-07 14:00:00"),
+    ("2", "2025-01-08", "after a gap", "ana", "2025-01-08 15:00:00"),
+]
+
+
+@pytest.fixture
+def old_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(games_db, "PM_MIGRATION_BATCH", 2)  # several batches
+    conn = sqlite3.connect(str(tmp_path / "old.db"))
+    games_db.ensure_games_table(conn)
+    conn.executemany("INSERT INTO games (id, name, status) VALUES (?, ?, 'Up')",
+                     [(1, "Skeeball #1"), (2, "Pac-Man")])
+    conn.execute(OLD_PM_LOGS)
+    conn.executemany("INSERT INTO pm_logs (game_id, pm_date, notes, completed_by, date_logged) "
+                     "VALUES (?, ?, ?, ?, ?)", OLD_ROWS)
+    conn.execute("DELETE FROM pm_logs WHERE rowid = 6")  # a hole in the rowids
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _rows(conn):
+    return conn.execute("SELECT id, game_id, game_name, pm_date, notes, completed_by, created_at "
+                        "FROM pm_logs ORDER BY id").fetchall()
+
+
+def test_migration_keeps_rows(old_db):
+    games_db.ensure_pm_logs_table(old_db)
+
+    cols = {r[1]: r[2].upper() for r in old_db.execute("PRAGMA table_info(pm_logs)")}
+    assert cols["id"] == "INTEGER" and cols["game_id"] == "INTEGER"
+    assert "date_logged" not in cols
+    assert _rows(old_db) == [
+        (1, 1, "Skeeball #1", "2025-01-02", "belts", "sam", "2025-01-02 09:00:00"),
+        (2, 2, "Pac-Man", "2025-01-03", "", "ana", "2025-01-03 10:00:00"),
+        (3, None, "", "2025-01-04", "typed a name", "", "2025-01-04 11:00:00"),
+        (4, None, "", "2025-01-05", "blank", "sam", "2025-01-05 12:00:00"),
+        (5, 1, "Skeeball #1", "2025-01-06", "coin mech", "ana", "2025-01-06 13:00:00"),
+        (7, 2, "Pac-Man", "2025-01-08", "after a gap", "ana", "2025-01-08 15:00:00"),
+    ]
+    tables = {r[0] for r in old_db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "pm_logs_new" not in tables
+
+    # new rows keep counting after the copied ids
+    old_db.execute("INSERT INTO pm_logs (game_id, game_name, pm_date) VALUES (2, 'Pac-Man', '2025-02-01')")
+    assert old_db.execute("SELECT MAX(id) FROM pm_logs").fetchone()[0] == 8
+
+
+def test_migration_is_idempotent(old_db):
+    games_db.ensure_pm_logs_table(old_db)
+    first = _rows(old_db)
+    schema = old_db.execute("SELECT sql FROM sqlite_master WHERE name = 'pm_logs'").fetchone()
+
+    games_db.ensure_pm_logs_table(old_db)
+    assert _rows(old_db) == first
+    assert old_db.execute("SELECT sql FROM sqlite_master WHERE name = 'pm_logs'").fetchone() == schema
@@ -0,0 +1,52 @@
+# GET /api/pms streams the full history on a connection the response owns;
+# that connection must be closed even when the body is never read.
+
+import sqlite3
+
+import pytest
+
+_real_connect = sqlite3.connect
+
+
+class _Tracked(sqlite3.Connection):
+    opened = []
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.closed = False
+        _Tracked.opened.append(self)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+@pytest.fixture
+def tracked(app_module, monkeypatch):
+    _Tracked.opened = []
+    monkeypatch.setattr(app_module.sqlite3, "connect",
+                        lambda *a, **kw: _real_connect(*a, factory=_Tracked, **kw))
+    return _Tracked.opened
+
+
+def test_streamed_body_is_valid_json(client, tracked):
+    r = client.get("/api/pms")
+    assert r.status_code == 200
+    assert isinstance(r.get_json()["items"], list)
+    r.close()  # what the WSGI server does once the body is sent
+    assert tracked and all(c.closed for c in tracked)
+
+
+def test_head_closes_the_stream_connection(client, tracked):
+    r = client.head("/api/pms")
+    assert r.status_code == 200
+    assert r.get_data() == b""
+    r.close()
+    assert tracked and all(c.closed for c in tracked)
+
+
+def test_unread_body_closes_the_stream_connection(client, tracked):
+    r = client.get("/api/pms", buffered=False)
+    assert tracked and not all(c.closed for c in tracked)
+    r.close()
+    assert all(c.closed for c in tracked)
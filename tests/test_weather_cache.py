@@ -0,0 +1,108 @@
+# GET /weather against a local OpenWeather stub: hit, miss, stale and
+# upstream failure, checking the body, X-Cache and how often the stub was called.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cache_utils import SWRCache
+
+TTL = 0.3
+
+
+class _Stub(BaseHTTPRequestHandler):
+    state = {"calls": 0, "fail": False, "temp": 80.4}
+
+    def do_GET(self):
+        self.state["calls"] += 1
+        if self.state["fail"]:
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = json.dumps({"weather": [{"icon": "01d", "description": "clear sky"}],
+                           "main": {"temp": self.state["temp"]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream(app_module, monkeypatch):
+    import weather
+
+    _Stub.state = {"calls": 0, "fail": False, "temp": 80.4}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(weather, "OPENWEATHER_URL", f"http://127.0.0.1:{server.server_port}/data/2.5/weather")
+    monkeypatch.setattr(weather, "_cache", SWRCache(TTL, max_stale=60, wait_timeout=5))
+    yield _Stub.state
+    server.shutdown()
+    server.server_close()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_miss_then_hit(client, upstream):
+    r = client.get("/weather")
+    assert r.status_code == 200
+    assert r.headers["X-Cache"] == "miss"
+    assert r.get_json() == {"icon_code": "01d", "description": "Clear sky", "temperature": 80}
+    assert upstream["calls"] == 1
+
+    r = client.get("/weather")
+    assert r.headers["X-Cache"] == "hit"
+    assert r.get_json()["temperature"] == 80
+    assert upstream["calls"] == 1
+
+
+def test_stale_served_while_one_refresh_runs(client, upstream):
+    client.get("/weather")
+    upstream["temp"] = 90.0
+    time.sleep(TTL + 0.05)
+
+    r = client.get("/weather")
+    assert r.headers["X-Cache"] == "stale"
+    assert r.get_json()["temperature"] == 80  # the old reading, right away
+    assert _wait_for(lambda: upstream["calls"] == 2)
+
+    assert _wait_for(lambda: client.get("/weather").headers["X-Cache"] == "hit")
+    assert client.get("/weather").get_json()["temperature"] == 90
+    assert upstream["calls"] == 2
+
+
+def test_failed_refresh_keeps_the_stale_reading(client, upstream):
+    client.get("/weather")
+    upstream["fail"] = True
+    time.sleep(TTL + 0.05)
+
+    r = client.get("/weather")
+    assert r.headers["X-Cache"] == "stale"
+    assert _wait_for(lambda: upstream["calls"] == 2)
+    time.sleep(0.05)  # let the background refresh finish failing
+
+    r = client.get("/weather")
+    assert r.status_code == 200
+    assert r.headers["X-Cache"] == "stale"
+    assert r.get_json()["temperature"] == 80
+    assert _wait_for(lambda: upstream["calls"] == 3)  # still stale, so one more background try
+
+
+def test_upstream_failure_on_a_cold_miss(client, upstream):
+    upstream["fail"] = True
+    r = client.get("/weather")
+    assert r.status_code == 500
+    assert "X-Cache" not in r.headers
+    assert r.get_json()["error"] == "Failed to fetch weather data"
+    assert upstream["calls"] == 1
@@ -0,0 +1,67 @@
+# =========================================================================
+# ARCADE MANAGER - WEATHER (OpenWeather current conditions)
+# Cached wrapper around the OpenWeather call behind GET /weather.
+#
+# What this file does:
+# - fetch_current_weather(lat, lon, key) -> {icon_code, description, temperature}
+#   (one upstream call, hard timeout)
+# - get_weather(lat, lon, key) -> (payload, cache_state) through an SWRCache
+#   keyed by rounded coordinates: fresh for WEATHER_TTL seconds, then served
+#   stale (while one background refresh runs) for WEATHER_MAX_STALE more
+#
+# Settings (env):
+# - OPENWEATHER_URL      (default: the public API; point at a local stub to test)
+# - WEATHER_TTL          (default 600)   seconds a reading counts as fresh
+# - WEATHER_MAX_STALE    (default 3600)  extra seconds a reading may be served stale
+# - WEATHER_TIMEOUT      (default 4)     seconds for the upstream call
+#
+# Connected files:
+# - app.py (GET /weather)
+# - cache_utils.py (SWRCache)
+# =========================================================================
+
+import os
+
+import requests
+
+from cache_utils import SWRCache
+
+OPENWEATHER_URL = os.environ.get("OPENWEATHER_URL", "https://api.openweathermap.org/data/2.5/weather")
+WEATHER_TTL = float(os.environ.get("WEATHER_TTL", "600"))
+WEATHER_MAX_STALE = float(os.environ.get("WEATHER_MAX_STALE", "3600"))
+WEATHER_TIMEOUT = float(os.environ.get("WEATHER_TIMEOUT", "4"))
+
+_cache = SWRCache(WEATHER_TTL, max_stale=WEATHER_MAX_STALE, wait_timeout=WEATHER_TIMEOUT + 1)
+
+
+def fetch_current_weather(lat, lon, api_key, url=None):
+    """
+    One upstream call. Raises requests.RequestException (network/HTTP/timeout)
+    or KeyError (unexpected payload).
+    """
+    response = requests.get(
+        url or OPENWEATHER_URL,
+        params={"lat": lat, "lon": lon, "appid": api_key, "units": "imperial"},
+        timeout=WEATHER_TIMEOUT,
+    )
+    response.raise_for_status()
+    weather_data = response.json()
+
+    icon_code = weather_data["weather"][0]["icon"]
+    description = weather_data["weather"][0]["description"]
+    temperature = weather_data["main"]["temp"]
+    return {
+        "icon_code": icon_code,
+        "description": description.capitalize(),
+        "temperature": round(temperature),
+    }
+
+
+def get_weather(lat, lon, api_key):
+    """(payload, "hit"|"stale"|"miss"); raises like fetch_current_weather on a failed miss."""
+    key = (round(float(lat), 3), round(float(lon), 3))
+    return _cache.get(key, lambda: fetch_current_weather(lat, lon, api_key))
+
+
+def clear_cache():
+    _cache.invalidate()